@@ -0,0 +1,421 @@
+"""Execution backends for workflows.
+
+The pandas backend (the default) runs each tool's execute() in turn. The
+Polars backend translates the tools of a workflow into a single Polars
+LazyFrame plan and collects it once, letting Polars optimize across nodes
+(projection and predicate pushdown into the CSV scan, shared subplans) and
+run it on its multithreaded streaming engine.
+
+Filter conditions and Formula expressions are written once, in the pandas
+query/eval syntax, and translated to Polars expressions. Tools without a
+Polars translation, including tools from plugins, run with pandas on
+materialized inputs, so every workflow runs on either backend.
+"""
+import ast
+import functools
+import operator
+import re
+import time
+from functools import reduce
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from workflow_manager import WorkflowManager
+
+BACKENDS = ('pandas', 'polars')
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_
+}
+
+_UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.invert,
+    ast.Invert: operator.invert
+}
+
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge
+}
+
+def polars_expression(text: str):
+    """Translate a pandas query/eval expression into a Polars expression.
+
+    Supports column names (bare or `backtick quoted`), literals, arithmetic,
+    comparisons (including chained ones), and/or/not, &/|/~ and in/not in
+    against a list of literals.
+    """
+    import polars as pl
+
+    # Backtick-quoted column names are not valid Python; swap in placeholders
+    quoted = {}
+
+    def placeholder(match):
+        name = f"__column_{len(quoted)}__"
+        quoted[name] = match.group(1)
+        return name
+
+    tree = ast.parse(re.sub(r'`([^`]*)`', placeholder, text.strip()), mode='eval')
+
+    def translate(node):
+        if isinstance(node, ast.Name):
+            return pl.col(quoted.get(node.id, node.id))
+        if isinstance(node, ast.Constant):
+            return pl.lit(node.value)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            return _BINARY_OPERATORS[type(node.op)](translate(node.left), translate(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            return _UNARY_OPERATORS[type(node.op)](translate(node.operand))
+        if isinstance(node, ast.BoolOp):
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            return reduce(combine, [translate(value) for value in node.values])
+        if isinstance(node, ast.Compare):
+            terms = []
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    if not isinstance(right, (ast.List, ast.Tuple, ast.Set)):
+                        raise ValueError(f"'in' needs a list of values: {text}")
+                    term = translate(left).is_in([ast.literal_eval(item) for item in right.elts])
+                    terms.append(~term if isinstance(op, ast.NotIn) else term)
+                elif type(op) in _COMPARISONS:
+                    terms.append(_COMPARISONS[type(op)](translate(left), translate(right)))
+                else:
+                    raise ValueError(f"Unsupported comparison in expression: {text}")
+                left = right
+            return reduce(operator.and_, terms)
+        raise ValueError(f"Unsupported syntax for the polars backend: {ast.unparse(node)}")
+
+    return translate(tree.body)
+
+def _columns(plan) -> List[str]:
+    return plan.collect_schema().names()
+
+class PandasBackend:
+    """Runs each tool's own pandas implementation, node by node"""
+
+    def execute_tool(self, tool):
+        return tool.execute()
+
+    def execute(self, manager: 'WorkflowManager', order: List[str], tools: Dict[str, Any],
+                notify, cancel_event=None, node_timeout: Optional[float] = None):
+        manager._execute_nodes(order, tools, notify, cancel_event, node_timeout)
+
+class PolarsBackend:
+    """Compiles a workflow into one LazyFrame plan and collects it in a single pass"""
+
+    # pandas merge 'how' -> Polars join 'how'
+    JOIN_TYPES = {'inner': 'inner', 'left': 'left', 'right': 'right', 'outer': 'full'}
+
+    AGGREGATIONS = {
+        'sum': lambda column: column.sum(),
+        'max': lambda column: column.max(),
+        'min': lambda column: column.min(),
+        'mean': lambda column: column.mean(),
+        'median': lambda column: column.median(),
+        'count': lambda column: column.count()
+    }
+
+    def __init__(self):
+        try:
+            import polars
+        except ImportError:
+            raise ImportError("The polars backend needs Polars and PyArrow: "
+                              "pip install polars pyarrow") from None
+        self.pl = polars
+        # Tool class name -> translation of the tool into a plan, or None to fall back to pandas
+        self.translations: Dict[str, Callable[[Any, List[Any]], Optional[Any]]] = {
+            'InputTool': self._input,
+            'SelectTool': self._select,
+            'FilterTool': self._filter,
+            'JoinTool': self._join,
+            'MergeTool': self._merge,
+            'FormulaTool': self._formula,
+            'AggregateTool': self._aggregate,
+            'OutputTool': self._output,
+            'SortTool': self._sort
+        }
+
+    def _input(self, tool, inputs):
+        # Design mode samples are read with pandas, see tools.sample_batches
+        if tool.file_format != 'csv' or tool.incremental or tool.sample is not None:
+            return None
+        return self.pl.scan_csv(tool.file_path)
+
+    def _select(self, tool, inputs):
+        if tool.drop_columns:
+            return inputs[0].drop(tool.columns)
+        return inputs[0].select(tool.columns)
+
+    def _filter(self, tool, inputs):
+        expression = self._expression(tool.condition)
+        return inputs[0].filter(expression) if expression is not None else None
+
+    def _join(self, tool, inputs):
+        how = self.JOIN_TYPES.get(tool.how)
+        # pandas rejects a key given for one side only
+        if how is None or (tool.left_on is None) != (tool.right_on is None):
+            return None
+        left = inputs[0]
+        right = self.pl.from_pandas(tool.right_data).lazy()
+        left_columns, right_columns = _columns(left), _columns(right)
+
+        if tool.left_on is None and tool.right_on is None:
+            left_on = right_on = [column for column in left_columns if column in right_columns]
+        else:
+            left_on, right_on = [tool.left_on], [tool.right_on]
+        shared_keys = [key for key in left_on if key in right_on]
+
+        # Match pandas suffixes: overlapping non-key columns become name_x and name_y
+        overlap = [column for column in left_columns
+                   if column in right_columns and column not in shared_keys]
+        left = left.rename({column: f"{column}_x" for column in overlap})
+        right = right.rename({column: f"{column}_y" for column in overlap})
+        # pandas keeps both key columns when their names differ and one when they match
+        return left.join(right, how=how, left_on=left_on, right_on=right_on,
+                         coalesce=left_on == right_on)
+
+    def _merge(self, tool, inputs):
+        frames = [inputs[0]] + [self.pl.from_pandas(data).lazy() for data in tool.additional_data]
+        return self.pl.concat(frames, how='diagonal_relaxed')
+
+    def _formula(self, tool, inputs):
+        expression = self._expression(tool.formula)
+        return inputs[0].with_columns(expression.alias(tool.new_column)) if expression is not None else None
+
+    @staticmethod
+    def _expression(text: str):
+        """The Polars expression for a pandas expression, or None if only pandas can evaluate it"""
+        try:
+            return polars_expression(text)
+        except (ValueError, SyntaxError):
+            return None  # pandas reports the error if the expression is invalid
+
+    def _aggregate(self, tool, inputs):
+        if not tool.group_by or tool.incremental or not tool.aggregations:
+            return None
+        pl = self.pl
+        aggregations = []
+        for column, functions in tool.aggregations.items():
+            for func in functions:
+                if func in self.AGGREGATIONS:
+                    aggregations.append(self.AGGREGATIONS[func](pl.col(column)).alias(f"{column}_{func}"))
+        # pandas drops null group keys and sorts groups
+        return (inputs[0].filter(pl.col(tool.group_by).is_not_null())
+                .group_by(tool.group_by).agg(aggregations).sort(tool.group_by))
+
+    def _sort(self, tool, inputs):
+        ascending = tool.ascending
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(tool.columns)
+        if len(ascending) != len(tool.columns):
+            return None  # pandas reports the mismatch
+        plan = inputs[0].sort(tool.columns, descending=[not value for value in ascending],
+                              nulls_last=True, maintain_order=True)
+        # Polars turns a sort followed by head into a top-k selection. A negative
+        # head drops rows from the end in Polars; the pandas tool returns no rows
+        return plan.head(max(tool.limit, 0)) if tool.limit is not None else plan
+
+    def _output(self, tool, inputs):
+        # Written from the collected result; other formats go through pandas, and
+        # design mode passes the data through without writing it
+        if tool.file_format != 'csv' or tool.append or tool.sample is not None:
+            return None
+        return inputs[0]
+
+    def translate(self, tool, inputs: List[Any]):
+        """The plan for a tool given the plans of its inputs, or None if it must run with pandas"""
+        translation = self.translations.get(type(tool).__name__)
+        if translation is None or (inputs and any(plan is None for plan in inputs)):
+            return None
+        return translation(tool, inputs)
+
+    def collect(self, plans: List[Any]):
+        """Collect several plans in one pass, sharing their common subplans"""
+        try:
+            return self.pl.collect_all(plans, engine='streaming')
+        except TypeError:
+            # Polars before 1.0 selects the streaming engine with a flag
+            return self.pl.collect_all(plans, streaming=True)
+
+    def execute_tool(self, tool):
+        """Run one tool on its pandas input_data/inputs and return a pandas frame"""
+        frames = tool.inputs or ([tool.input_data] if tool.input_data is not None else [])
+        plan = self.translate(tool, [self.pl.from_pandas(data).lazy() for data in frames])
+        if plan is None:
+            return tool.execute()
+        return self.collect([plan])[0].to_pandas()
+
+    def execute(self, manager: 'WorkflowManager', order: List[str], tools: Dict[str, Any],
+                notify, cancel_event=None, node_timeout: Optional[float] = None):
+        """Run the nodes in order: translate what Polars supports, run the rest with pandas.
+
+        node_timeout applies to nodes run with pandas; the collected plan runs to completion.
+        """
+        from workflow_manager import WorkflowCancelled
+
+        plans = {}
+        planned = []  # Nodes whose work happens when the plans are collected
+        collected = {}  # Planned node -> pandas output, collected early for pandas consumers
+        for node_id in order:
+            if cancel_event is not None and cancel_event.is_set():
+                raise WorkflowCancelled()
+            try:
+                tool = manager.create_tool(node_id)
+            except Exception as e:
+                notify('failed', node_id, str(e))
+                raise
+            if tool is None:
+                continue
+            tools[node_id] = tool
+            tool.state = manager.node_state.get(node_id)
+
+            inputs = [self._input_plan(manager, plans, upstream_id)
+                      for upstream_id in manager.get_upstream_nodes(node_id)]
+            try:
+                plan = self.translate(tool, inputs)
+            except Exception as e:
+                notify('failed', node_id, str(e))
+                raise
+            if plan is not None:
+                plans[node_id] = plan
+                planned.append(node_id)
+                continue
+
+            # No translation: materialize the inputs and run the pandas tool
+            notify('started', node_id, None)
+            try:
+                if inputs:
+                    tool.inputs = self._materialize(manager, plans, planned, collected,
+                                                    manager.get_upstream_nodes(node_id))
+                    tool.input_data = tool.inputs[0]
+                if hasattr(tool, 'input_delta'):
+                    tool.input_delta = manager._reads_delta(node_id)
+                tool.progress = functools.partial(notify, 'rows', node_id)
+                metrics = manager._run_tool(tool, manager.timeout_for(node_id, node_timeout), cancel_event)
+            except WorkflowCancelled:
+                raise
+            except Exception as e:
+                notify('failed', node_id, str(e))
+                raise
+            manager.set_node_data(node_id, tool.output_data)
+            metrics.update(manager._frame_metrics(tool))
+            manager.node_metrics[node_id] = metrics
+            if tool.output_data is not None:
+                notify('rows', node_id, len(tool.output_data))
+            notify('finished', node_id, metrics)
+            if tool.output_data is not None:
+                plans[node_id] = self.pl.from_pandas(tool.output_data).lazy()
+
+        if planned:
+            self._collect_planned(manager, plans, planned, collected, tools, notify, cancel_event)
+
+    def _input_plan(self, manager: 'WorkflowManager', plans: Dict[str, Any], node_id: str):
+        if node_id in plans:
+            return plans[node_id]
+        data = manager.get_node_data(node_id)  # Kept from an earlier (partial) run
+        return self.pl.from_pandas(data).lazy() if data is not None else None
+
+    def _materialize(self, manager: 'WorkflowManager', plans: Dict[str, Any], planned: List[str],
+                     collected: Dict[str, Any], node_ids: List[str]) -> List[Any]:
+        """pandas frames for the outputs of node_ids, collecting planned nodes in one pass.
+
+        Each planned node is collected at most once per run: its frame is kept
+        in collected and as its node data, and replaces its plan, so a shared
+        upstream plan is not recomputed for every pandas consumer.
+        """
+        pending = [node_id for node_id in dict.fromkeys(node_ids)
+                   if node_id in planned and node_id not in collected]
+        if pending:
+            for node_id, frame in zip(pending, self.collect([plans[node_id] for node_id in pending])):
+                collected[node_id] = frame.to_pandas()
+                manager.set_node_data(node_id, collected[node_id])
+                plans[node_id] = frame.lazy()
+        # Other nodes ran with pandas, in this run or an earlier (partial) one
+        return [collected[node_id] if node_id in collected else manager.get_node_data(node_id)
+                for node_id in node_ids]
+
+    def _collect_planned(self, manager, plans, planned, collected, tools, notify, cancel_event):
+        """Collect Output nodes and nodes nothing else consumes, and write the outputs.
+
+        Other planned nodes are fused into their consumers' plans; their output
+        is computed from their own plan only if it is asked for, e.g. by Browse.
+        """
+        from tools import OutputTool
+
+        targets = [node_id for node_id in planned
+                   if isinstance(tools[node_id], OutputTool)
+                   or not any(downstream in plans for downstream in manager.get_downstream_nodes(node_id))]
+        for node_id in planned:
+            notify('started', node_id, None)
+
+        collect = _CollectPlans(self, [plans[node_id] for node_id in targets],
+                                [tools[node_id] for node_id in targets])
+        try:
+            metrics = manager._run_tool(collect, None, cancel_event)
+        except Exception as e:
+            for node_id in planned:
+                notify('failed', node_id, str(e))
+            raise
+
+        for node_id, frame in zip(targets, collect.results):
+            tools[node_id].output_data = collected.get(node_id)
+            if tools[node_id].output_data is None:
+                tools[node_id].output_data = frame.to_pandas()
+            manager.set_node_data(node_id, tools[node_id].output_data)
+        for node_id in planned:
+            if node_id in collected:
+                tools[node_id].output_data = collected[node_id]
+            elif node_id not in targets:
+                manager.defer_node_data(node_id, lambda plan=plans[node_id]: self.collect([plan])[0].to_pandas())
+        # Nodes fused into one plan share its timing; only collected nodes have frames
+        for node_id in planned:
+            node_metrics = dict(metrics, fused=True)
+            node_metrics.update(manager._frame_metrics(tools[node_id]))
+            manager.node_metrics[node_id] = node_metrics
+            if tools[node_id].output_data is not None:
+                notify('rows', node_id, len(tools[node_id].output_data))
+            notify('finished', node_id, node_metrics)
+
+class _CollectPlans:
+    """Collects the plans and writes the outputs; shaped like a tool so it is measured like one"""
+
+    def __init__(self, backend: PolarsBackend, plans: List[Any], tools: List[Any]):
+        self.backend = backend
+        self.plans = plans
+        self.tools = tools
+        self.spans = []
+        self.results = None
+
+    def execute(self):
+        from tools import OutputTool
+
+        start = time.perf_counter()
+        self.results = self.backend.collect(self.plans)
+        self.spans.append(('polars_collect', 'compute', start, time.perf_counter()))
+        for tool, frame in zip(self.tools, self.results):
+            if isinstance(tool, OutputTool):
+                with tool.span('write_csv', 'io'):
+                    frame.write_csv(tool.file_path)
+                self.spans.extend(tool.spans)
+
+def get_backend(name: str):
+    if name == 'pandas':
+        return PandasBackend()
+    if name == 'polars':
+        return PolarsBackend()
+    raise ValueError(f"Unknown backend '{name}', expected one of {', '.join(BACKENDS)}")
@@ -0,0 +1,333 @@
+"""Headless benchmarks for every tool and representative workflows.
+
+Run the suite and write results:
+
+    python benchmarks/bench.py run --scale 1M --output results.json
+
+Compare against a stored baseline, failing on regressions above 10%:
+
+    python benchmarks/bench.py compare baseline.json results.json --threshold 0.10
+
+Check that a backend produces the same results as pandas for every case:
+
+    python benchmarks/bench.py parity --backend polars --scale 100K
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from datasets import SCALES, make_dataset, dataset_path
+from tools import (InputTool, SelectTool, FilterTool, JoinTool, MergeTool,
+                   FormulaTool, OutputTool, AggregateTool, SQLTool, SortTool,
+                   UnionTool, IntersectTool, DifferenceTool, DeduplicateTool,
+                   ReplaceTool, WindowTool, TransformTool)
+from workflow_manager import WorkflowManager
+
+WORKFLOW_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'workflows')
+
+class BenchContext:
+    """Datasets and scratch paths shared by all benchmark cases"""
+
+    def __init__(self, args):
+        self.rows = SCALES.get(args.scale, None) or int(args.rows or SCALES['1M'])
+        self.width = args.width
+        self.cardinality = args.cardinality
+        self.string_length = args.string_length
+        self.data_dir = args.data_dir
+        self.csv_path = dataset_path(self.data_dir, self.rows, self.width,
+                                     self.cardinality, self.string_length)
+        self.data = make_dataset(self.rows, self.width, self.cardinality, self.string_length)
+        self.lookup = pd.DataFrame({
+            'key': np.arange(self.cardinality),
+            'label': [f"label_{i}" for i in range(self.cardinality)]
+        })
+        self.output_path = os.path.join(self.data_dir, 'bench_output.csv')
+        self.sqlite_output_path = os.path.join(self.data_dir, 'bench_output.db')
+        self._sqlite_path = None
+
+    def sqlite_path(self) -> str:
+        """Load the dataset into a SQLite database once and return its path"""
+        if self._sqlite_path is None:
+            path = os.path.splitext(self.csv_path)[0] + '.db'
+            if not os.path.exists(path):
+                with_input(OutputTool(path + '.tmp', 'sqlite', table='data'), self.data).execute()
+                os.replace(path + '.tmp', path)
+            self._sqlite_path = path
+        return self._sqlite_path
+
+def with_input(tool, data):
+    tool.input_data = data
+    return tool
+
+def with_inputs(tool, *frames):
+    tool.inputs = list(frames)
+    tool.input_data = frames[0]
+    return tool
+
+def with_sample(tool, **sample):
+    """Read as in design mode"""
+    tool.sample = sample
+    return tool
+
+def value_ratio(frame):
+    """Transform function for the TransformTool cases"""
+    return frame.assign(ratio=frame['value'] / (frame['amount'] + 1))
+
+TRANSFORM_FUNCTION = f"{os.path.abspath(__file__)}:value_ratio"
+
+# Each case builds a ready-to-run tool; only tool.execute() is timed
+TOOL_CASES = {
+    'InputTool': lambda ctx: InputTool(ctx.csv_path),
+    'InputTool.sample_head': lambda ctx: with_sample(InputTool(ctx.csv_path), method='head'),
+    'InputTool.sample_every': lambda ctx: with_sample(InputTool(ctx.csv_path), method='every', rows=10**9),
+    'InputTool.sample_reservoir': lambda ctx: with_sample(InputTool(ctx.csv_path), method='reservoir'),
+    'SelectTool': lambda ctx: with_input(SelectTool(['id', 'key', 'value']), ctx.data),
+    'SelectTool.drop': lambda ctx: with_input(SelectTool(['category'], drop_columns=True), ctx.data),
+    'FilterTool': lambda ctx: with_input(FilterTool('value > 0.5 and amount < 500'), ctx.data),
+    'JoinTool': lambda ctx: with_input(JoinTool(ctx.lookup, 'left', 'key', 'key'), ctx.data),
+    'MergeTool': lambda ctx: with_input(MergeTool([ctx.data]), ctx.data),
+    'FormulaTool': lambda ctx: with_input(FormulaTool('value * amount', 'total'), ctx.data),
+    'InputTool.sqlite': lambda ctx: InputTool(ctx.sqlite_path(), file_format='sqlite', table='data'),
+    'OutputTool': lambda ctx: with_input(OutputTool(ctx.output_path), ctx.data),
+    'OutputTool.sqlite': lambda ctx: with_input(
+        OutputTool(ctx.sqlite_output_path, 'sqlite', table='data'), ctx.data),
+    'OutputTool.sqlite_upsert': lambda ctx: with_input(
+        OutputTool(ctx.sqlite_output_path, 'sqlite', table='data_upsert', upsert_keys=['id']), ctx.data),
+    'AggregateTool': lambda ctx: with_input(
+        AggregateTool({'value': ['sum', 'mean'], 'amount': ['max', 'count']}, 'category'), ctx.data),
+    'SortTool': lambda ctx: with_input(SortTool(['category', 'value'], [True, False]), ctx.data),
+    'SortTool.external': lambda ctx: with_input(
+        SortTool(['category', 'value'], [True, False], memory_limit_mb=0,
+                 chunk_rows=max(1, ctx.rows // 8)), ctx.data),
+    'SortTool.top_n': lambda ctx: with_input(SortTool(['value', 'id'], [False, True], limit=100), ctx.data),
+    'UnionTool': lambda ctx: with_inputs(UnionTool(), ctx.data, ctx.data.iloc[::2]),
+    'IntersectTool': lambda ctx: with_inputs(IntersectTool(['id', 'key']), ctx.data, ctx.data.iloc[::2]),
+    'DifferenceTool': lambda ctx: with_inputs(DifferenceTool(['id', 'key']), ctx.data, ctx.data.iloc[::2]),
+    'DifferenceTool.spill': lambda ctx: with_inputs(
+        DifferenceTool(['id', 'key'], memory_limit_mb=1), ctx.data, ctx.data.iloc[::2]),
+    'DeduplicateTool': lambda ctx: with_input(DeduplicateTool(['key', 'amount']), ctx.data),
+    'DeduplicateTool.spill': lambda ctx: with_input(
+        DeduplicateTool(['key', 'amount'], memory_limit_mb=1), ctx.data),
+    'DeduplicateTool.bloom': lambda ctx: with_input(
+        DeduplicateTool(['key', 'amount'], bloom_filter=True), ctx.data),
+    'ReplaceTool.mapping': lambda ctx: with_input(ReplaceTool(['category'], mapping={
+        label: label.upper() for label in ctx.data['category'].unique()[::2]}), ctx.data),
+    'ReplaceTool.regex': lambda ctx: with_input(
+        ReplaceTool(['category'], regex={'^([a-m])': r'\1-', '[aeiou]': '*'}), ctx.data),
+    'WindowTool': lambda ctx: with_input(WindowTool([
+        {'function': 'row_number'}, {'function': 'rank'},
+        {'function': 'cumsum', 'column': 'amount'}, {'function': 'lag', 'column': 'value'},
+        {'function': 'rolling', 'column': 'value', 'window': 7}], ['key'], ['amount']), ctx.data),
+    'TransformTool': lambda ctx: with_input(TransformTool(TRANSFORM_FUNCTION), ctx.data),
+    'TransformTool.workers': lambda ctx: with_input(TransformTool(
+        TRANSFORM_FUNCTION, batch_rows=max(1, ctx.rows // 4), workers=4), ctx.data),
+    'SQLTool.group_by': lambda ctx: with_inputs(SQLTool(
+        "SELECT category, sum(value) AS value_sum, avg(value) AS value_mean, "
+        "max(amount) AS amount_max, count(amount) AS amount_count FROM input GROUP BY category"), ctx.data),
+    'SQLTool.join': lambda ctx: with_inputs(SQLTool(
+        "SELECT * FROM input1 LEFT JOIN input2 USING (key)"), ctx.data, ctx.lookup)
+}
+
+def time_case(run, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        execute = run()
+        start = time.perf_counter()
+        execute()
+        timings.append(time.perf_counter() - start)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'repeat': repeat
+    }
+
+def selected_by(args):
+    def selected(name):
+        return not args.only or any(pattern in name for pattern in args.only)
+    return selected
+
+def load_workflow(file_path: str, ctx: BenchContext) -> WorkflowManager:
+    """Load a workflow JSON, pointing $INPUT/$OUTPUT placeholders at the benchmark files"""
+    manager = WorkflowManager()
+    manager.load_workflow(file_path)
+    manager.track_memory = False
+    for node in manager.nodes.values():
+        for key, value in node['properties'].items():
+            if value == '$INPUT':
+                node['properties'][key] = ctx.csv_path
+            elif value == '$OUTPUT':
+                node['properties'][key] = ctx.output_path
+    return manager
+
+def run_suite(args) -> dict:
+    ctx = BenchContext(args)
+    results = {}
+    selected = selected_by(args)
+
+    for name, build in TOOL_CASES.items():
+        if selected(name):
+            try:
+                results[f"tool/{name}"] = time_case(lambda: build(ctx).execute, args.repeat)
+            except ImportError as e:
+                # Tools backed by optional packages are skipped when those are missing
+                print(f"tool/{name}: skipped ({e})", file=sys.stderr)
+                continue
+            print(f"tool/{name}: {results[f'tool/{name}']['min']:.4f}s", file=sys.stderr)
+
+    if not args.skip_workflows:
+        for file_name in sorted(os.listdir(WORKFLOW_DIR)):
+            name = f"workflow/{os.path.splitext(file_name)[0]}"
+            if file_name.endswith('.json') and selected(name):
+                path = os.path.join(WORKFLOW_DIR, file_name)
+                results[name] = time_case(lambda: load_workflow(path, ctx).execute_workflow, args.repeat)
+                print(f"{name}: {results[name]['min']:.4f}s", file=sys.stderr)
+
+    if any(module.startswith('PyQt6') for module in sys.modules):
+        print("warning: PyQt6 was imported during the benchmark run", file=sys.stderr)
+
+    return {
+        'meta': {
+            'rows': ctx.rows,
+            'width': ctx.width,
+            'cardinality': ctx.cardinality,
+            'string_length': ctx.string_length,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'timestamp': time.time()
+        },
+        'results': results
+    }
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """Print a comparison table and return the number of regressions"""
+    regressions = 0
+    print(f"{'benchmark':40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:40} {'-':>10} {result['min']:>10.4f} {'new':>8}")
+            continue
+        change = result['min'] / base['min'] - 1 if base['min'] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:40} {base['min']:>10.4f} {result['min']:>10.4f} {change:>+8.1%}{flag}")
+    return regressions
+
+def frame_difference(expected: pd.DataFrame, actual: pd.DataFrame):
+    """Describe how two results differ, or return None if they hold the same rows in any order"""
+    if list(expected.columns) != list(actual.columns):
+        return f"columns differ: {list(expected.columns)} != {list(actual.columns)}"
+    if len(expected) != len(actual):
+        return f"row counts differ: {len(expected)} != {len(actual)}"
+    columns = list(expected.columns)
+    try:
+        pd.testing.assert_frame_equal(expected.sort_values(columns, ignore_index=True),
+                                      actual.sort_values(columns, ignore_index=True),
+                                      check_dtype=False)
+    except AssertionError as e:
+        return str(e).strip().splitlines()[0]
+    return None
+
+def run_parity(args) -> int:
+    """Run every tool case and workflow with pandas and with args.backend; return the mismatch count"""
+    from backends import get_backend
+
+    backend = get_backend(args.backend)
+    ctx = BenchContext(args)
+    selected = selected_by(args)
+    mismatches = 0
+
+    def report(name, difference):
+        nonlocal mismatches
+        if difference:
+            mismatches += 1
+        print(f"{name}: {difference or 'ok'}", file=sys.stderr)
+
+    for name, build in TOOL_CASES.items():
+        if selected(name):
+            try:
+                expected = build(ctx).execute()
+                actual = backend.execute_tool(build(ctx))
+            except ImportError as e:
+                print(f"tool/{name}: skipped ({e})", file=sys.stderr)
+                continue
+            report(f"tool/{name}", frame_difference(expected, actual))
+
+    for file_name in sorted(os.listdir(WORKFLOW_DIR)):
+        name = f"workflow/{os.path.splitext(file_name)[0]}"
+        if file_name.endswith('.json') and selected(name):
+            path = os.path.join(WORKFLOW_DIR, file_name)
+            expected = load_workflow(path, ctx)
+            expected.execute_workflow()
+            actual = load_workflow(path, ctx)
+            actual.backend = args.backend
+            actual.execute_workflow()
+            for node_id in expected.nodes_of_type('Output'):
+                report(f"{name}/{node_id}", frame_difference(expected.get_node_data(node_id),
+                                                             actual.get_node_data(node_id)))
+    return mismatches
+
+def add_dataset_arguments(parser, default_scale: str):
+    parser.add_argument('--scale', choices=sorted(SCALES), default=default_scale)
+    parser.add_argument('--rows', type=int, help="Row count, overriding --scale")
+    parser.add_argument('--width', type=int, default=8, help="Total number of columns")
+    parser.add_argument('--cardinality', type=int, default=1000, help="Distinct keys")
+    parser.add_argument('--string-length', type=int, default=12)
+    parser.add_argument('--only', nargs='*', help="Run only benchmarks whose name contains one of these")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'bebetteretl-bench'))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ETL tools and workflows without the GUI")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the benchmark suite")
+    add_dataset_arguments(run_parser, '1M')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--skip-workflows', action='store_true')
+    run_parser.add_argument('--output', help="Write results JSON here instead of stdout")
+
+    compare_parser = commands.add_parser('compare', help="Compare results against a baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="Allowed slowdown as a fraction (default 0.10)")
+
+    parity_parser = commands.add_parser('parity', help="Compare results of a backend against pandas")
+    add_dataset_arguments(parity_parser, '100K')
+    parity_parser.add_argument('--backend', default='polars')
+
+    args = parser.parse_args()
+    if getattr(args, 'rows', None):
+        args.scale = None
+    if args.command == 'parity':
+        sys.exit(1 if run_parity(args) else 0)
+    elif args.command == 'run':
+        results = run_suite(args)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Named scales accepted by --scale
+SCALES = {
+    '100K': 100_000,
+    '1M': 1_000_000,
+    '10M': 10_000_000,
+    '50M': 50_000_000
+}
+
+def make_dataset(rows: int, width: int = 8, cardinality: int = 1000,
+                 string_length: int = 12, seed: int = 0) -> pd.DataFrame:
+    """Generate a synthetic frame with id, key, category, value and amount
+    columns plus enough float columns f0, f1, ... to reach width columns"""
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, cardinality, rows)
+
+    # Fixed-length category labels, one per key
+    alphabet = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    labels = np.array([''.join(rng.choice(alphabet, string_length)) for _ in range(cardinality)],
+                      dtype=object)
+
+    data = {
+        'id': np.arange(rows, dtype=np.int64),
+        'key': keys,
+        'category': labels[keys],
+        'value': rng.random(rows),
+        'amount': rng.integers(0, 1000, rows)
+    }
+    for i in range(max(0, width - len(data))):
+        data[f'f{i}'] = rng.standard_normal(rows)
+    return pd.DataFrame(data)
+
+def dataset_path(data_dir: str, rows: int, width: int, cardinality: int,
+                 string_length: int, seed: int = 0) -> str:
+    """Write the dataset as CSV once and return its path"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"data_{rows}_{width}_{cardinality}_{string_length}_{seed}.csv")
+    if not os.path.exists(path):
+        make_dataset(rows, width, cardinality, string_length, seed).to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    return path
@@ -0,0 +1,59 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+class FileWatcher:
+    """Poll files for changes and report each burst of changes once it settles.
+
+    Polling os.stat works the same on every platform and filesystem (including
+    network mounts where inotify sees nothing), and a stat per input file per
+    second costs next to nothing.
+    """
+
+    def __init__(self, paths: Iterable[str], interval: float = 1.0, debounce: float = 0.5):
+        self.interval = interval  # Seconds between polls
+        self.debounce = debounce  # Quiet seconds required before reporting changes
+        self._snapshots: Dict[str, Optional[Tuple[int, int]]] = {}
+        self.set_paths(paths)
+
+    @staticmethod
+    def _snapshot(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def set_paths(self, paths: Iterable[str]):
+        """Watch these paths, keeping the known state of paths already watched"""
+        self._snapshots = {path: self._snapshots[path] if path in self._snapshots else self._snapshot(path)
+                           for path in paths}
+
+    def poll(self) -> Set[str]:
+        """Paths whose modification time or size changed since the last poll"""
+        changed = set()
+        for path, snapshot in self._snapshots.items():
+            current = self._snapshot(path)
+            if current != snapshot:
+                self._snapshots[path] = current
+                changed.add(path)
+        return changed
+
+    def wait(self, stop_event: Optional[threading.Event] = None) -> Set[str]:
+        """Block until files change and then stay unchanged for the debounce period.
+
+        Returns the changed paths, or an empty set if stop_event is set first.
+        """
+        stop_event = stop_event or threading.Event()
+        pending = set()
+        last_change = None
+        while not stop_event.wait(self.interval if not pending else min(self.interval, self.debounce)):
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_change = now
+            elif pending and now - last_change >= self.debounce:
+                return pending
+        return set()
@@ -1,20 +1,22 @@
 import sys
+import json
 import uuid
 import math
 import os
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QListWidget, QGraphicsView, QGraphicsScene,
-                            QGraphicsItem, QMenu, QGraphicsSceneContextMenuEvent,
+                            QGraphicsItem, QMenu,
                             QFileDialog, QMessageBox, QDialog, QLineEdit, QFormLayout,
-                            QPushButton, QLabel, QGraphicsPathItem, QListWidgetItem,
+                            QPushButton, QLabel, QListWidgetItem,
                             QCheckBox, QScrollArea, QFrame, QComboBox, QTableWidget, QTableWidgetItem,
-                            QToolTip, QSlider, QToolButton, QGraphicsObject)
-from PyQt6.QtCore import Qt, QPointF, QRectF, QLineF, pyqtSignal, QPropertyAnimation, QEasingCurve, QTimer, QMimeData, QObject
-from PyQt6.QtGui import (QPen, QBrush, QColor, QPainterPath, QPainter, QLinearGradient, 
-                        QIcon, QFont, QTransform, QPainterPath, QFontMetrics, QDrag)
+                            QSlider, QToolButton, QGraphicsObject, QPlainTextEdit,
+                            QSpinBox, QInputDialog)
+from PyQt6.QtCore import Qt, QPointF, QRectF, QLineF, pyqtSignal, QPropertyAnimation, QTimer, QMimeData, QFileSystemWatcher
+from PyQt6.QtGui import (QPen, QBrush, QColor, QPainterPath, QPainter,
+                        QIcon, QFont, QTransform, QDrag, QPixmap)
 from workflow_manager import WorkflowManager
-from tools import *
-from preview_window import PreviewWindow
+from workflow_worker import WorkflowWorker
+from tool_registry import NODE_SCHEMA, tool_names, get_tool_spec
 
 # Define colors for different tool types
 TOOL_COLORS = {
@@ -26,37 +28,59 @@ TOOL_COLORS = {
     "Formula": QColor(235, 255, 245), # Light teal
     "Output": QColor(255, 235, 235),  # Light red
     "Browse": QColor(245, 245, 245),  # Light gray
-    "Aggregate": QColor(255, 245, 215) # Light yellow
+    "Aggregate": QColor(255, 245, 215), # Light yellow
+    "SQL": QColor(225, 240, 250),     # Light steel blue
+    "Sort": QColor(240, 250, 225),    # Light lime
+    "Union": QColor(230, 245, 240),   # Light mint
+    "Intersect": QColor(240, 235, 250), # Light lavender
+    "Difference": QColor(250, 235, 230), # Light salmon
+    "Deduplicate": QColor(235, 240, 250), # Light steel
+    "Replace": QColor(250, 240, 245), # Light rose
+    "Window": QColor(245, 240, 225),  # Light sand
+    "Transform": QColor(230, 240, 250) # Light sky
 }
 
-class GridBackground(QGraphicsItem):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.grid_size = 20
-        self.setZValue(-1)
-        self.major_grid_size = 100  # Size of major grid lines
-        self.grid_color = QColor(240, 240, 240)
-        self.major_grid_color = QColor(220, 220, 220)
+# Node border colors while a workflow runs
+STATUS_COLORS = {
+    "running": QColor(0, 120, 215),   # Blue
+    "finished": QColor(40, 167, 69),  # Green
+    "failed": QColor(220, 53, 69),    # Red
+    "cancelled": QColor(150, 150, 150) # Gray
+}
+SAMPLED_COLOR = QColor(230, 140, 20)  # Marks results computed from design mode samples
 
-    def boundingRect(self):
-        return QRectF(-10000, -10000, 20000, 20000)
+ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
+ICON_SIZE = 40  # Icon size on the node in scene units
+ICON_NAMES = {"Deduplicate": "duplicate", "Window": "group"}  # Tool types whose icon file is not named after them
 
-    def paint(self, painter, option, widget):
-        # Draw major grid lines
-        painter.setPen(QPen(self.major_grid_color, 1, Qt.PenStyle.SolidLine))
-        for x in range(-10000, 10000, self.major_grid_size):
-            painter.drawLine(x, -10000, x, 10000)
-        for y in range(-10000, 10000, self.major_grid_size):
-            painter.drawLine(-10000, y, 10000, y)
-
-        # Draw minor grid lines
-        painter.setPen(QPen(self.grid_color, 1, Qt.PenStyle.SolidLine))
-        for x in range(-10000, 10000, self.grid_size):
-            if x % self.major_grid_size != 0:  # Skip major grid lines
-                painter.drawLine(x, -10000, x, 10000)
-        for y in range(-10000, 10000, self.grid_size):
-            if y % self.major_grid_size != 0:  # Skip major grid lines
-                painter.drawLine(-10000, y, 10000, y)
+# Rasterized tool icons shared by all nodes, keyed by tool type and pixel size
+_icon_pixmaps = {}
+
+def tool_icon_pixmap(tool_type, pixel_size):
+    key = (tool_type, pixel_size)
+    if key not in _icon_pixmaps:
+        icon_name = ICON_NAMES.get(tool_type, tool_type.lower())
+        icon_path = os.path.join(ICON_DIR, f"{icon_name}.svg")
+        if os.path.exists(icon_path):
+            _icon_pixmaps[key] = QIcon(icon_path).pixmap(pixel_size, pixel_size)
+        else:
+            _icon_pixmaps[key] = None
+    return _icon_pixmaps[key]
+
+BADGE_HEIGHT = 18  # Height of the metrics badge drawn under a node after a run
+
+def format_bytes(value):
+    if value is None:
+        return "-"
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+def format_seconds(value):
+    if value is None:
+        return "-"
+    return f"{value * 1000:.0f} ms" if value < 1 else f"{value:.2f} s"
 
 class FieldListWidget(QListWidget):
     def __init__(self, parent=None):
@@ -442,11 +466,23 @@ class FilterToolDialog(QDialog):
             return f"{field} {operator_map[operator]} '{value}'"
 
 class ConnectionLine(QGraphicsObject):
+    # Below this zoom level edges are drawn as plain straight lines
+    LOD_THRESHOLD = 0.4
+
+    # Connections waiting for a path rebuild, flushed together once per frame
+    _pending = set()
+    _flush_timer = None
+
+    # Pens shared by all connections, keyed by alpha
+    _pens = {}
+
     def __init__(self, source_node, target_node):
         super().__init__()
         self.source_node = source_node
         self.target_node = target_node
         self._opacity = 1.0
+        self._path = QPainterPath()
+        self._line = QLineF()
         self.setZValue(-1)  # Draw connections below nodes
         
         # Create animation
@@ -456,8 +492,8 @@ class ConnectionLine(QGraphicsObject):
         self.animation.setEndValue(0.7)
         
         # Update path when nodes move
-        self.source_node.positionChanged.connect(self.update_path)
-        self.target_node.positionChanged.connect(self.update_path)
+        self.source_node.positionChanged.connect(self.schedule_update)
+        self.target_node.positionChanged.connect(self.schedule_update)
         self.update_path()
         
     @property
@@ -468,6 +504,38 @@ class ConnectionLine(QGraphicsObject):
     def opacity(self, value):
         self._opacity = value
         self.update()
+
+    @classmethod
+    def shared_pen(cls, opacity):
+        alpha = int(255 * opacity)
+        pen = cls._pens.get(alpha)
+        if pen is None:
+            pen = QPen(QColor(100, 100, 100, alpha), 2)
+            pen.setStyle(Qt.PenStyle.SolidLine)
+            cls._pens[alpha] = pen
+        return pen
+
+    def schedule_update(self):
+        ConnectionLine._pending.add(self)
+        timer = ConnectionLine._flush_timer
+        if timer is None:
+            timer = QTimer()
+            timer.setSingleShot(True)
+            timer.setInterval(16)
+            timer.timeout.connect(ConnectionLine.flush_pending)
+            ConnectionLine._flush_timer = timer
+        if not timer.isActive():
+            timer.start()
+
+    @classmethod
+    def flush_pending(cls):
+        pending, cls._pending = cls._pending, set()
+        for connection in pending:
+            try:
+                if connection.scene() is not None:
+                    connection.update_path()
+            except RuntimeError:
+                pass  # Connection was deleted before the flush
         
     def update_path(self):
         if not self.source_node or not self.target_node:
@@ -478,47 +546,41 @@ class ConnectionLine(QGraphicsObject):
         target_pos = self.target_node.pos()
         
         # Create a path from source to target
-        self._path = QPainterPath()
-        self._path.moveTo(source_pos)
+        path = QPainterPath()
+        path.moveTo(source_pos)
         
         # Add a curve to the path
         control_point1 = QPointF(source_pos.x() + (target_pos.x() - source_pos.x()) * 0.5, source_pos.y())
         control_point2 = QPointF(source_pos.x() + (target_pos.x() - source_pos.x()) * 0.5, target_pos.y())
-        self._path.cubicTo(control_point1, control_point2, target_pos)
+        path.cubicTo(control_point1, control_point2, target_pos)
         
         # Update the path
+        self.prepareGeometryChange()
+        self._path = path
+        self._line = QLineF(source_pos, target_pos)
         self.update()
         
     def boundingRect(self):
         if not self.source_node or not self.target_node:
             return QRectF()
-        return self._path.boundingRect()
+        # Include the pen width
+        return self._path.boundingRect().adjusted(-2, -2, 2, 2)
         
     def paint(self, painter, option, widget):
         if not self.source_node or not self.target_node:
             return
-            
-        # Set up the painter
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Create gradient
-        gradient = QLinearGradient(
-            self.source_node.pos(),
-            self.target_node.pos()
-        )
-        gradient.setColorAt(0, QColor(100, 100, 100, int(255 * self._opacity)))
-        gradient.setColorAt(1, QColor(100, 100, 100, int(255 * self._opacity)))
-        
-        # Set the pen with gradient
-        pen = QPen(gradient, 2)
-        pen.setStyle(Qt.PenStyle.SolidLine)
-        painter.setPen(pen)
-        
-        # Draw the path
-        painter.drawPath(self._path)
+
+        painter.setPen(self.shared_pen(self._opacity))
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < self.LOD_THRESHOLD:
+            # Curves are indistinguishable from straight lines when zoomed out
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+            painter.drawLine(self._line)
+        else:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.drawPath(self._path)
 
 class BrowseToolDialog(QDialog):
-    def __init__(self, data, parent=None):
+    def __init__(self, data, parent=None, sampled=False):
         super().__init__(parent)
         self.setWindowTitle("Browse Data")
         self.setMinimumWidth(800)
@@ -527,21 +589,25 @@ class BrowseToolDialog(QDialog):
         layout = QVBoxLayout()
         
         # Add header
-        header_label = QLabel("Data Preview")
-        header_label.setStyleSheet("""
-            QLabel {
+        header_label = QLabel("Data Preview (sampled input, design mode)" if sampled else "Data Preview")
+        header_label.setStyleSheet(f"""
+            QLabel {{
                 font-size: 14px;
                 font-weight: bold;
-                color: black;
+                color: {SAMPLED_COLOR.name() if sampled else 'black'};
                 padding: 5px;
-            }
+            }}
         """)
         layout.addWidget(header_label)
         
-        # Create table widget
-        self.table = QTableWidget()
-        self.table.setStyleSheet("""
-            QTableWidget {
+        # Create data browser over the full frame; imported here as it pulls in pandas
+        from preview_window import DataBrowserWidget
+        if data is None:
+            import pandas as pd
+            data = pd.DataFrame()
+        self.browser = DataBrowserWidget(data)
+        self.browser.setStyleSheet("""
+            QTableView {
                 background-color: white;
                 border: 1px solid #ccc;
                 border-radius: 5px;
@@ -556,20 +622,7 @@ class BrowseToolDialog(QDialog):
             }
         """)
         
-        # Populate table with data
-        if data is not None:
-            self.table.setRowCount(len(data))
-            self.table.setColumnCount(len(data.columns))
-            self.table.setHorizontalHeaderLabels(data.columns)
-            
-            # Fill data
-            for i in range(len(data)):
-                for j in range(len(data.columns)):
-                    item = QTableWidgetItem(str(data.iloc[i, j]))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Make read-only
-                    self.table.setItem(i, j, item)
-        
-        layout.addWidget(self.table)
+        layout.addWidget(self.browser)
         
         # Add buttons
         button_layout = QHBoxLayout()
@@ -594,6 +647,232 @@ class BrowseToolDialog(QDialog):
         self.setLayout(layout)
         close_button.clicked.connect(self.accept)
 
+    def done(self, result):
+        self.browser.stop_stats()
+        super().done(result)
+
+class SQLToolDialog(QDialog):
+    def __init__(self, properties, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Configure SQL Tool")
+        self.setMinimumWidth(600)
+        self.setMinimumHeight(400)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Query (inputs are tables input1, input2, ... in connection order):"))
+        self.query_edit = QPlainTextEdit(properties.get('query', ''))
+        self.query_edit.setFont(QFont("Courier New", 10))
+        layout.addWidget(self.query_edit)
+
+        form = QFormLayout()
+        self.table_names_edit = QLineEdit(", ".join(properties.get('table_names') or []))
+        self.table_names_edit.setPlaceholderText("input1, input2, ...")
+        form.addRow("Table names:", self.table_names_edit)
+        self.memory_limit_edit = QLineEdit(properties.get('memory_limit') or "")
+        self.memory_limit_edit.setPlaceholderText("e.g. 4GB")
+        form.addRow("Memory limit:", self.memory_limit_edit)
+        layout.addLayout(form)
+
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def get_configuration(self):
+        configuration = {'query': self.query_edit.toPlainText()}
+        table_names = [name.strip() for name in self.table_names_edit.text().split(",") if name.strip()]
+        if table_names:
+            configuration['table_names'] = table_names
+        if self.memory_limit_edit.text().strip():
+            configuration['memory_limit'] = self.memory_limit_edit.text().strip()
+        return configuration
+
+class SampleSettingsDialog(QDialog):
+    """Chooses how Input nodes sample their data in design mode"""
+
+    def __init__(self, sample, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Sample Settings")
+        self.setMinimumWidth(400)
+        # Imported here as tools pulls in pandas
+        from tools import SAMPLE_METHODS, SAMPLE_DEFAULTS
+        sample = {**SAMPLE_DEFAULTS, **sample}
+
+        layout = QVBoxLayout()
+        form = QFormLayout()
+        self.method_combo = QComboBox()
+        labels = {'head': "First rows", 'every': "Every k-th row", 'reservoir': "Random rows (reservoir)"}
+        for method in SAMPLE_METHODS:
+            self.method_combo.addItem(labels.get(method, method), method)
+        self.method_combo.setCurrentIndex(SAMPLE_METHODS.index(sample['method']))
+        form.addRow("Method:", self.method_combo)
+        self.rows_spin = QSpinBox()
+        self.rows_spin.setRange(1, 2_000_000_000)
+        self.rows_spin.setGroupSeparatorShown(True)
+        self.rows_spin.setValue(sample['rows'])
+        form.addRow("Rows:", self.rows_spin)
+        self.step_spin = QSpinBox()
+        self.step_spin.setRange(1, 1_000_000_000)
+        self.step_spin.setValue(sample['step'])
+        form.addRow("Every k-th row, k:", self.step_spin)
+        self.seed_spin = QSpinBox()
+        self.seed_spin.setRange(0, 2_000_000_000)
+        self.seed_spin.setValue(sample['seed'])
+        form.addRow("Random seed:", self.seed_spin)
+        layout.addLayout(form)
+
+        self.method_combo.currentIndexChanged.connect(self.update_fields)
+        self.update_fields()
+
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def update_fields(self):
+        method = self.method_combo.currentData()
+        self.step_spin.setEnabled(method == 'every')
+        self.seed_spin.setEnabled(method == 'reservoir')
+
+    def get_sample(self):
+        return {
+            'method': self.method_combo.currentData(),
+            'rows': self.rows_spin.value(),
+            'step': self.step_spin.value(),
+            'seed': self.seed_spin.value()
+        }
+
+class ToolPropertiesDialog(QDialog):
+    """Edits the properties of tools without a dedicated dialog, from their config schema"""
+
+    def __init__(self, tool_type, schema, properties, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Configure {tool_type} Tool")
+        self.setMinimumWidth(500)
+        self.properties = properties
+
+        layout = QVBoxLayout()
+        form = QFormLayout()
+        self.fields = {}
+        for key, field in schema.items():
+            if field.get('type') == 'dataframe':
+                continue  # Set from upstream data, not edited by hand
+            value = properties.get(key, field.get('default'))
+            if field.get('type') == 'bool' and not isinstance(value, list):
+                edit = QCheckBox()
+                edit.setChecked(bool(value))
+            else:
+                text = "" if value is None else value if isinstance(value, str) else json.dumps(value)
+                edit = QLineEdit(text)
+                edit.setPlaceholderText(field.get('type', ''))
+            label = key.replace('_', ' ').capitalize() + (" *" if field.get('required') else "")
+            form.addRow(f"{label}:", edit)
+            self.fields[key] = (field, edit)
+        layout.addLayout(form)
+
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def get_configuration(self):
+        configuration = dict(self.properties)
+        for key, (field, edit) in self.fields.items():
+            text = "" if isinstance(edit, QCheckBox) else edit.text().strip()
+            if isinstance(edit, QCheckBox):
+                configuration[key] = edit.isChecked()
+            elif not text:
+                configuration.pop(key, None)
+            elif field.get('type') == 'str':
+                configuration[key] = text
+            else:
+                # Lists, numbers and objects are entered as JSON; lists also as a, b, c
+                try:
+                    configuration[key] = json.loads(text)
+                except ValueError:
+                    if field.get('type') == 'list':
+                        configuration[key] = [item.strip() for item in text.split(",") if item.strip()]
+                    else:
+                        configuration[key] = text
+            # Leave untouched defaults unset, so they follow the tool's defaults
+            if key not in self.properties and configuration.get(key) == field.get('default'):
+                configuration.pop(key, None)
+        return configuration
+
+class RunSummaryDialog(QDialog):
+    COLUMNS = [
+        ("Node", None),
+        ("Wall time (s)", 'wall_time'),
+        ("CPU time (s)", 'cpu_time'),
+        ("Peak memory (MB)", 'peak_memory'),
+        ("Input rows", 'input_rows'),
+        ("Input columns", 'input_columns'),
+        ("Output rows", 'output_rows'),
+        ("Output columns", 'output_columns'),
+        ("Output size (MB)", 'output_bytes')
+    ]
+
+    def __init__(self, node_metrics, node_labels, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Run Summary")
+        self.setMinimumWidth(900)
+        self.setMinimumHeight(400)
+
+        layout = QVBoxLayout()
+
+        self.table = QTableWidget(len(node_metrics), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        for i, (node_id, metrics) in enumerate(node_metrics.items()):
+            label_item = QTableWidgetItem(node_labels.get(node_id, node_id))
+            label_item.setFlags(label_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.table.setItem(i, 0, label_item)
+            for j, (_, key) in enumerate(self.COLUMNS[1:], start=1):
+                value = metrics.get(key)
+                if value is not None and key in ('peak_memory', 'output_bytes'):
+                    value = round(value / (1024 * 1024), 2)
+                elif value is not None and key in ('wall_time', 'cpu_time'):
+                    value = round(value, 4)
+                item = QTableWidgetItem()
+                if value is not None:
+                    # Numeric display data sorts numerically
+                    item.setData(Qt.ItemDataRole.DisplayRole, value)
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.table.setItem(i, j, item)
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(1, Qt.SortOrder.DescendingOrder)
+        self.table.resizeColumnsToContents()
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
 class ToolNode(QGraphicsObject):
     positionChanged = pyqtSignal()  # Add signal for position changes
     
@@ -605,12 +884,17 @@ class ToolNode(QGraphicsObject):
         self.height = 60
         self.opacity = 1.0
         self.properties = {}  # Initialize properties dictionary
+        self.status = None  # Run status shown as the border color
+        self.metrics = None  # Metrics from the last run, drawn as a badge
         
         # Set flags for interaction
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
         self.setAcceptHoverEvents(True)
+
+        # Reuse the rendered node while panning and dragging
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         
         # Initialize hover animation
         self.hover_animation = QPropertyAnimation(self, b"opacity")
@@ -631,24 +915,18 @@ class ToolNode(QGraphicsObject):
         return None
         
     def create_connection(self, target_type: str):
-        # Find target nodes of the specified type
-        target_nodes = []
-        for item in self.scene().items():
-            if isinstance(item, ToolNode) and item.tool_type == target_type and item != self:
-                target_nodes.append(item)
+        # Find the first other node of the specified type
+        target_node = next((node for node in self.scene().nodes_of_type(target_type) if node != self), None)
         
-        if not target_nodes:
+        if target_node is None:
             QMessageBox.warning(None, "No Target", f"No {target_type} nodes found to connect to.")
             return
-            
-        # Create connection to the first target node
-        target_node = target_nodes[0]
         
         # Check if connection already exists
-        for conn in self.connections:
-            if conn.target_node == target_node:
-                QMessageBox.warning(None, "Connection Exists", "These nodes are already connected.")
-                return
+        workflow_manager = self.get_workflow_manager()
+        if workflow_manager and workflow_manager.has_connection(self.node_id, target_node.node_id):
+            QMessageBox.warning(None, "Connection Exists", "These nodes are already connected.")
+            return
                 
         # Create the connection
         connection = ConnectionLine(self, target_node)
@@ -657,33 +935,41 @@ class ToolNode(QGraphicsObject):
         target_node.connections.append(connection)
         
         # Update workflow manager
-        workflow_manager = self.get_workflow_manager()
         if workflow_manager:
             workflow_manager.add_connection(self.node_id, target_node.node_id)
         
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.RightButton:
             menu = QMenu()
+            editable = not self.scene().running
             
             # Add Configure action
             configure_action = menu.addAction("Configure")
+            configure_action.setEnabled(editable)
             configure_action.triggered.connect(self.configure_tool)
             
             # Add Preview Data action
             preview_action = menu.addAction("Preview Data")
             preview_action.triggered.connect(self.preview_data)
+
+            # Add Set Timeout action
+            timeout_action = menu.addAction("Set Timeout...")
+            timeout_action.setEnabled(editable)
+            timeout_action.triggered.connect(self.set_timeout)
             
             # Add Connect to... submenu
             connect_menu = menu.addMenu("Connect to...")
+            connect_menu.setEnabled(editable)
             
-            # Get all nodes in the scene
-            for item in self.scene().items():
-                if isinstance(item, ToolNode) and item != self:
-                    action = connect_menu.addAction(item.tool_type)
-                    action.triggered.connect(lambda checked, t=item.tool_type: self.create_connection(t))
+            # List every tool type that has a node other than this one
+            for tool_type in self.scene().node_types():
+                if any(node != self for node in self.scene().nodes_of_type(tool_type)[:2]):
+                    action = connect_menu.addAction(tool_type)
+                    action.triggered.connect(lambda checked, t=tool_type: self.create_connection(t))
             
             # Add Delete action
             delete_action = menu.addAction("Delete")
+            delete_action.setEnabled(editable)
             delete_action.triggered.connect(self.delete_node)
             
             menu.exec(event.screenPos())
@@ -691,19 +977,23 @@ class ToolNode(QGraphicsObject):
             super().mousePressEvent(event)
         
     def boundingRect(self):
-        return QRectF(0, 0, self.width, self.height)
+        height = self.height + BADGE_HEIGHT + 4 if self.metrics else self.height
+        return QRectF(0, 0, self.width, height)
         
     def paint(self, painter, option, widget):
         # Draw node background
         painter.setBrush(QBrush(TOOL_COLORS.get(self.tool_type, QColor(240, 240, 240))))
-        painter.setPen(QPen(QColor(200, 200, 200), 2))
+        painter.setPen(QPen(STATUS_COLORS.get(self.status, QColor(200, 200, 200)), 2))
         painter.drawRoundedRect(0, 0, self.width, self.height, 10, 10)
         
-        # Draw tool icon
-        icon_path = f"icons/{self.tool_type.lower()}.svg"
-        if os.path.exists(icon_path):
-            icon = QIcon(icon_path)
-            painter.drawPixmap(10, 10, 40, 40, icon.pixmap(40, 40))
+        # Draw tool icon, rasterized once per tool type and zoom level
+        scale = option.levelOfDetailFromTransform(painter.worldTransform())
+        if widget is not None:
+            scale *= widget.devicePixelRatioF()
+        pixel_size = max(8, int(math.ceil(ICON_SIZE * scale / 8)) * 8)
+        pixmap = tool_icon_pixmap(self.tool_type, pixel_size)
+        if pixmap is not None:
+            painter.drawPixmap(QRectF(10, 10, ICON_SIZE, ICON_SIZE), pixmap, QRectF(pixmap.rect()))
         
         # Draw tool name
         painter.setPen(QPen(QColor(50, 50, 50)))
@@ -722,7 +1012,48 @@ class ToolNode(QGraphicsObject):
         
         # Output port
         painter.drawEllipse(self.width - port_radius*2, int(self.height/2 - port_radius), port_radius*2, port_radius*2)
-        
+
+        # Metrics badge from the last run
+        if self.metrics:
+            sampled = self.metrics.get('sampled', False)
+            badge_rect = QRectF(0, self.height + 4, self.width, BADGE_HEIGHT)
+            painter.setBrush(QBrush(QColor(250, 250, 250)))
+            painter.setPen(QPen(SAMPLED_COLOR if sampled else QColor(200, 200, 200), 1))
+            painter.drawRoundedRect(badge_rect, 4, 4)
+            font.setPointSize(7)
+            painter.setFont(font)
+            painter.setPen(QPen(QColor(50, 50, 50)))
+            rows = self.metrics.get('output_rows')
+            text = format_seconds(self.metrics.get('wall_time'))
+            if rows is not None:
+                text += f" · {rows:,} rows"
+            if sampled:
+                text += " · sampled"
+                painter.setPen(QPen(SAMPLED_COLOR))
+            painter.drawText(badge_rect, Qt.AlignmentFlag.AlignCenter, text)
+        
+    def set_status(self, status):
+        self.status = status
+        self.update()
+
+    def set_metrics(self, metrics):
+        self.prepareGeometryChange()
+        self.metrics = metrics
+        if metrics:
+            self.setToolTip(
+                f"{self.tool_type}\n"
+                f"Wall time: {format_seconds(metrics.get('wall_time'))}\n"
+                f"CPU time: {format_seconds(metrics.get('cpu_time'))}\n"
+                f"Peak memory: {format_bytes(metrics.get('peak_memory'))}\n"
+                f"Input: {metrics.get('input_rows')} rows × {metrics.get('input_columns')} columns\n"
+                f"Output: {metrics.get('output_rows')} rows × {metrics.get('output_columns')} columns\n"
+                f"Output size: {format_bytes(metrics.get('output_bytes'))}"
+                + ("\nComputed from sampled input (design mode)" if metrics.get('sampled') else "")
+            )
+        else:
+            self.setToolTip(self.tool_type)
+        self.update()
+
     def configure_tool(self):
         workflow_manager = self.get_workflow_manager()
         if not workflow_manager:
@@ -732,29 +1063,57 @@ class ToolNode(QGraphicsObject):
         if self.tool_type == "Select":
             dialog = SelectToolDialog(self.properties.get('columns', []), self.scene().parent())
             if dialog.exec():
-                self.properties = dialog.get_selected_fields()
-                workflow_manager.update_node_properties(self.node_id, self.properties)
+                self.update_properties(dialog.get_selected_fields())
         elif self.tool_type == "Filter":
             dialog = FilterToolDialog(self.properties.get('columns', []), self.scene().parent())
             if dialog.exec():
-                self.properties = dialog.get_filter_condition()
-                workflow_manager.update_node_properties(self.node_id, self.properties)
+                self.update_properties(dialog.get_filter_condition())
         elif self.tool_type == "Aggregate":
             dialog = AggregateToolDialog(self.properties.get('columns', []), self.scene().parent())
             if dialog.exec():
-                self.properties = dialog.get_aggregations()
-                workflow_manager.update_node_properties(self.node_id, self.properties)
+                self.update_properties(dialog.get_aggregations())
         elif self.tool_type == "Input":
             dialog = InputToolDialog(self.scene().parent())
             if dialog.exec():
-                self.properties = dialog.get_configuration()
-                workflow_manager.update_node_properties(self.node_id, self.properties)
+                self.update_properties(dialog.get_configuration())
         elif self.tool_type == "Output":
             dialog = OutputToolDialog(self.scene().parent())
             if dialog.exec():
-                self.properties = dialog.get_configuration()
-                workflow_manager.update_node_properties(self.node_id, self.properties)
-                
+                self.update_properties(dialog.get_configuration())
+        elif self.tool_type == "SQL":
+            dialog = SQLToolDialog(self.properties, self.scene().parent())
+            if dialog.exec():
+                self.update_properties(dialog.get_configuration())
+        elif get_tool_spec(self.tool_type) is not None:
+            schema = get_tool_spec(self.tool_type).schema
+            dialog = ToolPropertiesDialog(self.tool_type, schema, self.properties, self.scene().parent())
+            if dialog.exec():
+                self.update_properties(dialog.get_configuration())
+
+    def update_properties(self, properties):
+        """Set the properties from a configure dialog, keeping node properties such as the timeout"""
+        for key in NODE_SCHEMA:
+            if key in self.properties:
+                properties.setdefault(key, self.properties[key])
+        self.properties = properties
+        self.get_workflow_manager().update_node_properties(self.node_id, properties)
+
+    def set_timeout(self):
+        workflow_manager = self.get_workflow_manager()
+        if not workflow_manager:
+            QMessageBox.critical(None, "Error", "Workflow manager not found.")
+            return
+
+        seconds, ok = QInputDialog.getDouble(self.scene().parent(), "Node Timeout",
+                                             "Timeout in seconds (0 for the run's default):",
+                                             float(self.properties.get('timeout') or 0), 0, 7 * 24 * 3600, 1)
+        if ok:
+            properties = {key: value for key, value in self.properties.items() if key != 'timeout'}
+            if seconds:
+                properties['timeout'] = seconds
+            self.properties = properties
+            workflow_manager.update_node_properties(self.node_id, properties)
+
     def preview_data(self):
         try:
             workflow_manager = self.get_workflow_manager()
@@ -764,7 +1123,8 @@ class ToolNode(QGraphicsObject):
                 
             data = workflow_manager.get_node_data(self.node_id)
             if data is not None:
-                dialog = BrowseToolDialog(data, self.scene().parent())
+                dialog = BrowseToolDialog(data, self.scene().parent(),
+                                          sampled=workflow_manager.is_sampled(self.node_id))
                 dialog.exec()
             else:
                 QMessageBox.warning(None, "No Data", "No data available for this node.")
@@ -801,6 +1161,13 @@ class ToolNode(QGraphicsObject):
     def itemChange(self, change, value):
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionChange:
             self.positionChanged.emit()
+        elif change in (QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged,
+                        QGraphicsItem.GraphicsItemChange.ItemSceneChange,
+                        QGraphicsItem.GraphicsItemChange.ItemSceneHasChanged):
+            # Old scene on ItemSceneChange, new scene on ItemSceneHasChanged
+            scene = self.scene()
+            if scene is not None and hasattr(scene, 'minimap'):
+                scene.minimap.invalidate_nodes()
         return super().itemChange(change, value)
 
 class AggregateToolDialog(QDialog):
@@ -987,15 +1354,44 @@ class WorkflowScene(QGraphicsScene):
         self.setSceneRect(-10000, -10000, 20000, 20000)
         self.workflow_manager = WorkflowManager()
         self.connections = []
-        
-        # Add grid background
-        self.grid = GridBackground()
-        self.addItem(self.grid)
+        self.running = False  # The graph is read-only while a run iterates the workflow manager's nodes
+
+        # Node items by id, so lookups never scan scene.items(); lookups by
+        # type go through the workflow manager's index
+        self.nodes_by_id = {}
         
         # Add minimap
         self.minimap = MinimapView(self)
         self.addItem(self.minimap)
 
+    def addItem(self, item):
+        super().addItem(item)
+        if isinstance(item, ToolNode):
+            self.nodes_by_id[item.node_id] = item
+
+    def removeItem(self, item):
+        if isinstance(item, ToolNode):
+            self.nodes_by_id.pop(item.node_id, None)
+        super().removeItem(item)
+
+    def node(self, node_id):
+        return self.nodes_by_id.get(node_id)
+
+    def nodes_of_type(self, tool_type):
+        return [self.nodes_by_id[node_id] for node_id in self.workflow_manager.nodes_of_type(tool_type)
+                if node_id in self.nodes_by_id]
+
+    def node_types(self):
+        return self.workflow_manager.node_types()
+
+    def clear(self):
+        # Keep the minimap across clears
+        self.removeItem(self.minimap)
+        super().clear()
+        self.nodes_by_id = {}
+        self.addItem(self.minimap)
+        self.minimap.invalidate_nodes()
+
 class MinimapView(QGraphicsItem):
     def __init__(self, scene):
         super().__init__()
@@ -1012,31 +1408,62 @@ class MinimapView(QGraphicsItem):
         self.drag_start = None
         self.view_rect = None
 
+        # Node rectangles are rendered into a pixmap that is rebuilt only after
+        # nodes are added, moved or removed, at most once per refresh interval
+        self.nodes_pixmap = None
+        self.refresh_timer = QTimer()
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(100)
+        self.refresh_timer.timeout.connect(self.refresh_nodes)
+
     def boundingRect(self):
         return QRectF(0, 0, self.width, self.height)
 
+    def scene_transform(self):
+        """Transform from scene coordinates to minimap coordinates"""
+        scene_rect = self.scene.sceneRect()
+        scale = min(self.width / scene_rect.width(), self.height / scene_rect.height())
+        transform = QTransform()
+        transform.scale(scale, scale)
+        transform.translate(-scene_rect.left(), -scene_rect.top())
+        return transform
+
+    def invalidate_nodes(self):
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+
+    def refresh_nodes(self):
+        self.nodes_pixmap = None
+        self.update()
+
+    def render_nodes(self):
+        pixmap = QPixmap(self.width, self.height)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setTransform(self.scene_transform())
+        painter.setPen(QPen(QColor(100, 100, 100), 0))
+        for node in self.scene.nodes_by_id.values():
+            painter.setBrush(QBrush(TOOL_COLORS.get(node.tool_type, QColor(245, 245, 245))))
+            painter.drawRect(node.boundingRect().translated(node.pos()))
+        painter.end()
+        return pixmap
+
     def paint(self, painter, option, widget):
         # Draw minimap background
         painter.setPen(QPen(QColor(200, 200, 200), 1))
         painter.setBrush(QBrush(QColor(255, 255, 255, 200)))
         painter.drawRoundedRect(0, 0, self.width, self.height, 8, 8)
 
-        # Draw scene content in minimap
-        scale = min(self.width / self.scene.width(), self.height / self.scene.height())
-        painter.scale(scale, scale)
-        
-        # Draw nodes
-        for item in self.scene.items():
-            if isinstance(item, ToolNode):
-                painter.setPen(QPen(QColor(100, 100, 100), 1))
-                painter.setBrush(QBrush(TOOL_COLORS.get(item.tool_type, QColor(245, 245, 245))))
-                painter.drawRect(item.boundingRect().translated(item.pos()))
+        # Draw cached nodes
+        if self.nodes_pixmap is None:
+            self.nodes_pixmap = self.render_nodes()
+        painter.drawPixmap(0, 0, self.nodes_pixmap)
 
         # Draw view rectangle
         if self.view_rect:
             painter.setPen(QPen(QColor(0, 120, 215), 2))
             painter.setBrush(QBrush(QColor(0, 120, 215, 30)))
-            painter.drawRect(self.view_rect)
+            painter.drawRect(self.scene_transform().mapRect(self.view_rect))
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -1057,8 +1484,9 @@ class MinimapView(QGraphicsItem):
         super().mouseReleaseEvent(event)
 
     def update_view_rect(self, view_rect):
-        self.view_rect = view_rect
-        self.update()
+        if view_rect != self.view_rect:
+            self.view_rect = view_rect
+            self.update()
 
 class WorkflowView(QGraphicsView):
     def __init__(self, scene, parent=None):
@@ -1073,6 +1501,17 @@ class WorkflowView(QGraphicsView):
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         self.setAcceptDrops(True)
         
+        # Grid settings, drawn by drawBackground
+        self.grid_size = 20
+        self.major_grid_size = 100  # Size of major grid lines
+        self.grid_color = QColor(240, 240, 240)
+        self.major_grid_color = QColor(220, 220, 220)
+        self.min_grid_spacing = 6  # Skip grid levels closer than this many pixels
+
+        # Keep the rendered background between repaints; only newly exposed areas are redrawn
+        self.setBackgroundBrush(QBrush(QColor(255, 255, 255)))
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+
         # Zoom settings
         self.zoom_factor = 1.0
         self.min_zoom = 0.1
@@ -1148,6 +1587,30 @@ class WorkflowView(QGraphicsView):
         zoom_widget.setFixedSize(200, 32)
         zoom_widget.move(10, 10)
 
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        scale = self.transform().m11()
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        # Minor lines first so major lines are drawn over them
+        for spacing, color in ((self.grid_size, self.grid_color),
+                               (self.major_grid_size, self.major_grid_color)):
+            if spacing * scale < self.min_grid_spacing:
+                continue  # Too dense to see at this zoom level
+            painter.setPen(QPen(color, 0, Qt.PenStyle.SolidLine))  # Cosmetic 1px pen
+            left = int(math.floor(rect.left() / spacing)) * spacing
+            top = int(math.floor(rect.top() / spacing)) * spacing
+            lines = []
+            for x in range(left, int(math.ceil(rect.right())) + 1, spacing):
+                if spacing == self.major_grid_size or x % self.major_grid_size != 0:
+                    lines.append(QLineF(x, rect.top(), x, rect.bottom()))
+            for y in range(top, int(math.ceil(rect.bottom())) + 1, spacing):
+                if spacing == self.major_grid_size or y % self.major_grid_size != 0:
+                    lines.append(QLineF(rect.left(), y, rect.right(), y))
+            painter.drawLines(lines)
+        painter.restore()
+
     def wheelEvent(self, event):
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
             # Zoom with Ctrl + mouse wheel
@@ -1184,6 +1647,9 @@ class WorkflowView(QGraphicsView):
             event.acceptProposedAction()
 
     def dropEvent(self, event):
+        if self.scene().running:
+            event.ignore()
+            return
         if event.mimeData().hasText():
             tool_type = event.mimeData().text()
             print(f"Creating tool node of type: {tool_type}")
@@ -1268,7 +1734,7 @@ class MainWindow(QMainWindow):
         """)
 
         # Add color-coded tool items with icons
-        tools = ["Input", "Select", "Filter", "Join", "Merge", "Formula", "Output", "Browse", "Aggregate"]
+        tools = tool_names() + ["Browse"]
         for tool in tools:
             item = QListWidgetItem(QIcon(f"icons/{tool.lower()}.png"), tool)
             color = TOOL_COLORS.get(tool, QColor(245, 245, 245))
@@ -1294,19 +1760,56 @@ class MainWindow(QMainWindow):
         # Connect signals
         tools_panel.itemDoubleClicked.connect(self.add_tool_to_workflow)
         
-        # Update minimap when view changes
+        # Update the minimap view rectangle when the view scrolls, zooms or
+        # resizes, coalescing bursts of changes into one update
+        self.minimap_timer = QTimer(self)
+        self.minimap_timer.setSingleShot(True)
+        self.minimap_timer.setInterval(30)
+        self.minimap_timer.timeout.connect(self.update_minimap_view_rect)
+        self.view.horizontalScrollBar().valueChanged.connect(self.schedule_minimap_update)
+        self.view.verticalScrollBar().valueChanged.connect(self.schedule_minimap_update)
+        self.view.zoom_slider.valueChanged.connect(self.schedule_minimap_update)
         self.view.viewport().installEventFilter(self)
         
+        # Background workflow run state
+        self.worker = None
+        self.node_timeout = None  # Default per-node timeout in seconds
+        self.run_nodes = {}
+        self.workflow_path = None  # File last saved or loaded; incremental state is saved next to it
+
+        # Watch mode: re-run the nodes downstream of input files when they change
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self.on_input_file_changed)
+        self.changed_files = set()
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.setInterval(500)  # Debounce bursts of writes
+        self.watch_timer.timeout.connect(self.run_changed_inputs)
+        self.watch_run = False
+
+        # Design mode: Input nodes read samples chosen in Sample Settings (tool defaults until then)
+        self.sample_settings = {}
+        self.design_label = QLabel("Design mode: sampled inputs")
+        self.design_label.setStyleSheet(f"color: {SAMPLED_COLOR.name()}; font-weight: bold; padding: 0 8px;")
+        self.design_label.setVisible(False)
+        self.statusBar().addPermanentWidget(self.design_label)
+
         # Create menu bar with modern styling
         self.create_menu_bar()
 
     def eventFilter(self, obj, event):
-        if obj == self.view.viewport() and event.type() == event.Type.Paint:
-            # Update minimap view rectangle
-            view_rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
-            self.scene.minimap.update_view_rect(view_rect)
+        if obj == self.view.viewport() and event.type() in (event.Type.Resize, event.Type.Show):
+            self.schedule_minimap_update()
         return super().eventFilter(obj, event)
 
+    def schedule_minimap_update(self):
+        if not self.minimap_timer.isActive():
+            self.minimap_timer.start()
+
+    def update_minimap_view_rect(self):
+        view_rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        self.scene.minimap.update_view_rect(view_rect)
+
     def create_menu_bar(self):
         menubar = self.menuBar()
         menubar.setStyleSheet("""
@@ -1345,11 +1848,38 @@ class MainWindow(QMainWindow):
         save_action = file_menu.addAction("Save Workflow")
         save_action.triggered.connect(self.save_workflow)
         
-        load_action = file_menu.addAction("Load Workflow")
-        load_action.triggered.connect(self.load_workflow)
+        self.load_action = file_menu.addAction("Load Workflow")
+        self.load_action.triggered.connect(self.load_workflow)
         
-        run_action = file_menu.addAction("Run Workflow")
-        run_action.triggered.connect(self.run_workflow)
+        self.run_action = file_menu.addAction("Run Workflow")
+        self.run_action.triggered.connect(lambda: self.run_workflow())
+
+        self.watch_action = file_menu.addAction("Watch Inputs")
+        self.watch_action.setCheckable(True)
+        self.watch_action.toggled.connect(self.set_watching)
+
+        self.polars_action = file_menu.addAction("Use Polars Backend")
+        self.polars_action.setCheckable(True)
+        self.polars_action.toggled.connect(self.set_polars_backend)
+
+        self.track_memory_action = file_menu.addAction("Track Peak Memory")
+        self.track_memory_action.setCheckable(True)
+        self.track_memory_action.toggled.connect(self.set_track_memory)
+
+        self.design_action = file_menu.addAction("Design Mode (Sampled Inputs)")
+        self.design_action.setCheckable(True)
+        self.design_action.setShortcut("Ctrl+D")
+        self.design_action.toggled.connect(self.set_design_mode)
+
+        self.sample_settings_action = file_menu.addAction("Sample Settings...")
+        self.sample_settings_action.triggered.connect(self.edit_sample_settings)
+
+        self.cancel_action = file_menu.addAction("Cancel Run")
+        self.cancel_action.setEnabled(False)
+        self.cancel_action.triggered.connect(self.cancel_workflow)
+
+        export_trace_action = file_menu.addAction("Export Run Trace")
+        export_trace_action.triggered.connect(self.export_trace)
 
         # Add View menu
         view_menu = menubar.addMenu("View")
@@ -1366,7 +1896,13 @@ class MainWindow(QMainWindow):
         reset_zoom_action.setShortcut("Ctrl+0")
         reset_zoom_action.triggered.connect(lambda: self.view.zoom_slider.setValue(100))
 
+        view_menu.addSeparator()
+        run_summary_action = view_menu.addAction("Run Summary")
+        run_summary_action.triggered.connect(self.show_run_summary)
+
     def add_tool_to_workflow(self, item):
+        if self.scene.running:
+            return
         tool_type = item.text()
         tool_node = ToolNode(tool_type)
         self.scene.addItem(tool_node)
@@ -1388,6 +1924,7 @@ class MainWindow(QMainWindow):
                                                  "Workflow Files (*.json);;All Files (*)")
         if file_path:
             self.scene.workflow_manager.save_workflow(file_path)
+            self.workflow_path = file_path
 
     def load_workflow(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Load Workflow", "", 
@@ -1395,8 +1932,40 @@ class MainWindow(QMainWindow):
         if file_path:
             self.scene.clear()
             self.scene.workflow_manager.load_workflow(file_path)
+            self.workflow_path = file_path
+            self.polars_action.setChecked(self.scene.workflow_manager.backend == 'polars')
             self.recreate_workflow()
 
+    def set_polars_backend(self, enabled):
+        # Saved with the workflow
+        self.scene.workflow_manager.backend = 'polars' if enabled else 'pandas'
+
+    def set_track_memory(self, enabled):
+        # tracemalloc slows pandas code down noticeably, so it is off unless asked for
+        self.scene.workflow_manager.track_memory = enabled
+
+    def set_design_mode(self, enabled):
+        # Not saved with the workflow, so saved workflows always run on full data
+        self.set_sample(self.sample_settings if enabled else None)
+        self.design_label.setVisible(enabled)
+        self.statusBar().showMessage(
+            "Design mode: runs read sampled inputs and do not write outputs" if enabled
+            else "Full execution: runs read complete inputs", 5000)
+
+    def edit_sample_settings(self):
+        dialog = SampleSettingsDialog(self.sample_settings, self)
+        if dialog.exec():
+            self.sample_settings = dialog.get_sample()
+            if self.design_action.isChecked():
+                self.set_sample(self.sample_settings)
+
+    def set_sample(self, sample):
+        # The manager drops results computed under other sample settings; clear their badges too
+        self.scene.workflow_manager.sample = sample
+        for node in self.scene.nodes_by_id.values():
+            node.set_status(None)
+            node.set_metrics(None)
+
     def recreate_workflow(self):
         # Clear existing items
         self.scene.clear()
@@ -1422,12 +1991,158 @@ class MainWindow(QMainWindow):
             start_node.connections.append(connection_line)
             end_node.connections.append(connection_line)
 
-    def run_workflow(self):
-        try:
-            tools = self.scene.workflow_manager.execute_workflow()
+    def run_workflow(self, nodes=None):
+        """Run the workflow, or only the given nodes and those downstream of them"""
+        if self.worker is not None:
+            return
+
+        # Reset node status before the run
+        manager = self.scene.workflow_manager
+        run_ids = manager.affected_nodes(nodes) if nodes is not None else self.scene.nodes_by_id
+        self.run_nodes = {node_id: self.scene.nodes_by_id[node_id]
+                          for node_id in run_ids if node_id in self.scene.nodes_by_id}
+        for node in self.run_nodes.values():
+            node.set_status(None)
+            node.set_metrics(None)
+
+        self.worker = WorkflowWorker(manager, self.node_timeout, nodes, self)
+        self.worker.node_started.connect(self.on_node_started)
+        self.worker.node_rows.connect(self.on_node_rows)
+        self.worker.node_finished.connect(self.on_node_finished)
+        self.worker.node_failed.connect(lambda node_id, message: self.set_node_status(node_id, "failed"))
+        self.worker.run_finished.connect(self.on_run_finished)
+        self.worker.run_failed.connect(self.on_run_failed)
+        self.worker.run_cancelled.connect(self.on_run_cancelled)
+        self.worker.finished.connect(self.on_worker_done)
+
+        self.run_action.setEnabled(False)
+        self.cancel_action.setEnabled(True)
+        # Changing the sample drops node data the run is reading
+        self.design_action.setEnabled(False)
+        self.sample_settings_action.setEnabled(False)
+        # Editing the graph would change the nodes the worker thread is iterating
+        self.scene.running = True
+        self.load_action.setEnabled(False)
+        self.statusBar().showMessage("Running workflow...")
+        self.worker.start()
+
+    def set_watching(self, watching):
+        files = self.file_watcher.files()
+        if files:
+            self.file_watcher.removePaths(files)
+        self.changed_files.clear()
+        if watching:
+            self.update_watched_files()
+            self.statusBar().showMessage("Watching input files for changes", 5000)
+
+    def update_watched_files(self):
+        """Watch the current input files; editors and atomic saves replace files, dropping them"""
+        paths = [path for path in self.scene.workflow_manager.source_files() if os.path.exists(path)]
+        watched = set(self.file_watcher.files())
+        missing = [path for path in paths if path not in watched]
+        if missing:
+            self.file_watcher.addPaths(missing)
+
+    def on_input_file_changed(self, path):
+        self.changed_files.add(path)
+        self.watch_timer.start()
+
+    def run_changed_inputs(self):
+        if self.worker is not None:
+            return  # Picked up again when the current run finishes
+        source_files = self.scene.workflow_manager.source_files()
+        nodes = [node_id for path in self.changed_files for node_id in source_files.get(path, ())]
+        self.changed_files.clear()
+        self.update_watched_files()
+        if nodes:
+            self.watch_run = True
+            self.run_workflow(nodes)
+
+    def export_trace(self):
+        if self.scene.workflow_manager.last_run is None:
+            QMessageBox.information(self, "Export Run Trace", "Run the workflow before exporting a trace.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Run Trace", "",
+                                                 "Trace Files (*.json);;All Files (*)")
+        if file_path:
+            try:
+                self.scene.workflow_manager.export_trace(file_path)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Error exporting trace: {str(e)}")
+
+    def cancel_workflow(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.statusBar().showMessage("Cancelling workflow...")
+
+    def set_node_status(self, node_id, status):
+        node = self.run_nodes.get(node_id)
+        if node is not None:
+            node.set_status(status)
+
+    def on_node_started(self, node_id):
+        self.set_node_status(node_id, "running")
+        node = self.run_nodes.get(node_id)
+        if node is not None:
+            self.statusBar().showMessage(f"Running {node.tool_type}...")
+
+    def on_node_rows(self, node_id, rows):
+        node = self.run_nodes.get(node_id)
+        if node is not None:
+            self.statusBar().showMessage(f"{node.tool_type}: {rows:,} rows")
+
+    def on_node_finished(self, node_id, metrics):
+        self.set_node_status(node_id, "finished")
+        node = self.run_nodes.get(node_id)
+        if node is not None:
+            node.set_metrics(metrics)
+
+    def show_run_summary(self):
+        node_metrics = self.scene.workflow_manager.node_metrics
+        if not node_metrics:
+            QMessageBox.information(self, "Run Summary", "Run the workflow to collect node metrics.")
+            return
+        node_labels = {}
+        for node_id, node in self.scene.workflow_manager.nodes.items():
+            node_labels[node_id] = f"{node['type']} ({node_id[:8]})"
+        dialog = RunSummaryDialog(node_metrics, node_labels, self)
+        dialog.exec()
+
+    def on_run_finished(self):
+        # Save incremental state as the command line runner does, so the next
+        # session resumes from these offsets instead of re-reading the inputs
+        if self.workflow_path:
+            try:
+                self.scene.workflow_manager.save_state(self.workflow_path)
+            except OSError as e:
+                QMessageBox.warning(self, "Warning", f"Could not save incremental state: {e}")
+        self.statusBar().showMessage("Workflow finished", 5000)
+        if not self.watch_run:
             QMessageBox.information(self, "Success", "Workflow executed successfully!")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error executing workflow: {str(e)}")
+
+    def on_run_failed(self, message):
+        self.statusBar().showMessage(f"Workflow failed: {message}" if self.watch_run else "Workflow failed", 5000)
+        if not self.watch_run:
+            QMessageBox.critical(self, "Error", f"Error executing workflow: {message}")
+
+    def on_run_cancelled(self):
+        for node in self.run_nodes.values():
+            if node.status == "running":
+                node.set_status("cancelled")
+        self.statusBar().showMessage("Workflow cancelled", 5000)
+
+    def on_worker_done(self):
+        self.worker.deleteLater()
+        self.worker = None
+        self.run_action.setEnabled(True)
+        self.cancel_action.setEnabled(False)
+        self.design_action.setEnabled(True)
+        self.sample_settings_action.setEnabled(True)
+        self.scene.running = False
+        self.load_action.setEnabled(True)
+        self.watch_run = False
+        if self.watch_action.isChecked() and self.changed_files:
+            self.watch_timer.start()
 
 def main():
     app = QApplication(sys.argv)
@@ -1,9 +1,354 @@
-from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QTableWidget, 
-                            QTableWidgetItem, QPushButton, QHBoxLayout)
-from PyQt6.QtCore import Qt
+import operator
+import re
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QTableView, QPushButton, QHBoxLayout, QWidget,
+                            QLineEdit, QComboBox, QLabel, QMenu, QInputDialog)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, QTimer, pyqtSignal
+import numpy as np
 import pandas as pd
 
+HISTOGRAM_BINS = 10
+DISTINCT_SAMPLE_SIZE = 4096  # Hashes kept by the distinct-count estimator
+
+_FILTER_OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '=': operator.eq,
+    '>': operator.gt,
+    '<': operator.lt
+}
+_FILTER_PATTERN = re.compile(r'^\s*(>=|<=|!=|=|>|<)\s*(.*?)\s*$')
+
+def estimate_distinct(series: pd.Series, sample_size: int = DISTINCT_SAMPLE_SIZE) -> int:
+    """Estimate the number of distinct non-null values from 64-bit row hashes"""
+    values = series.dropna()
+    if values.empty:
+        return 0
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    # Keep only hashes in the lowest 1/step of the hash space and scale back up,
+    # widening the slice until it holds enough distinct values to be reliable
+    step = len(hashes) // sample_size
+    while step > 1:
+        threshold = np.uint64((2 ** 64 - 1) // step)
+        sampled = len(np.unique(hashes[hashes < threshold]))
+        if sampled >= sample_size // 4:
+            return sampled * step
+        step //= 4
+    return len(np.unique(hashes))
+
+def compute_column_stats(series: pd.Series) -> dict:
+    """Null count, min/max, distinct estimate and histogram for a single column"""
+    non_null = series.dropna()
+    stats = {
+        'nulls': int(len(series) - len(non_null)),
+        'distinct': estimate_distinct(series),
+        'min': None,
+        'max': None,
+        'histogram': []
+    }
+    if non_null.empty:
+        return stats
+
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = non_null.to_numpy(dtype=float)
+        stats['min'], stats['max'] = values.min(), values.max()
+        counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+        stats['histogram'] = [(f"{edges[i]:g}–{edges[i + 1]:g}", int(counts[i]))
+                              for i in range(len(counts))]
+    else:
+        try:
+            stats['min'], stats['max'] = non_null.min(), non_null.max()
+        except TypeError:
+            pass  # Mixed types have no ordering
+        top_values = non_null.value_counts().head(HISTOGRAM_BINS)
+        stats['histogram'] = [(str(value), int(count)) for value, count in top_values.items()]
+    return stats
+
+class ColumnStatsWorker(QThread):
+    column_ready = pyqtSignal(int, dict)
+
+    def __init__(self, data: pd.DataFrame, parent=None):
+        super().__init__(parent)
+        self.data = data
+
+    def run(self):
+        for j in range(len(self.data.columns)):
+            if self.isInterruptionRequested():
+                return
+            self.column_ready.emit(j, compute_column_stats(self.data.iloc[:, j]))
+
+class DataFrameModel(QAbstractTableModel):
+    """Table model over a DataFrame.
+
+    Sorting and filtering never touch the frame itself: the model keeps an
+    array of visible row positions built from cached argsort permutations and
+    boolean masks over the underlying columns.
+    """
+
+    def __init__(self, data: pd.DataFrame, parent=None):
+        super().__init__(parent)
+        self._data = data
+        self._columns = [data.iloc[:, j].to_numpy() for j in range(len(data.columns))]
+        self._sort_cache = {}  # (column, ascending) -> row permutation
+        self._text_cache = {}  # column -> lower-cased string values for search
+        self._permutation = np.arange(len(data))
+        self._search_mask = None
+        self._column_filters = {}  # column -> (filter text, mask)
+        self._mask = None
+        self._rows = self._permutation
+        self._stats = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return str(self._columns[index.column()][self._rows[index.row()]])
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Vertical:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return str(self._data.index[self._rows[section]])
+            return None
+
+        name = str(self._data.columns[section])
+        stats = self._stats.get(section)
+        if role == Qt.ItemDataRole.DisplayRole:
+            if stats is None:
+                return name
+            return f"{name}\n{stats['nulls']} null · ~{stats['distinct']} distinct"
+        if role == Qt.ItemDataRole.ToolTipRole and stats is not None:
+            return self.format_stats(name, stats)
+        return None
+
+    @staticmethod
+    def format_stats(name: str, stats: dict) -> str:
+        lines = [name,
+                 f"Nulls: {stats['nulls']}",
+                 f"Distinct (est.): {stats['distinct']}",
+                 f"Min: {stats['min']}",
+                 f"Max: {stats['max']}"]
+        if stats['histogram']:
+            peak = max(count for _, count in stats['histogram']) or 1
+            lines.append("")
+            for label, count in stats['histogram']:
+                bar = "█" * max(1 if count else 0, round(20 * count / peak))
+                lines.append(f"{label}: {bar} {count}")
+        return "\n".join(lines)
+
+    def set_column_stats(self, column: int, stats: dict):
+        self._stats[column] = stats
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, column, column)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column < 0:
+            permutation = np.arange(len(self._data))
+        else:
+            permutation = self.sort_permutation(column, order == Qt.SortOrder.AscendingOrder)
+        self.beginResetModel()
+        self._permutation = permutation
+        self._update_rows()
+        self.endResetModel()
+
+    def sort_permutation(self, column: int, ascending: bool) -> np.ndarray:
+        key = (column, ascending)
+        if key not in self._sort_cache:
+            series = pd.Series(self._columns[column])
+            try:
+                ordered = series.sort_values(ascending=ascending, kind='stable', na_position='last')
+            except TypeError:
+                ordered = series.astype(str).sort_values(ascending=ascending, kind='stable')
+            self._sort_cache[key] = ordered.index.to_numpy()
+        return self._sort_cache[key]
+
+    def set_filter(self, text: str, column: int = None):
+        """Search: show only rows whose value contains text, in one column or any column"""
+        if text:
+            needle = text.lower()
+            targets = [column] if column is not None else range(len(self._columns))
+            mask = np.zeros(len(self._data), dtype=bool)
+            for j in targets:
+                mask |= self._text_column(j).str.contains(needle, regex=False).to_numpy()
+        else:
+            mask = None
+        self.beginResetModel()
+        self._search_mask = mask
+        self._update_rows()
+        self.endResetModel()
+
+    def set_column_filter(self, column: int, text: str):
+        """Filter one column, on top of the search and the other column filters.
+
+        text is a comparison such as '> 100', '<= 2024-01-31' or '= north',
+        or else text to look for in the column. An empty text removes the filter.
+        """
+        if text.strip():
+            filters = {**self._column_filters, column: (text, self.column_filter_mask(column, text))}
+        else:
+            filters = {j: value for j, value in self._column_filters.items() if j != column}
+        self.beginResetModel()
+        self._column_filters = filters
+        self._update_rows()
+        self.endResetModel()
+
+    def column_filters(self) -> dict:
+        """column -> filter text of the active column filters"""
+        return {column: text for column, (text, _) in self._column_filters.items()}
+
+    def column_filter_mask(self, column: int, text: str) -> np.ndarray:
+        match = _FILTER_PATTERN.match(text)
+        if match is None:
+            return self._text_column(column).str.contains(text.strip().lower(), regex=False).to_numpy()
+
+        compare = _FILTER_OPERATORS[match.group(1)]
+        series = pd.Series(self._columns[column])
+        value = match.group(2)
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            value = pd.to_numeric(value, errors='coerce')
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            value = pd.to_datetime(value, errors='coerce')
+        else:
+            # Compare as lower-cased text, like the search, so mixed-type columns never raise
+            series, value = self._text_column(column), value.lower()
+        if pd.isna(value):
+            raise ValueError(f"Cannot compare {self._data.columns[column]} with {match.group(2)!r}")
+        return compare(series, value).fillna(False).to_numpy(dtype=bool)
+
+    def _text_column(self, column: int) -> pd.Series:
+        if column not in self._text_cache:
+            series = pd.Series(self._columns[column])
+            self._text_cache[column] = series.where(series.notna(), '').astype(str).str.lower()
+        return self._text_cache[column]
+
+    def _update_rows(self):
+        masks = [mask for _, mask in self._column_filters.values()]
+        if self._search_mask is not None:
+            masks.append(self._search_mask)
+        self._mask = np.logical_and.reduce(masks) if masks else None
+        if self._mask is None:
+            self._rows = self._permutation
+        else:
+            self._rows = self._permutation[self._mask[self._permutation]]
+
+class DataBrowserWidget(QWidget):
+    """Sortable, searchable table view with per-column filters and statistics in the header.
+
+    Right-click a column header to filter that column.
+    """
+
+    def __init__(self, data: pd.DataFrame, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Search controls
+        search_layout = QHBoxLayout()
+        self.column_combo = QComboBox()
+        self.column_combo.addItem("All columns")
+        self.column_combo.addItems([str(column) for column in data.columns])
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search...")
+        self.row_count_label = QLabel()
+        self.total_rows = len(data)
+        search_layout.addWidget(self.column_combo)
+        search_layout.addWidget(self.search_input, 1)
+        search_layout.addWidget(self.row_count_label)
+        layout.addLayout(search_layout)
+
+        # Active column filters
+        filter_layout = QHBoxLayout()
+        self.filters_label = QLabel()
+        self.clear_filters_button = QPushButton("Clear Filters")
+        self.clear_filters_button.clicked.connect(self.clear_column_filters)
+        filter_layout.addWidget(self.filters_label, 1)
+        filter_layout.addWidget(self.clear_filters_button)
+        layout.addLayout(filter_layout)
+
+        # Table backed by the DataFrame model
+        self.model = DataFrameModel(data, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.horizontalHeader().setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.table.horizontalHeader().customContextMenuRequested.connect(self.show_header_menu)
+        layout.addWidget(self.table)
+
+        # Debounce searching so large frames are not re-filtered on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.column_combo.currentIndexChanged.connect(self.apply_filter)
+
+        # Compute column statistics without blocking the dialog
+        self.stats_worker = ColumnStatsWorker(data, self)
+        self.stats_worker.column_ready.connect(self.model.set_column_stats)
+        self.stats_worker.start()
+
+        self.update_filters()
+
+    def show_header_menu(self, position):
+        column = self.table.horizontalHeader().logicalIndexAt(position)
+        if column < 0:
+            return
+        menu = QMenu(self)
+        filter_action = menu.addAction("Filter...")
+        filter_action.triggered.connect(lambda: self.edit_column_filter(column))
+        if column in self.model.column_filters():
+            clear_action = menu.addAction("Clear Filter")
+            clear_action.triggered.connect(lambda: self.set_column_filter(column, ""))
+        menu.exec(self.table.horizontalHeader().mapToGlobal(position))
+
+    def edit_column_filter(self, column: int):
+        name = self.model.headerData(column, Qt.Orientation.Horizontal).split("\n")[0]
+        text, ok = QInputDialog.getText(self, "Filter Column",
+                                        f"Filter {name} (e.g. > 100, = north, or text to find):",
+                                        text=self.model.column_filters().get(column, ""))
+        if ok:
+            self.set_column_filter(column, text)
+
+    def set_column_filter(self, column: int, text: str):
+        try:
+            self.model.set_column_filter(column, text)
+        except ValueError as e:
+            self.filters_label.setText(str(e))
+            return
+        self.update_filters()
+
+    def clear_column_filters(self):
+        for column in list(self.model.column_filters()):
+            self.model.set_column_filter(column, "")
+        self.update_filters()
+
+    def update_filters(self):
+        filters = self.model.column_filters()
+        self.filters_label.setText("; ".join(f"{self.column_combo.itemText(column + 1)} {text.strip()}"
+                                             for column, text in filters.items()))
+        self.clear_filters_button.setVisible(bool(filters))
+        self.update_row_count()
+
+    def apply_filter(self):
+        column = self.column_combo.currentIndex() - 1
+        self.model.set_filter(self.search_input.text(), column if column >= 0 else None)
+        self.update_row_count()
+
+    def update_row_count(self):
+        self.row_count_label.setText(f"{self.model.rowCount():,} of {self.total_rows:,} rows")
+
+    def stop_stats(self):
+        self.stats_worker.requestInterruption()
+        self.stats_worker.wait()
+
 class PreviewWindow(QDialog):
+    """Standalone data preview, browsing the full frame like the Browse tool"""
+
     def __init__(self, data: pd.DataFrame, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Data Preview")
@@ -12,9 +357,10 @@ class PreviewWindow(QDialog):
         # Create layout
         layout = QVBoxLayout()
         
-        # Create table
-        self.table = QTableWidget()
-        layout.addWidget(self.table)
+        # Sortable, filterable table over the frame
+        self.browser = DataBrowserWidget(data)
+        self.table = self.browser.table
+        layout.addWidget(self.browser)
         
         # Add close button
         button_layout = QHBoxLayout()
@@ -24,27 +370,11 @@ class PreviewWindow(QDialog):
         layout.addLayout(button_layout)
         
         self.setLayout(layout)
-        
-        # Populate table with data
-        self.populate_table(data)
-    
-    def populate_table(self, data: pd.DataFrame):
-        # Limit to 50 rows
-        preview_data = data.head(50)
-        
-        # Set table dimensions
-        self.table.setRowCount(len(preview_data))
-        self.table.setColumnCount(len(preview_data.columns))
-        
-        # Set headers
-        self.table.setHorizontalHeaderLabels(preview_data.columns)
-        
-        # Populate cells
-        for i, row in enumerate(preview_data.itertuples()):
-            for j, value in enumerate(row[1:]):  # Skip index
-                item = QTableWidgetItem(str(value))
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Make read-only
-                self.table.setItem(i, j, item)
-        
-        # Resize columns to content
-        self.table.resizeColumnsToContents() 
\ No newline at end of file
+
+    def done(self, result):
+        self.browser.stop_stats()
+        super().done(result)
+
+    def closeEvent(self, event):
+        self.browser.stop_stats()
+        super().closeEvent(event)
@@ -0,0 +1,186 @@
+"""Run a saved workflow without the GUI.
+
+    python -m run_workflow workflow.json
+    python -m run_workflow workflow.json --input data.csv --output result.csv
+    python -m run_workflow workflow.json --set Filter.condition="age > 30" --set <node_id>.file_path=in.csv
+    python -m run_workflow workflow.json --batch "customers/*.csv" --batch-output "out/{stem}.csv" --jobs 8
+    python -m run_workflow workflow.json --watch
+
+Overrides select nodes by id or by tool type; values are parsed as JSON when
+possible (numbers, lists, objects) and used as plain strings otherwise.
+Batch parameter files hold a JSON list of {"NODE.PROPERTY": value} objects.
+In watch mode, a change to an input file re-runs only the nodes downstream of it.
+"""
+import argparse
+import json
+import sys
+from typing import Any, List, Tuple
+from backends import BACKENDS
+from workflow_manager import WorkflowManager, batch_parameters_from_glob
+
+def parse_override(text: str) -> Tuple[str, str, Any]:
+    """Split NODE.PROPERTY=VALUE into its parts"""
+    target, sep, raw_value = text.partition('=')
+    selector, dot, key = target.rpartition('.')
+    if not sep or not dot or not selector or not key:
+        raise ValueError(f"Override must look like NODE.PROPERTY=VALUE: {text}")
+    try:
+        value = json.loads(raw_value)
+    except ValueError:
+        value = raw_value
+    return selector, key, value
+
+def apply_overrides(manager: WorkflowManager, args) -> None:
+    overrides = {}
+    for tool_type, path in (('Input', args.input), ('Output', args.output)):
+        if path:
+            count = len(manager.nodes_of_type(tool_type))
+            if count != 1:
+                raise ValueError(f"Workflow has {count} {tool_type} nodes; use --set with a node id")
+            overrides[f"{tool_type}.file_path"] = path
+    for text in args.set:
+        selector, key, value = parse_override(text)
+        overrides[f"{selector}.{key}"] = value
+    manager.apply_overrides(overrides)
+
+def load_batch_parameters(args) -> List[dict]:
+    if args.batch_params:
+        with open(args.batch_params) as f:
+            return json.load(f)
+    return batch_parameters_from_glob(args.batch, args.batch_output)
+
+def run_batch(manager: WorkflowManager, args) -> int:
+    parameter_sets = load_batch_parameters(args)
+    if not parameter_sets:
+        print("error: no batch parameter sets", file=sys.stderr)
+        return 2
+
+    reports = manager.run_batch(parameter_sets, args.jobs, args.timeout)
+
+    failed = [report for report in reports if report['status'] != 'succeeded']
+    if not args.quiet or failed:
+        for report in reports:
+            if args.quiet and report['status'] == 'succeeded':
+                continue
+            error = f": {report['error']}" if report['error'] else ""
+            duration = f" in {report['wall_time']:.3f}s" if report['wall_time'] is not None else ""
+            print(f"run {report['run']} {report['status']}{duration} "
+                  f"{json.dumps(report['parameters'])}{error}", file=sys.stderr)
+        print(f"{len(reports) - len(failed)} of {len(reports)} runs succeeded", file=sys.stderr)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(reports, f, indent=2, default=str)
+    if args.trace:
+        from trace_export import write_batch_trace
+        write_batch_trace(args.trace, manager.nodes, reports)
+    return 1 if failed else 0
+
+def run_once(manager: WorkflowManager, args, nodes: List[str] = None) -> int:
+    def report(event, node_id, value):
+        if args.quiet and event != 'failed':
+            return
+        tool_type = manager.nodes[node_id]['type']
+        if event == 'started':
+            print(f"{tool_type} ({node_id}) started", file=sys.stderr)
+        elif event == 'finished':
+            rows = value.get('output_rows')
+            rows_text = f", {rows:,} rows" if rows is not None else ""
+            print(f"{tool_type} ({node_id}) finished in {value['wall_time']:.3f}s{rows_text}",
+                  file=sys.stderr)
+        elif event == 'failed':
+            print(f"{tool_type} ({node_id}) failed: {value}", file=sys.stderr)
+
+    try:
+        manager.execute_workflow(report, node_timeout=args.timeout, nodes=nodes)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.trace and manager.last_run is not None:
+            manager.export_trace(args.trace)
+    manager.save_state(args.workflow)
+    return 0
+
+def watch(manager: WorkflowManager, args) -> int:
+    """Run the workflow, then re-run the part downstream of each changed input until interrupted"""
+    from file_watch import FileWatcher
+
+    watcher = FileWatcher(manager.source_files(), args.poll_interval, args.debounce)
+    if run_once(manager, args) == 130:
+        return 130
+    try:
+        while True:
+            changed = watcher.wait()
+            source_files = manager.source_files()
+            nodes = [node_id for path in changed for node_id in source_files.get(path, ())]
+            if not args.quiet:
+                print(f"changed: {', '.join(sorted(changed))}", file=sys.stderr)
+            if run_once(manager, args, nodes) == 130:
+                return 130
+    except KeyboardInterrupt:
+        return 130
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m run_workflow',
+                                     description="Run a saved workflow without the GUI")
+    parser.add_argument('workflow', help="Workflow JSON file")
+    parser.add_argument('--input', help="File path for the workflow's single Input node")
+    parser.add_argument('--output', help="File path for the workflow's single Output node")
+    parser.add_argument('--set', action='append', default=[], metavar='NODE.PROPERTY=VALUE',
+                        help="Override a node property; NODE is a node id or tool type")
+    parser.add_argument('--timeout', type=float, help="Per-node timeout in seconds")
+    parser.add_argument('--trace', help="Write a Chrome trace of the run to this file")
+    parser.add_argument('--track-memory', action='store_true',
+                        help="Measure peak memory per node (slower)")
+    parser.add_argument('--quiet', action='store_true', help="Only report errors")
+    parser.add_argument('--backend', choices=BACKENDS,
+                        help="Execution backend, overriding the one saved in the workflow")
+    parser.add_argument('--full', action='store_true',
+                        help="Ignore saved incremental state and reprocess inputs in full")
+    watching = parser.add_argument_group("watch mode")
+    watching.add_argument('--watch', action='store_true',
+                          help="Keep running, re-running nodes downstream of changed input files")
+    watching.add_argument('--poll-interval', type=float, default=1.0,
+                          help="Seconds between input file checks (default 1)")
+    watching.add_argument('--debounce', type=float, default=0.5,
+                          help="Seconds an input must stay unchanged before re-running (default 0.5)")
+    batch = parser.add_argument_group("batch runs")
+    batch.add_argument('--batch', metavar='GLOB',
+                       help="Run once per matching file, pointing the Input node at it")
+    batch.add_argument('--batch-output', metavar='TEMPLATE',
+                       help="Output path per run, using {stem} or {name} of the input file")
+    batch.add_argument('--batch-params', metavar='FILE',
+                       help="JSON list of override objects, one run per object")
+    batch.add_argument('--jobs', type=int, help="Maximum concurrent runs (default: CPU count)")
+    batch.add_argument('--report', help="Write the per-run status and timing report as JSON")
+    args = parser.parse_args(argv)
+
+    manager = WorkflowManager()
+    manager.track_memory = args.track_memory
+    try:
+        manager.load_workflow(args.workflow)
+        apply_overrides(manager, args)
+        if args.backend:
+            manager.backend = args.backend
+        if args.full:
+            manager.reset_state()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.batch or args.batch_params:
+        try:
+            return run_batch(manager, args)
+        except (OSError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+
+    if args.watch:
+        return watch(manager, args)
+    return run_once(manager, args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import json
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+import run_workflow
+import workflow_manager
+from trace_export import write_batch_trace
+from workflow_manager import WorkflowManager
+
+
+def batch_workflow(tmp_path):
+    """Input -> Filter -> Output, saved to tmp_path/workflow.json"""
+    manager = WorkflowManager()
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0}, {'file_path': 'in.csv'})
+    manager.add_node('filter', 'Filter', {'x': 0, 'y': 0}, {'condition': 'a > 1'})
+    manager.add_node('output', 'Output', {'x': 0, 'y': 0}, {'file_path': 'out.csv'})
+    manager.add_connection('input', 'filter')
+    manager.add_connection('filter', 'output')
+    manager.save_workflow(str(tmp_path / 'workflow.json'))
+    return manager
+
+
+def parameter_sets(tmp_path, names):
+    """One run per name; names starting with 'missing' point at an input that does not exist"""
+    sets = []
+    for name in names:
+        if not name.startswith('missing'):
+            pd.DataFrame({'a': [1, 2, 3]}).to_csv(tmp_path / f'{name}.csv', index=False)
+        sets.append({'Input.file_path': str(tmp_path / f'{name}.csv'),
+                     'Output.file_path': str(tmp_path / f'{name}_out.csv')})
+    return sets
+
+
+def test_batch_reports_each_run_in_order(tmp_path):
+    manager = batch_workflow(tmp_path)
+    reports = manager.run_batch(parameter_sets(tmp_path, ['first', 'missing', 'third']), max_workers=2)
+    assert [report['run'] for report in reports] == [0, 1, 2]
+    assert [report['status'] for report in reports] == ['succeeded', 'failed', 'succeeded']
+    assert 'missing.csv' in reports[1]['error']
+    assert pd.read_csv(tmp_path / 'third_out.csv')['a'].tolist() == [2, 3]
+
+
+def write_params(tmp_path, names):
+    path = tmp_path / 'params.json'
+    path.write_text(json.dumps(parameter_sets(tmp_path, names)))
+    return str(path)
+
+
+def test_cli_batch_fails_when_any_run_fails(tmp_path):
+    batch_workflow(tmp_path)
+    workflow = str(tmp_path / 'workflow.json')
+    assert run_workflow.main([workflow, '--batch-params', write_params(tmp_path, ['first', 'second']),
+                              '--quiet']) == 0
+    assert run_workflow.main([workflow, '--batch-params', write_params(tmp_path, ['first', 'missing']),
+                              '--quiet']) == 1
+
+
+def crash_on_missing(workflow_data, parameters, node_timeout):
+    """Kill the worker process for missing inputs, as the OOM killer would"""
+    if 'missing' in parameters['Input.file_path']:
+        os._exit(1)
+    return run_batch_item(workflow_data, parameters, node_timeout)
+
+
+run_batch_item = workflow_manager._run_batch_item
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="Workers must inherit the patched batch function")
+def test_lost_worker_is_reported_as_failed_run(tmp_path, monkeypatch):
+    manager = batch_workflow(tmp_path)
+    monkeypatch.setattr(workflow_manager, '_run_batch_item', crash_on_missing)
+    reports = manager.run_batch(parameter_sets(tmp_path, ['first', 'missing', 'third']), max_workers=1)
+    assert len(reports) == 3
+    assert reports[1]['status'] == 'failed'
+    assert reports[1]['error'].startswith("Worker process failed")
+    assert reports[1]['wall_time'] is None and reports[1]['node_metrics'] == {}
+    write_batch_trace(str(tmp_path / 'trace.json'), manager.nodes, reports)  # Skips the lost run
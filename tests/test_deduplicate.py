@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import DeduplicateTool
+
+ROWS = 5000
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        'key': rng.integers(0, 1500, ROWS),
+        'name': rng.choice(['a', 'b', None], ROWS),
+        'value': rng.random(ROWS)
+    })
+
+
+def run(data, **options):
+    tool = DeduplicateTool(**options)
+    tool.input_data = data
+    return tool, tool.execute()
+
+
+@pytest.mark.parametrize('keep', ['first', 'last', 'none'])
+@pytest.mark.parametrize('columns', [['key'], ['key', 'name']])
+def test_spilled_partitions_match_drop_duplicates(data, keep, columns):
+    # 10 KB is far below the ~32 bytes per row the in-memory hash table needs
+    tool, result = run(data, columns=columns, keep=keep, memory_limit_mb=0.01, chunk_rows=700)
+    assert any(span[0] == 'partition' for span in tool.spans)
+    expected = data.drop_duplicates(columns, keep=DeduplicateTool.KEEP[keep])
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('keep', ['first', 'last', 'none'])
+@pytest.mark.parametrize('false_positive_rate', [0.01, 0.5])
+def test_bloom_filter_matches_drop_duplicates(data, keep, false_positive_rate):
+    tool, result = run(data, columns=['key', 'name'], keep=keep, bloom_filter=True,
+                       false_positive_rate=false_positive_rate, chunk_rows=700)
+    assert any(span[0] == 'bloom_filter' for span in tool.spans)
+    expected = data.drop_duplicates(['key', 'name'], keep=DeduplicateTool.KEEP[keep])
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_all_columns_by_default(data):
+    doubled = pd.concat([data, data.iloc[::3]], ignore_index=True)
+    _, result = run(doubled, memory_limit_mb=0.01, chunk_rows=1000)
+    pd.testing.assert_frame_equal(result, doubled.drop_duplicates())
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from file_watch import FileWatcher
+
+
+def test_poll_reports_changed_created_and_deleted_files(tmp_path):
+    existing, created = tmp_path / 'existing.csv', tmp_path / 'created.csv'
+    existing.write_text('a\n1\n')
+    watcher = FileWatcher([str(existing), str(created)])
+    assert watcher.poll() == set()
+
+    with open(existing, 'a') as f:
+        f.write('2\n')
+    created.write_text('a\n')
+    assert watcher.poll() == {str(existing), str(created)}
+    assert watcher.poll() == set()
+
+    existing.unlink()
+    assert watcher.poll() == {str(existing)}
+
+
+def test_set_paths_keeps_known_state(tmp_path):
+    first, second = tmp_path / 'first.csv', tmp_path / 'second.csv'
+    first.write_text('a\n')
+    second.write_text('a\n')
+    watcher = FileWatcher([str(first)])
+    first.write_text('a\n1\n')
+    watcher.set_paths([str(first), str(second)])
+    # first changed before the paths were replaced; second is new and unchanged
+    assert watcher.poll() == {str(first)}
+
+
+def test_burst_of_writes_is_reported_once_it_settles(tmp_path):
+    path = tmp_path / 'log.csv'
+    path.write_text('a\n')
+    watcher = FileWatcher([str(path)], interval=0.02, debounce=0.3)
+    writes = []
+
+    def write_burst():
+        for value in range(3):
+            time.sleep(0.1)
+            with open(path, 'a') as f:
+                f.write(f'{value}\n')
+            writes.append(time.monotonic())
+
+    writer = threading.Thread(target=write_burst)
+    writer.start()
+    changed = watcher.wait()
+    returned = time.monotonic()
+    writer.join()
+    assert changed == {str(path)}
+    assert len(writes) == 3  # Not reported between writes of the burst
+    assert returned - writes[-1] >= 0.25  # The debounce period, less polling slack
+    assert watcher.poll() == set()
+
+
+def test_wait_returns_nothing_when_stopped(tmp_path):
+    path = tmp_path / 'log.csv'
+    path.write_text('a\n')
+    watcher = FileWatcher([str(path)], interval=0.02, debounce=10)
+    stop_event = threading.Event()
+    threading.Timer(0.1, stop_event.set).start()
+    path.write_text('a\n1\n')  # Pending, but stopped before the debounce period ends
+    assert watcher.wait(stop_event) == set()
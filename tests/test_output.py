@@ -0,0 +1,41 @@
+import sqlite3
+
+import pandas as pd
+
+from tools import OutputTool
+
+
+def write_sqlite(path, data, **options):
+    tool = OutputTool(str(path), file_format='sqlite', table='items', **options)
+    tool.input_data = data
+    tool.execute()
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT * FROM items ORDER BY id").fetchall()
+
+
+def test_sqlite_output_writes_missing_values_of_nullable_columns(tmp_path):
+    data = pd.DataFrame({
+        'id': [1, 2],
+        'count': pd.array([3, None], dtype='Int64'),
+        'flag': pd.array([None, True], dtype='boolean'),
+        'name': pd.array(['a', None], dtype='string'),
+        'price': pd.array([None, 2.5], dtype='Float64')
+    })
+    assert write_sqlite(tmp_path / 'out.db', data) == [(1, 3, None, 'a', None), (2, None, 1, None, 2.5)]
+
+
+def test_sqlite_output_keeps_the_journal_mode(tmp_path):
+    path = tmp_path / 'out.db'
+    write_sqlite(path, pd.DataFrame({'id': [1]}))
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+
+
+def test_sqlite_upsert_with_nullable_keys(tmp_path):
+    path = tmp_path / 'out.db'
+    write_sqlite(path, pd.DataFrame({'id': pd.array([1, 2], dtype='Int64'), 'value': ['a', 'b']}),
+                 upsert_keys=['id'])
+    rows = write_sqlite(path, pd.DataFrame({'id': pd.array([2, 3], dtype='Int64'),
+                                            'value': pd.array(['c', None], dtype='string')}),
+                        upsert_keys=['id'])
+    assert rows == [(1, 'a'), (2, 'c'), (3, None)]
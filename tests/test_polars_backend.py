@@ -0,0 +1,143 @@
+"""The Polars backend must produce the same output as the pandas backend, tool by tool"""
+import pandas as pd
+import pytest
+
+pytest.importorskip('polars')
+pytest.importorskip('pyarrow')
+
+from backends import PolarsBackend
+from tools import AggregateTool, FilterTool, JoinTool, OutputTool, SortTool
+from workflow_manager import WorkflowManager
+
+DATA = pd.DataFrame({
+    'id': [3, 1, 4, 1, 5, 9, 2, 6],
+    'name': ['c', 'a', 'd', 'a', None, 'f', 'b', 'e'],
+    'amount': [2.5, 1.0, 4.0, 1.0, 5.5, 9.0, None, 6.0]
+})
+LOOKUP = pd.DataFrame({'id': [1, 2, 3, 4], 'region': ['north', 'south', 'east', 'west']})
+
+TOOLS = {
+    'select': ('Select', {'columns': ['id', 'amount']}),
+    'select_drop': ('Select', {'columns': ['name'], 'drop_columns': True}),
+    'filter': ('Filter', {'condition': 'amount > 2 and id != 9'}),
+    'filter_in': ('Filter', {'condition': "name in ['a', 'b']"}),
+    'formula': ('Formula', {'formula': 'amount * 2 + id', 'new_column': 'score'}),
+    'join': ('Join', {'right_data': LOOKUP, 'how': 'inner', 'left_on': 'id', 'right_on': 'id'}),
+    'join_left': ('Join', {'right_data': LOOKUP, 'how': 'left', 'left_on': 'id', 'right_on': 'id'}),
+    'merge': ('Merge', {'additional_data': [LOOKUP]}),
+    'aggregate': ('Aggregate', {'aggregations': {'amount': ['sum', 'max', 'min', 'mean', 'count']},
+                                'group_by': 'name'}),
+    'sort': ('Sort', {'columns': ['amount', 'id'], 'ascending': False}),
+    'sort_limit': ('Sort', {'columns': ['id'], 'limit': 3}),
+    'sort_negative_limit': ('Sort', {'columns': ['id'], 'limit': -2}),
+    # Expressions only pandas can evaluate fall back to the pandas tool
+    'filter_pandas_only': ('Filter', {'condition': 'abs(amount - 5) < 2'}),
+    'formula_pandas_only': ('Formula', {'formula': 'abs(amount - 5)', 'new_column': 'distance'}),
+    'deduplicate': ('Deduplicate', {'columns': ['id']}),  # No translation: runs with pandas
+}
+
+
+def chain(tmp_path, backend, *steps):
+    """Run Input -> steps -> Output on the given backend; return the manager and the output path"""
+    input_path = tmp_path / 'input.csv'
+    if not input_path.exists():
+        DATA.to_csv(input_path, index=False)
+    manager = WorkflowManager()
+    manager.backend = backend
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0}, {'file_path': str(input_path)})
+    previous = 'input'
+    for index, (tool_type, properties) in enumerate(steps):
+        node_id = f'step{index}'
+        manager.add_node(node_id, tool_type, {'x': 0, 'y': 0}, dict(properties))
+        manager.add_connection(previous, node_id)
+        previous = node_id
+    output_path = tmp_path / f'output_{backend}.csv'
+    manager.add_node('output', 'Output', {'x': 0, 'y': 0}, {'file_path': str(output_path)})
+    manager.add_connection(previous, 'output')
+    manager.execute_workflow()
+    return manager, output_path
+
+
+def assert_same(left, right):
+    pd.testing.assert_frame_equal(left.reset_index(drop=True), right.reset_index(drop=True),
+                                  check_dtype=False)
+
+
+@pytest.mark.parametrize('tool', TOOLS)
+def test_tool_matches_pandas(tmp_path, tool):
+    pandas_run, pandas_path = chain(tmp_path, 'pandas', TOOLS[tool])
+    polars_run, polars_path = chain(tmp_path, 'polars', TOOLS[tool])
+    assert_same(polars_run.get_node_data('output'), pandas_run.get_node_data('output'))
+    assert_same(pd.read_csv(polars_path), pd.read_csv(pandas_path))
+
+
+def test_fused_nodes_have_data_on_request(tmp_path):
+    steps = TOOLS['filter'], TOOLS['formula'], TOOLS['sort']
+    pandas_run, _ = chain(tmp_path, 'pandas', *steps)
+    polars_run, _ = chain(tmp_path, 'polars', *steps)
+    for node_id in ['input', 'step0', 'step1', 'step2']:
+        assert polars_run.has_node_data(node_id)
+        assert_same(polars_run.get_node_data(node_id), pandas_run.get_node_data(node_id))
+
+
+def test_shared_plan_is_collected_once_for_pandas_consumers(tmp_path, monkeypatch):
+    DATA.to_csv(tmp_path / 'input.csv', index=False)
+    manager = WorkflowManager()
+    manager.backend = 'polars'
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0}, {'file_path': str(tmp_path / 'input.csv')})
+    manager.add_node('filter', 'Filter', {'x': 0, 'y': 0}, {'condition': 'amount > 2'})
+    manager.add_connection('input', 'filter')
+    for node_id in ['first', 'second']:
+        manager.add_node(node_id, 'Deduplicate', {'x': 0, 'y': 0}, {'columns': ['id']})
+        manager.add_connection('filter', node_id)
+
+    collected = []
+    collect = PolarsBackend.collect
+    monkeypatch.setattr(PolarsBackend, 'collect',
+                        lambda self, plans: collected.append(len(plans)) or collect(self, plans))
+    manager.execute_workflow()
+    # The filter plan is collected for the first consumer and reused by the second
+    assert [count for count in collected if count] == [1]
+    assert_same(manager.get_node_data('first'), manager.get_node_data('second'))
+
+
+def test_sampled_input_falls_back_to_pandas(tmp_path):
+    from tools import InputTool
+
+    DATA.to_csv(tmp_path / 'input.csv', index=False)
+    tool = InputTool(str(tmp_path / 'input.csv'))
+    tool.sample = {'method': 'head', 'rows': 3}
+    assert PolarsBackend().translate(tool, []) is None
+    assert_same(PolarsBackend().execute_tool(tool), DATA.head(3))
+
+
+def sampled_output(tmp_path):
+    tool = OutputTool(str(tmp_path / 'output.csv'))
+    tool.sample = {'method': 'head', 'rows': 3}
+    return tool
+
+
+@pytest.mark.parametrize('make_tool', [
+    lambda tmp_path: FilterTool('abs(amount) > 2'),
+    lambda tmp_path: FilterTool('amount >'),
+    lambda tmp_path: JoinTool(LOOKUP, left_on='id'),
+    lambda tmp_path: JoinTool(LOOKUP, how='cross'),
+    lambda tmp_path: AggregateTool({}, group_by='name'),
+    lambda tmp_path: SortTool(['id', 'amount'], ascending=[True]),
+    sampled_output,
+])
+def test_unhandled_options_fall_back_to_pandas(tmp_path, make_tool):
+    plan = PolarsBackend().pl.from_pandas(DATA).lazy()
+    assert PolarsBackend().translate(make_tool(tmp_path), [plan]) is None
+
+
+def test_pandas_fallback_nodes_report_rows(tmp_path):
+    DATA.to_csv(tmp_path / 'input.csv', index=False)
+    manager = WorkflowManager()
+    manager.backend = 'polars'
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0}, {'file_path': str(tmp_path / 'input.csv')})
+    manager.add_node('dedup', 'Deduplicate', {'x': 0, 'y': 0}, {'columns': ['id']})
+    manager.add_connection('input', 'dedup')
+    events = []
+    manager.execute_workflow(lambda *event: events.append(event))
+    assert ('rows', 'dedup', len(DATA.drop_duplicates('id'))) in events
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('PyQt6.QtCore')
+
+from preview_window import DataFrameModel
+
+DATA = pd.DataFrame({
+    'amount': [5, 1, None, 7, 3],
+    'region': ['North', 'south', None, 'north', 'east'],
+    'day': pd.to_datetime(['2024-01-01', '2024-02-01', None, '2023-05-05', '2024-03-03'])
+})
+
+
+def visible(model, column=0):
+    return [model.data(model.index(row, column)) for row in range(model.rowCount())]
+
+
+def test_column_filters_combine_with_each_other_and_the_search():
+    model = DataFrameModel(DATA)
+    model.set_column_filter(0, '> 2')
+    assert visible(model) == ['5.0', '7.0', '3.0']
+    model.set_column_filter(1, '= north')  # Text compares case-insensitively
+    assert visible(model) == ['5.0', '7.0']
+    model.set_filter('2024')
+    assert visible(model) == ['5.0']
+    model.set_column_filter(1, '')
+    model.set_filter('')
+    assert visible(model) == ['5.0', '7.0', '3.0']
+
+
+def test_column_filter_without_operator_matches_text():
+    model = DataFrameModel(DATA)
+    model.set_column_filter(1, 'TH')
+    assert visible(model, 1) == ['North', 'south', 'north']
+
+
+def test_date_filter_and_invalid_value():
+    model = DataFrameModel(DATA)
+    model.set_column_filter(2, '>= 2024-02-01')
+    assert visible(model) == ['1.0', '3.0']
+    with pytest.raises(ValueError):
+        model.set_column_filter(0, '< many')
+    assert model.column_filters() == {2: '>= 2024-02-01'}
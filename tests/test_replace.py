@@ -0,0 +1,33 @@
+import json
+
+import pandas as pd
+
+from tools import ReplaceTool
+
+
+def run(data, **options):
+    tool = ReplaceTool(**options)
+    tool.input_data = data
+    return tool.execute()
+
+
+def test_json_mapping_keys_match_numeric_columns(tmp_path):
+    path = tmp_path / 'codes.json'
+    path.write_text(json.dumps({'1': 'one', '2.5': 'two and a half', 'x': 'ex'}))
+    data = pd.DataFrame({'code': [1, 2, 1], 'price': [2.5, 3.0, 2.5], 'label': ['x', '1', 'y']})
+    result = run(data, mapping_file=str(path))
+    assert result['code'].tolist() == ['one', 2, 'one']
+    assert result['price'].tolist() == ['two and a half', 3.0, 'two and a half']
+    assert result['label'].tolist() == ['ex', 'one', 'y']  # Text columns match the text keys
+
+
+def test_text_keys_match_boolean_and_datetime_columns():
+    data = pd.DataFrame({'flag': [True, False], 'day': pd.to_datetime(['2024-01-01', '2024-01-02'])})
+    result = run(data, mapping={'true': 'yes', '2024-01-02': 'holiday'})
+    assert result['flag'].tolist() == ['yes', False]
+    assert result['day'].tolist() == [pd.Timestamp('2024-01-01'), 'holiday']
+
+
+def test_typed_keys_take_precedence():
+    result = run(pd.DataFrame({'code': [1, 2]}), mapping={'1': 'text', 1: 'number'})
+    assert result['code'].tolist() == ['number', 2]
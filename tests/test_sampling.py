@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import InputTool, sample_batches
+
+DATA = pd.DataFrame({'row': np.arange(1000), 'value': np.arange(1000) % 7})
+
+
+def batches(size=128):
+    return (DATA.iloc[start:start + size] for start in range(0, len(DATA), size))
+
+
+def test_head_keeps_the_first_rows_and_stops_reading():
+    read = []
+    sample = sample_batches((read.append(batch) or batch for batch in batches()), 'head', rows=200)
+    assert sample['row'].tolist() == list(range(200))
+    assert len(read) == 2
+
+
+def test_every_keeps_every_step_th_row_across_batches():
+    sample = sample_batches(batches(size=100), 'every', rows=40, step=7)
+    assert sample['row'].tolist() == list(range(0, 280, 7))
+
+
+def test_reservoir_is_uniform_and_in_input_order():
+    sample = sample_batches(batches(), 'reservoir', rows=100, seed=3)
+    assert len(sample) == 100
+    assert sample['row'].is_monotonic_increasing
+    assert sample['row'].is_unique
+    assert sample['row'].max() > 500  # Drawn from the whole input, not just its start
+
+
+def test_reservoir_with_fixed_seed_gives_the_same_rows_every_run():
+    first = sample_batches(batches(), 'reservoir', rows=50, seed=11)
+    second = sample_batches(batches(), 'reservoir', rows=50, seed=11)
+    other = sample_batches(batches(), 'reservoir', rows=50, seed=12)
+    pd.testing.assert_frame_equal(first, second)
+    assert first['row'].tolist() != other['row'].tolist()
+
+
+@pytest.mark.parametrize('method', ['head', 'every', 'reservoir'])
+def test_sample_of_a_short_input_keeps_what_there_is(method):
+    sample = sample_batches(batches(), method, rows=5000, step=1)
+    assert sample['row'].tolist() == DATA['row'].tolist()
+
+
+def test_unknown_method_and_empty_input():
+    with pytest.raises(ValueError, match="Sample method"):
+        sample_batches(batches(), 'random')
+    assert sample_batches(iter([]), 'head') is None
+
+
+@pytest.mark.parametrize('method', ['head', 'every', 'reservoir'])
+def test_input_tool_reads_sample_from_csv(tmp_path, method):
+    path = tmp_path / 'input.csv'
+    DATA.to_csv(path, index=False)
+    tool = InputTool(str(path), batch_size=100)
+    tool.sample = {'method': method, 'rows': 30, 'step': 9, 'seed': 5}
+    result = tool.execute()
+    expected = sample_batches(batches(size=100), method, rows=30, step=9, seed=5)
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from tools import DifferenceTool, IntersectTool, UnionTool
+
+
+def run(tool, *frames):
+    tool.inputs = list(frames)
+    tool.input_data = frames[0]
+    return tool.execute()
+
+
+def test_intersect_matches_int_and_float_keys():
+    ints = pd.DataFrame({'id': [1, 2, 3]})
+    floats = pd.DataFrame({'id': [2.0, 3.0, 4.5]})
+    result = run(IntersectTool(), ints, floats)
+    assert result['id'].tolist() == [2, 3]
+    assert result['id'].dtype == 'int64'  # Output keeps the first input's dtype
+
+
+def test_difference_matches_int_and_float_keys():
+    ints = pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c']})
+    floats = pd.DataFrame({'id': [2.0, None]})
+    result = run(DifferenceTool(columns=['id']), ints, floats)
+    assert result['id'].tolist() == [1, 3]
+
+
+def test_union_distinct_across_int_and_float_keys():
+    result = run(UnionTool(), pd.DataFrame({'id': [1, 2]}), pd.DataFrame({'id': [2.0, 3.0]}))
+    assert sorted(result['id'].tolist()) == [1.0, 2.0, 3.0]
+
+
+def test_nullable_and_categorical_keys_match():
+    nullable = pd.DataFrame({'id': pd.array([1, 2, None], dtype='Int64')})
+    categorical = pd.DataFrame({'id': pd.Categorical([2.0, float('nan')])})
+    result = run(IntersectTool(), nullable, categorical)
+    assert result['id'].tolist()[0] == 2
+    assert len(result) == 2
+
+
+def test_incompatible_key_types_are_rejected():
+    with pytest.raises(ValueError, match="incompatible types"):
+        run(IntersectTool(), pd.DataFrame({'id': [1, 2]}), pd.DataFrame({'id': ['1', '2']}))
+
+
+def test_empty_input_types_are_ignored():
+    empty = pd.DataFrame({'id': pd.Series([], dtype=object)})
+    result = run(DifferenceTool(), pd.DataFrame({'id': [1, 2]}), empty)
+    assert result['id'].tolist() == [1, 2]
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import SortTool
+
+ROWS = 500
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(7)
+    names = np.array(['pear', 'apple', 'fig', None], dtype=object)
+    return pd.DataFrame({
+        'count': rng.integers(0, 20, ROWS),
+        'price': np.where(rng.random(ROWS) < 0.1, np.nan, rng.integers(0, 50, ROWS) / 4),
+        'name': names[rng.integers(0, len(names), ROWS)],
+        'size': pd.Categorical(rng.choice(['small', 'medium', 'large'], ROWS),
+                               categories=['small', 'medium', 'large'], ordered=True),
+        'day': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 30, ROWS), unit='D'),
+        'row': np.arange(ROWS)
+    })
+
+
+KEYS = [
+    (['count'], True),
+    (['price', 'count'], [False, True]),
+    (['name', 'price'], [True, False]),
+    (['size', 'count', 'day'], [False, True, False]),
+    (['day', 'size'], [True, True]),
+]
+
+
+def expected(data, columns, ascending):
+    return data.sort_values(columns, ascending=ascending, kind='stable', na_position='last')
+
+
+def run(data, **options):
+    tool = SortTool(**options)
+    tool.input_data = data
+    return tool.execute()
+
+
+@pytest.mark.parametrize('columns, ascending', KEYS)
+def test_external_sort_matches_sort_values(data, monkeypatch, columns, ascending):
+    monkeypatch.setattr(SortTool, 'MIN_BLOCK_ROWS', 7)  # Several blocks per run, so the merge interleaves
+    result = run(data, columns=columns, ascending=ascending, memory_limit_mb=0, chunk_rows=64)
+    pd.testing.assert_frame_equal(result, expected(data, columns, ascending))
+
+
+@pytest.mark.parametrize('columns, ascending', KEYS)
+@pytest.mark.parametrize('limit', [1, 10, 137, ROWS + 5])
+def test_top_n_matches_sort_values(data, columns, ascending, limit):
+    result = run(data, columns=columns, ascending=ascending, limit=limit)
+    pd.testing.assert_frame_equal(result, expected(data, columns, ascending).head(limit))
+
+
+def test_non_positive_limit_returns_no_rows(data):
+    assert run(data, columns=['price'], limit=0).empty
+    assert list(run(data, columns=['price'], limit=-1).columns) == list(data.columns)
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from tools import SQLTool
+
+DATA = pd.DataFrame({'id': [1, 2, 3], 'amount': [2.5, 1.0, 4.0]})
+
+
+def sql(query, **properties):
+    tool = SQLTool(query, **properties)
+    tool.inputs = [DATA]
+    tool.input_data = DATA
+    return tool
+
+
+@pytest.mark.parametrize('memory_limit', ["4GB'; INSTALL httpfs; --", '4', 'lots', '4 PB', '-1GB'])
+def test_invalid_memory_limit_is_rejected_before_running(memory_limit):
+    with pytest.raises(ValueError, match="memory_limit must be a size"):
+        sql('SELECT * FROM input', memory_limit=memory_limit).execute()
+
+
+@pytest.mark.parametrize('memory_limit', ['4GB', '512 mb', '1.5GiB', ' 64MB '])
+def test_memory_limit_sizes_are_applied(memory_limit):
+    pytest.importorskip('duckdb')
+    result = sql('SELECT sum(amount) AS total FROM input', memory_limit=memory_limit).execute()
+    assert result['total'].tolist() == [7.5]
@@ -0,0 +1,114 @@
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+import tool_registry
+from tool_registry import BLOCKING, ROW_LOCAL, STREAMABLE, get_tool_spec, tool_names
+from workflow_manager import WorkflowManager
+
+PLUGIN = '''
+from tools import ETLTool
+from tool_registry import ROW_LOCAL, STREAMABLE
+
+
+class Upper(ETLTool):
+    CONFIG_SCHEMA = {'column': {'type': 'str', 'required': True}}
+    INPUTS = (1, 1)
+    EXECUTION = ROW_LOCAL
+
+    def __init__(self, column):
+        super().__init__()
+        self.column = column
+
+    def execute(self):
+        self.output_data = self.input_data.assign(**{self.column: self.input_data[self.column].str.upper()})
+        return self.output_data
+
+
+class Generate(ETLTool):
+    CONFIG_SCHEMA = {'rows': {'type': 'int', 'default': 3}}
+    INPUTS = (0, 0)
+    EXECUTION = STREAMABLE
+
+    def __init__(self, rows=3):
+        super().__init__()
+        self.rows = rows
+
+
+class Bare(ETLTool):
+    def __init__(self):
+        super().__init__()
+'''
+
+
+@pytest.fixture
+def plugins(tmp_path, monkeypatch):
+    """Register the tools in PLUGIN through fake 'bebetteretl.tools' entry points"""
+    (tmp_path / 'registry_plugin.py').write_text(PLUGIN)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'registry_plugin', raising=False)
+    found = [EntryPoint(name, f'registry_plugin:{name}', tool_registry.ENTRY_POINT_GROUP)
+             for name in ('Upper', 'Generate', 'Bare')]
+    # A plugin cannot replace a built-in tool
+    found.append(EntryPoint('Sort', 'registry_plugin:Bare', tool_registry.ENTRY_POINT_GROUP))
+
+    class EntryPoints(list):
+        def select(self, group):
+            return [entry_point for entry_point in self if entry_point.group == group]
+
+    import importlib.metadata
+    monkeypatch.setattr(importlib.metadata, 'entry_points', lambda: EntryPoints(found))
+    monkeypatch.setattr(tool_registry, '_registry', dict(tool_registry._registry))
+    monkeypatch.setattr(tool_registry, '_entry_points_loaded', False)
+
+
+def test_entry_points_are_registered_without_importing_them(plugins):
+    assert {'Upper', 'Generate', 'Bare'} <= set(tool_names())
+    assert 'registry_plugin' not in sys.modules
+    assert get_tool_spec('Sort').target == 'tools:SortTool'
+
+
+def test_entry_point_metadata_comes_from_class_attributes(plugins):
+    upper, generate = get_tool_spec('Upper'), get_tool_spec('Generate')
+    assert upper.schema == {'column': {'type': 'str', 'required': True}}
+    assert (upper.inputs, upper.execution) == ((1, 1), ROW_LOCAL)
+    assert (generate.inputs, generate.execution) == ((0, 0), STREAMABLE)
+
+
+def test_undeclared_metadata_defaults_to_one_input_and_blocking(plugins):
+    bare = get_tool_spec('Bare')
+    assert (bare.schema, bare.inputs, bare.execution) == ({}, (1, 1), BLOCKING)
+
+
+def test_create_passes_schema_properties_only(plugins):
+    tool = get_tool_spec('Upper').create({'column': 'name', 'timeout': 5, 'unknown': 1})
+    assert tool.column == 'name'
+    with pytest.raises(ValueError, match="missing required property 'column'"):
+        get_tool_spec('Upper').create({})
+
+
+def plugin_chain(tool_type, properties):
+    manager = WorkflowManager()
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0}, {'file_path': 'log.csv', 'incremental': True})
+    manager.add_node('plugin', tool_type, {'x': 0, 'y': 0}, properties)
+    manager.add_node('sort', 'Sort', {'x': 0, 'y': 0}, {'columns': ['name']})
+    manager.add_connection('input', 'plugin')
+    manager.add_connection('plugin', 'sort')
+    return manager
+
+
+def test_execution_metadata_decides_how_deltas_flow(plugins):
+    # A row-local plugin passes the delta on to the Sort, which then needs its whole input
+    manager = plugin_chain('Upper', {'column': 'name'})
+    assert manager._delta_source('sort') == 'input'
+    with pytest.raises(ValueError, match="needs its whole input"):
+        manager._check_deltas(manager.execution_order(), lambda *event: None)
+
+    # A blocking plugin is rejected itself, and the Sort reads the plugin's full output
+    manager = plugin_chain('Bare', {})
+    assert manager._delta_source('sort') is None
+    failed = []
+    with pytest.raises(ValueError, match="needs its whole input"):
+        manager._check_deltas(manager.execution_order(), lambda *event: failed.append(event))
+    assert failed[0][:2] == ('failed', 'plugin')
@@ -0,0 +1,89 @@
+import json
+
+import pandas as pd
+import pytest
+
+from trace_export import build_trace_events, write_batch_trace
+from workflow_manager import WorkflowManager
+
+NODES = {'input': {'type': 'Input'}, 'sort': {'type': 'Sort'}}
+
+
+def node_metrics(start, end, process_id=100, thread_id=1, **extra):
+    return {'start_time': start, 'end_time': end, 'process_id': process_id, 'thread_id': thread_id,
+            'cpu_time': 0.5, 'peak_memory': None, 'output_rows': 3, **extra}
+
+
+def test_node_and_tool_spans_are_complete_events_in_microseconds():
+    metrics = {
+        'sort': node_metrics(12.0, 13.5),
+        'input': node_metrics(10.0, 12.0, spans=[('read_csv', 'io', 10.5, 11.5)]),
+    }
+    events = build_trace_events(NODES, metrics, {'start_time': 10.0})
+    spans = [event for event in events if event['ph'] == 'X']
+    assert [(event['name'], event['cat'], event['ts'], event['dur']) for event in spans] == [
+        ('Input', 'node', 0.0, 2e6),
+        ('read_csv', 'io', 5e5, 1e6),
+        ('Sort', 'node', 2e6, 1.5e6),
+    ]
+    assert spans[0]['args']['node_id'] == 'input'
+    assert spans[0]['args']['output_rows'] == 3
+    assert all((event['pid'], event['tid']) == (100, 1) for event in spans)
+
+
+def test_process_and_thread_lanes_are_named():
+    metrics = {'input': node_metrics(0.0, 1.0, thread_id=1), 'sort': node_metrics(0.0, 1.0, thread_id=2)}
+    metadata = [event for event in build_trace_events(NODES, metrics, {'start_time': 0.0})
+                if event['ph'] == 'M']
+    assert {(event['name'], event.get('tid'), event['args']['name']) for event in metadata} == {
+        ('process_name', None, 'workflow (pid 100)'),
+        ('thread_name', 1, 'worker 1'),
+        ('thread_name', 2, 'worker 2'),
+    }
+
+
+def test_memory_counters_hold_the_node_peak_while_it_runs():
+    metrics = {'input': node_metrics(0.0, 1.0, peak_memory=300, memory_before=1000, memory_after=1200)}
+    counters = [event for event in build_trace_events(NODES, metrics, {'start_time': 0.0})
+                if event['ph'] == 'C']
+    assert [(event['ts'], event['args']) for event in counters] == [
+        (0.0, {'traced': 1000, 'node_peak': 1300}),
+        (1e6, {'traced': 1200, 'node_peak': 1200}),
+    ]
+
+
+def test_exported_run_trace(tmp_path):
+    pd.DataFrame({'a': [3, 1, 2]}).to_csv(tmp_path / 'in.csv', index=False)
+    manager = WorkflowManager()
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0}, {'file_path': str(tmp_path / 'in.csv')})
+    manager.add_node('sort', 'Sort', {'x': 0, 'y': 0}, {'columns': ['a']})
+    manager.add_connection('input', 'sort')
+    with pytest.raises(ValueError, match="not been run"):
+        manager.export_trace(str(tmp_path / 'trace.json'))
+
+    manager.execute_workflow()
+    manager.export_trace(str(tmp_path / 'trace.json'))
+    trace = json.loads((tmp_path / 'trace.json').read_text())
+    assert trace['displayTimeUnit'] == 'ms'
+    assert trace['otherData']['duration'] > 0
+    nodes = {event['args']['node_id']: event for event in trace['traceEvents'] if event.get('cat') == 'node'}
+    assert set(nodes) == {'input', 'sort'}
+    assert nodes['input']['ts'] >= 0 and nodes['sort']['ts'] >= nodes['input']['ts'] + nodes['input']['dur']
+    # Tool spans lie within their node's span
+    read = next(event for event in trace['traceEvents'] if event['name'] == 'read_csv')
+    assert nodes['input']['ts'] <= read['ts'] <= read['ts'] + read['dur'] <= nodes['input']['ts'] + nodes['input']['dur']
+
+
+def test_batch_trace_has_a_lane_per_worker_and_tags_runs(tmp_path):
+    reports = [
+        {'run': 0, 'start_time': 5.0, 'node_metrics': {'input': node_metrics(5.0, 6.0, process_id=1)}},
+        {'run': 1, 'start_time': 5.5, 'node_metrics': {'input': node_metrics(5.5, 7.0, process_id=2)}},
+        {'run': 2, 'start_time': 6.0, 'node_metrics': {'input': node_metrics(6.0, 6.5, process_id=1)}},
+    ]
+    write_batch_trace(str(tmp_path / 'batch.json'), NODES, reports)
+    events = json.loads((tmp_path / 'batch.json').read_text())['traceEvents']
+    spans = [event for event in events if event['ph'] == 'X']
+    assert [(event['args']['run'], event['pid'], event['ts']) for event in spans] == [
+        (0, 1, 0.0), (1, 2, 5e5), (2, 1, 1e6)]
+    process_names = [event['pid'] for event in events if event['name'] == 'process_name']
+    assert sorted(process_names) == [1, 2]
@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from tools import ToolStopped, TransformTool, load_function
+
+DATA = pd.DataFrame({'a': range(100), 'b': [1.5] * 100})
+
+FUNCTIONS = '''
+import time
+
+def scale(batch, factor=1):
+    return batch.assign(a=batch['a'] * factor)
+
+def add(a, b):
+    return a + b, a - b
+
+def slow(batch, seconds):
+    time.sleep(seconds)
+    return batch
+
+class Helpers:
+    @staticmethod
+    def negate(batch):
+        return batch.assign(a=-batch['a'])
+'''
+
+
+@pytest.fixture
+def functions(tmp_path, monkeypatch):
+    (tmp_path / 'etl_test_functions.py').write_text(FUNCTIONS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return tmp_path / 'etl_test_functions.py'
+
+
+def run(data, **options):
+    tool = TransformTool(**options)
+    tool.input_data = data
+    return tool.execute()
+
+
+def test_function_from_module(functions):
+    result = run(DATA, function='etl_test_functions:scale', arguments={'factor': 3})
+    assert result['a'].tolist() == [value * 3 for value in range(100)]
+
+
+def test_function_from_file_and_nested_attribute(functions):
+    result = run(DATA, function=f'{functions}:Helpers.negate')
+    assert result['a'].tolist() == [-value for value in range(100)]
+
+
+def test_invalid_function_paths(functions):
+    with pytest.raises(ValueError, match="module:name"):
+        load_function('scale')
+    with pytest.raises(AttributeError):
+        load_function('etl_test_functions:missing')
+
+
+@pytest.mark.parametrize('function', ['etl_test_functions:scale', 'file'])
+def test_process_pool_matches_single_process(functions, function):
+    function = f'{functions}:scale' if function == 'file' else function
+    single = run(DATA, function=function, arguments={'factor': 2}, batch_rows=7)
+    pooled = run(DATA, function=function, arguments={'factor': 2}, batch_rows=7, workers=3)
+    pd.testing.assert_frame_equal(pooled, single)
+    pd.testing.assert_frame_equal(pooled, DATA.assign(a=DATA['a'] * 2))
+
+
+def test_array_function_across_processes(functions):
+    result = run(DATA, function=f'{functions}:add', columns=['a', 'b'], output=['sum', 'difference'],
+                 batch_rows=30, workers=2)
+    assert result['sum'].tolist() == [value + 1.5 for value in range(100)]
+    assert result['difference'].tolist() == [value - 1.5 for value in range(100)]
+
+
+def test_stop_reaches_the_process_pool(functions):
+    tool = TransformTool(function=f'{functions}:slow', arguments={'seconds': 0.2}, batch_rows=2, workers=2)
+    tool.input_data = DATA.head(80)  # 40 batches: about 4 seconds on two workers
+    tool.stop_event = threading.Event()
+    threading.Timer(0.3, tool.stop_event.set).start()
+    start = time.monotonic()
+    with pytest.raises(ToolStopped):
+        tool.execute()
+    assert time.monotonic() - start < 2
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import WindowTool
+
+
+def run(data, **options):
+    tool = WindowTool(**options)
+    tool.input_data = data
+    return tool.execute()
+
+
+DATA = pd.DataFrame({
+    'group': ['a', 'a', 'a', 'b', 'b'],
+    'day': [1, 2, 3, 1, 2],
+    'value': [1.0, np.nan, 3.0, 4.0, 5.0]
+})
+
+
+@pytest.mark.parametrize('partition_by', [['group'], None])
+def test_lag_default_only_fills_past_partition_edge(partition_by):
+    result = run(DATA, windows=[{'function': 'lag', 'column': 'value', 'default': 0, 'output': 'previous'}],
+                 partition_by=partition_by, order_by=['day'] if partition_by else None)
+    expected = [0, 1.0, np.nan, 0, 4.0] if partition_by else [0, 1.0, np.nan, 3.0, 4.0]
+    np.testing.assert_array_equal(result['previous'].to_numpy(), expected)
+
+
+@pytest.mark.parametrize('partition_by', [['group'], None])
+def test_lead_default_only_fills_past_partition_edge(partition_by):
+    result = run(DATA, windows=[{'function': 'lead', 'column': 'value', 'default': -1, 'output': 'next'}],
+                 partition_by=partition_by, order_by=['day'] if partition_by else None)
+    expected = [np.nan, 3.0, -1, 5.0, -1] if partition_by else [np.nan, 3.0, 4.0, 5.0, -1]
+    np.testing.assert_array_equal(result['next'].to_numpy(), expected)
+
+
+def test_rolling_without_window_size_is_rejected():
+    with pytest.raises(ValueError, match="window size"):
+        WindowTool(windows=[{'function': 'rolling', 'column': 'value'}])
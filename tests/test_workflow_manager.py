@@ -0,0 +1,232 @@
+import threading
+import time
+
+import pytest
+
+from tools import ETLTool, InputTool, ToolStopped
+from workflow_manager import NodeTimeoutError, WorkflowCancelled, WorkflowManager
+
+
+class SlowTool(ETLTool):
+    """Runs until stopped, recording whether it is still running"""
+
+    def __init__(self, seconds=None):
+        super().__init__()
+        self.seconds = seconds
+        self.running = False
+
+    def execute(self):
+        self.running = True
+        try:
+            start = time.monotonic()
+            while self.seconds is None or time.monotonic() - start < self.seconds:
+                self.check_stopped()
+                time.sleep(0.01)
+        finally:
+            self.running = False
+
+
+def test_timeout_is_reported_after_the_tool_stops():
+    tool = SlowTool()
+    with pytest.raises(NodeTimeoutError):
+        WorkflowManager()._run_tool(tool, 0.2, None)
+    assert not tool.running
+
+
+def test_cancel_is_reported_after_the_tool_stops():
+    tool = SlowTool()
+    cancel_event = threading.Event()
+    threading.Timer(0.2, cancel_event.set).start()
+    with pytest.raises(WorkflowCancelled):
+        WorkflowManager()._run_tool(tool, None, cancel_event)
+    assert not tool.running
+
+
+def test_tool_finishing_within_its_timeout_returns_metrics():
+    metrics = WorkflowManager()._run_tool(SlowTool(0.05), 5, threading.Event())
+    assert metrics['wall_time'] >= 0.05
+
+
+class ThreadedTool(ETLTool):
+    """Burns CPU in a helper thread, as DuckDB and Polars do"""
+
+    def execute(self):
+        def spin():
+            end = time.thread_time() + 0.2
+            while time.thread_time() < end:
+                pass
+
+        helper = threading.Thread(target=spin)
+        helper.start()
+        helper.join()
+
+
+def test_cpu_time_includes_other_threads():
+    metrics = WorkflowManager()._run_tool(ThreadedTool(), None, None)
+    assert metrics['cpu_time'] >= 0.15
+
+
+def test_node_timeout_property_overrides_run_timeout():
+    manager = WorkflowManager()
+    manager.add_node('sort', 'Sort', {'x': 0, 'y': 0}, {'columns': ['a'], 'timeout': 30})
+    manager.add_node('filter', 'Filter', {'x': 0, 'y': 0}, {'condition': 'a > 1'})
+    assert manager.timeout_for('sort', 5) == 30
+    assert manager.timeout_for('filter', 5) == 5
+
+
+def incremental_workflow(*types):
+    """A chain of nodes fed by an incremental Input"""
+    manager = WorkflowManager()
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0}, {'file_path': 'log.csv', 'incremental': True})
+    previous = 'input'
+    for index, (tool_type, properties) in enumerate(types):
+        node_id = f'node{index}'
+        manager.add_node(node_id, tool_type, {'x': 0, 'y': 0}, properties)
+        manager.add_connection(previous, node_id)
+        previous = node_id
+    return manager
+
+
+def test_delta_into_blocking_tool_is_rejected():
+    manager = incremental_workflow(('Filter', {'condition': 'a > 1'}), ('Sort', {'columns': ['a']}))
+    failed = []
+    with pytest.raises(ValueError, match="needs its whole input"):
+        manager._check_deltas(manager.execution_order(), lambda *event: failed.append(event))
+    assert failed[0][:2] == ('failed', 'node1')
+
+
+def test_delta_into_incremental_aggregate_is_allowed():
+    manager = incremental_workflow(('Aggregate', {'aggregations': {'a': ['sum']}, 'incremental': True}),
+                                   ('Sort', {'columns': ['a']}))
+    manager._check_deltas(manager.execution_order(), lambda *event: None)
+
+
+def append_rows(path, text):
+    with open(path, 'a') as f:
+        f.write(text)
+
+
+def file_workflow(tmp_path, *steps, output=None):
+    """Incremental Input over tmp_path/log.csv -> steps -> Output to tmp_path/out.csv"""
+    manager = WorkflowManager()
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0},
+                     {'file_path': str(tmp_path / 'log.csv'), 'incremental': True})
+    previous = 'input'
+    for index, (tool_type, properties) in enumerate(steps):
+        manager.add_node(f'step{index}', tool_type, {'x': 0, 'y': 0}, properties)
+        manager.add_connection(previous, f'step{index}')
+        previous = f'step{index}'
+    manager.add_node('output', 'Output', {'x': 0, 'y': 0},
+                     {'file_path': str(tmp_path / 'out.csv'), **(output or {})})
+    manager.add_connection(previous, 'output')
+    return manager
+
+
+def test_delta_into_rewriting_output_is_rejected(tmp_path):
+    append_rows(tmp_path / 'log.csv', 'a,b\n1,x\n2,y\n')
+    manager = file_workflow(tmp_path)
+    with pytest.raises(ValueError, match="rewrites its output"):
+        manager.execute_workflow()
+    assert not (tmp_path / 'out.csv').exists()
+
+
+def test_delta_through_transform_is_appended(tmp_path):
+    (tmp_path / 'double.py').write_text("def double(batch):\n    return batch.assign(a=batch['a'] * 2)\n")
+    append_rows(tmp_path / 'log.csv', 'a\n1\n2\n')
+    transform = ('Transform', {'function': f"{tmp_path / 'double.py'}:double"})
+    manager = file_workflow(tmp_path, transform, output={'append': True})
+    manager.execute_workflow()
+    append_rows(tmp_path / 'log.csv', '3\n')
+    manager.execute_workflow()
+    assert (tmp_path / 'out.csv').read_text() == 'a\n2\n4\n6\n'
+
+
+def test_csv_input_reports_rows_per_batch(tmp_path):
+    append_rows(tmp_path / 'in.csv', 'a\n1\n2\n3\n4\n5\n')
+    manager = WorkflowManager()
+    manager.add_node('input', 'Input', {'x': 0, 'y': 0},
+                     {'file_path': str(tmp_path / 'in.csv'), 'batch_size': 2})
+    events = []
+    manager.execute_workflow(lambda *event: events.append(event))
+    assert [rows for event, _, rows in events if event == 'rows'] == [2, 4, 5, 5]
+    assert manager.get_node_data('input')['a'].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_csv_input_stops_between_batches(tmp_path):
+    append_rows(tmp_path / 'in.csv', 'a\n1\n2\n3\n4\n5\n')
+    tool = InputTool(str(tmp_path / 'in.csv'), batch_size=2)
+    tool.stop_event = threading.Event()
+    progress = []
+
+    def stop_after_first_batch(rows):
+        progress.append(rows)
+        tool.stop_event.set()
+
+    tool.progress = stop_after_first_batch
+    with pytest.raises(ToolStopped):
+        tool.execute()
+    assert progress == [2]
+
+
+def test_header_only_csv_input_keeps_columns(tmp_path):
+    append_rows(tmp_path / 'in.csv', 'a,b\n')
+    data = InputTool(str(tmp_path / 'in.csv'), batch_size=2).execute()
+    assert list(data.columns) == ['a', 'b'] and data.empty
+
+
+def graph(*connections):
+    """Filter nodes a, b, c, ... connected as given"""
+    manager = WorkflowManager()
+    for node_id in sorted({node_id for connection in connections for node_id in connection}):
+        manager.add_node(node_id, 'Filter', {'x': 0, 'y': 0}, {'condition': 'a > 1'})
+    for from_node, to_node in connections:
+        manager.add_connection(from_node, to_node)
+    return manager
+
+
+def test_deleting_a_node_updates_every_index():
+    manager = graph(('a', 'b'), ('b', 'c'), ('a', 'c'))
+    manager.add_node('sort', 'Sort', {'x': 0, 'y': 0}, {'columns': ['a']})
+    manager.add_connection('b', 'sort')
+    manager.remove_node('b')
+    assert manager.connections == [{'from': 'a', 'to': 'c'}]
+    assert manager.get_downstream_nodes('a') == ['c']
+    assert manager.get_upstream_nodes('c') == ['a']
+    assert manager.get_upstream_nodes('sort') == []
+    assert manager.nodes_of_type('filter') == ['a', 'c']
+
+    manager.remove_node('sort')
+    assert manager.node_types() == ['Filter']
+    assert manager.nodes_of_type('Sort') == []
+
+
+def test_reconnecting_moves_the_input_to_the_end():
+    manager = graph(('a', 'c'), ('b', 'c'))
+    manager.add_connection('a', 'c')  # Already connected: no duplicate, order kept
+    assert manager.get_upstream_nodes('c') == ['a', 'b']
+    manager.remove_connection('a', 'c')
+    assert not manager.has_connection('a', 'c')
+    assert manager.get_downstream_nodes('a') == []
+    manager.add_connection('a', 'c')
+    assert manager.get_upstream_nodes('c') == ['b', 'a']
+    assert manager.connections == [{'from': 'b', 'to': 'c'}, {'from': 'a', 'to': 'c'}]
+
+
+def test_replacing_a_node_moves_it_between_types():
+    manager = graph(('a', 'b'))
+    manager.add_node('a', 'Sort', {'x': 0, 'y': 0}, {'columns': ['a']})
+    assert manager.nodes_of_type('filter') == ['b']
+    assert manager.nodes_of_type('sort') == ['a']
+    assert manager.get_downstream_nodes('a') == ['b']  # Connections are kept
+
+
+def test_loaded_workflow_rebuilds_the_indexes():
+    manager = graph(('a', 'b'), ('b', 'c'))
+    loaded = WorkflowManager()
+    loaded.add_node('stale', 'Sort', {'x': 0, 'y': 0}, {'columns': ['a']})
+    loaded.add_connection('stale', 'a')
+    loaded.load_workflow_dict(manager.workflow_dict())
+    assert loaded.node_types() == ['Filter']
+    assert loaded.get_upstream_nodes('a') == []
+    assert loaded.get_downstream_nodes('b') == ['c']
+    assert loaded.execution_order() == ['a', 'b', 'c']
@@ -0,0 +1,213 @@
+import importlib
+from typing import Any, Dict, List, Optional, Tuple
+
+# How a tool consumes its input, used to choose an execution strategy
+ROW_LOCAL = 'row-local'    # Each output row depends only on its input row
+STREAMABLE = 'streamable'  # Can process input in chunks and emit results as it goes
+BLOCKING = 'blocking'      # Needs its whole input before producing output
+
+ENTRY_POINT_GROUP = 'bebetteretl.tools'
+
+# Properties every node accepts, applied by the workflow manager rather than passed to the tool
+NODE_SCHEMA = {'timeout': {'type': 'float'}}  # Seconds, overriding the run's node timeout
+
+class ToolSpec:
+    """A registered tool type whose class is imported on first use.
+
+    Built-in tools declare their metadata here so it is available without
+    importing pandas. Tools registered through entry points declare it as
+    CONFIG_SCHEMA, INPUTS and EXECUTION class attributes instead.
+    """
+
+    def __init__(self, name: str, target: str, schema: Dict[str, Dict[str, Any]] = None,
+                 inputs: Tuple[int, Optional[int]] = None, execution: str = None,
+                 entry_point=None):
+        self.name = name
+        self.target = target  # 'module:ClassName'
+        self._schema = schema
+        self._inputs = inputs
+        self._execution = execution
+        self._entry_point = entry_point
+        self._tool_class = None
+
+    def load(self):
+        """Import and return the tool class"""
+        if self._tool_class is None:
+            if self._entry_point is not None:
+                self._tool_class = self._entry_point.load()
+            else:
+                module_name, _, class_name = self.target.partition(':')
+                self._tool_class = getattr(importlib.import_module(module_name), class_name)
+        return self._tool_class
+
+    def _declared(self, value, attribute: str, default):
+        if value is not None:
+            return value
+        return getattr(self.load(), attribute, default)
+
+    @property
+    def schema(self) -> Dict[str, Dict[str, Any]]:
+        """Property name -> {'type': ..., 'required': bool, 'default': ...}"""
+        return self._declared(self._schema, 'CONFIG_SCHEMA', {})
+
+    @property
+    def inputs(self) -> Tuple[int, Optional[int]]:
+        """Minimum and maximum number of input connections (None for no maximum)"""
+        return self._declared(self._inputs, 'INPUTS', (1, 1))
+
+    @property
+    def execution(self) -> str:
+        return self._declared(self._execution, 'EXECUTION', BLOCKING)
+
+    def create(self, properties: Dict[str, Any]):
+        """Instantiate the tool, passing schema properties as constructor arguments"""
+        kwargs = {}
+        for key, field in self.schema.items():
+            if key in properties:
+                kwargs[key] = properties[key]
+            elif field.get('required'):
+                raise ValueError(f"{self.name} node is missing required property '{key}'")
+        return self.load()(**kwargs)
+
+_registry: Dict[str, ToolSpec] = {}
+_entry_points_loaded = False
+
+def register_tool(name: str, target: str, schema: Dict[str, Dict[str, Any]] = None,
+                  inputs: Tuple[int, Optional[int]] = (1, 1), execution: str = BLOCKING):
+    """Register a tool type by 'module:ClassName' without importing it"""
+    _registry[name] = ToolSpec(name, target, schema or {}, inputs, execution)
+
+def _load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    from importlib.metadata import entry_points
+    found = entry_points()
+    if hasattr(found, 'select'):
+        found = found.select(group=ENTRY_POINT_GROUP)
+    else:
+        found = found.get(ENTRY_POINT_GROUP, [])
+    for entry_point in found:
+        if entry_point.name not in _registry:
+            _registry[entry_point.name] = ToolSpec(entry_point.name, entry_point.value,
+                                                   entry_point=entry_point)
+
+def get_tool_spec(name: str) -> Optional[ToolSpec]:
+    if name not in _registry:
+        _load_entry_points()
+    return _registry.get(name)
+
+def tool_names() -> List[str]:
+    _load_entry_points()
+    return list(_registry)
+
+def create_tool(name: str, properties: Dict[str, Any]):
+    """Create a tool instance, or return None for node types with no tool behind them"""
+    spec = get_tool_spec(name)
+    if spec is None:
+        return None
+    return spec.create(properties)
+
+# Built-in tools
+register_tool('Input', 'tools:InputTool',
+              schema={'file_path': {'type': 'str', 'required': True},
+                      'incremental': {'type': 'bool', 'default': False},
+                      'file_format': {'type': 'str', 'default': 'csv'},
+                      'table': {'type': 'str'},
+                      'query': {'type': 'str'},
+                      'batch_size': {'type': 'int', 'default': 50_000}},
+              inputs=(0, 0), execution=STREAMABLE)
+register_tool('Select', 'tools:SelectTool',
+              schema={'columns': {'type': 'list', 'required': True},
+                      'drop_columns': {'type': 'bool', 'default': False}},
+              execution=ROW_LOCAL)
+register_tool('Filter', 'tools:FilterTool',
+              schema={'condition': {'type': 'str', 'required': True}},
+              execution=ROW_LOCAL)
+register_tool('Join', 'tools:JoinTool',
+              schema={'right_data': {'type': 'dataframe', 'required': True},
+                      'how': {'type': 'str', 'default': 'inner'},
+                      'left_on': {'type': 'str'},
+                      'right_on': {'type': 'str'}},
+              execution=BLOCKING)
+register_tool('Merge', 'tools:MergeTool',
+              schema={'additional_data': {'type': 'list', 'required': True}},
+              execution=STREAMABLE)
+register_tool('Formula', 'tools:FormulaTool',
+              schema={'formula': {'type': 'str', 'required': True},
+                      'new_column': {'type': 'str', 'required': True}},
+              execution=ROW_LOCAL)
+register_tool('Output', 'tools:OutputTool',
+              schema={'file_path': {'type': 'str', 'required': True},
+                      'file_format': {'type': 'str', 'default': 'csv'},
+                      'append': {'type': 'bool', 'default': False},
+                      'table': {'type': 'str'},
+                      'upsert_keys': {'type': 'list'}},
+              execution=STREAMABLE)
+register_tool('Aggregate', 'tools:AggregateTool',
+              schema={'aggregations': {'type': 'dict', 'required': True},
+                      'group_by': {'type': 'str'},
+                      'incremental': {'type': 'bool', 'default': False}},
+              execution=BLOCKING)
+register_tool('SQL', 'tools:SQLTool',
+              schema={'query': {'type': 'str', 'required': True},
+                      'table_names': {'type': 'list'},
+                      'threads': {'type': 'int'},
+                      'memory_limit': {'type': 'str'}},
+              inputs=(1, None), execution=BLOCKING)
+register_tool('Sort', 'tools:SortTool',
+              schema={'columns': {'type': 'list', 'required': True},
+                      'ascending': {'type': 'bool', 'default': True},
+                      'limit': {'type': 'int'},
+                      'memory_limit_mb': {'type': 'int'},
+                      'chunk_rows': {'type': 'int', 'default': 1_000_000}},
+              execution=BLOCKING)
+register_tool('Union', 'tools:UnionTool',
+              schema={'columns': {'type': 'list'},
+                      'distinct': {'type': 'bool', 'default': True},
+                      'chunk_rows': {'type': 'int', 'default': 1_000_000},
+                      'memory_limit_mb': {'type': 'int'}},
+              inputs=(2, None), execution=BLOCKING)
+register_tool('Intersect', 'tools:IntersectTool',
+              schema={'columns': {'type': 'list'},
+                      'distinct': {'type': 'bool', 'default': True},
+                      'chunk_rows': {'type': 'int', 'default': 1_000_000},
+                      'memory_limit_mb': {'type': 'int'}},
+              inputs=(2, None), execution=BLOCKING)
+register_tool('Difference', 'tools:DifferenceTool',
+              schema={'columns': {'type': 'list'},
+                      'distinct': {'type': 'bool', 'default': True},
+                      'chunk_rows': {'type': 'int', 'default': 1_000_000},
+                      'memory_limit_mb': {'type': 'int'}},
+              inputs=(2, None), execution=BLOCKING)
+register_tool('Deduplicate', 'tools:DeduplicateTool',
+              schema={'columns': {'type': 'list'},
+                      'keep': {'type': 'str', 'default': 'first'},
+                      'bloom_filter': {'type': 'bool', 'default': False},
+                      'false_positive_rate': {'type': 'float', 'default': 0.01},
+                      'chunk_rows': {'type': 'int', 'default': 1_000_000},
+                      'memory_limit_mb': {'type': 'int'}},
+              execution=BLOCKING)
+register_tool('Replace', 'tools:ReplaceTool',
+              schema={'columns': {'type': 'list'},
+                      'mapping': {'type': 'dict'},
+                      'mapping_file': {'type': 'str'},
+                      'regex': {'type': 'dict'}},
+              execution=ROW_LOCAL)
+register_tool('Window', 'tools:WindowTool',
+              schema={'windows': {'type': 'list', 'required': True},
+                      'partition_by': {'type': 'list'},
+                      'order_by': {'type': 'list'},
+                      'ascending': {'type': 'bool', 'default': True}},
+              execution=BLOCKING)
+register_tool('Transform', 'tools:TransformTool',
+              schema={'function': {'type': 'str', 'required': True},
+                      'arguments': {'type': 'dict'},
+                      'batch_rows': {'type': 'int'},
+                      'workers': {'type': 'int', 'default': 1},
+                      'batch_format': {'type': 'str', 'default': 'pandas'},
+                      'columns': {'type': 'list'},
+                      'output': {'type': 'list'},
+                      'jit': {'type': 'bool', 'default': False}},
+              execution=STREAMABLE)
@@ -1,23 +1,417 @@
+import functools
+import importlib
+import importlib.util
+import io
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import numpy as np
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager
 from typing import List, Dict, Any, Optional
 
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for use in SQL"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def available_memory() -> Optional[int]:
+    """Memory available without swapping, in bytes, or None where it cannot be determined.
+
+    Unlike free memory, this counts page cache the kernel can reclaim. It comes
+    from psutil if installed, else MemAvailable in /proc/meminfo, else free pages.
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def row_hashes(data: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+    """64-bit hash of each row over columns (all columns by default)"""
+    if columns:
+        data = data[columns]
+    return pd.util.hash_pandas_object(data, index=False).to_numpy()
+
+def _contains(sorted_unique: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Membership of values in a sorted array of unique values, by binary search"""
+    if len(sorted_unique) == 0:
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_unique, values).clip(max=len(sorted_unique) - 1)
+    return sorted_unique[positions] == values
+
+def _sort_key_arrays(frame: pd.DataFrame, keys: List[str]) -> List[np.ndarray]:
+    """Sort key columns as arrays whose values compare like sort_values orders them"""
+    arrays = []
+    for key in keys:
+        column = frame[key]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Categoricals sort in category order, by code; -1 is missing
+            codes = column.cat.codes.to_numpy()
+            arrays.append(np.where(codes >= 0, codes, np.nan))
+        else:
+            arrays.append(column.to_numpy())
+    return arrays
+
+def _sorts_before_or_equal(left: tuple, right: tuple, directions: List[bool]) -> bool:
+    """Whether row key left sorts at or before right, with missing values last.
+
+    Keys are tuples of (missing, value) pairs, one per sort column.
+    """
+    for (a_missing, a), (b_missing, b), ascending in zip(left, right, directions):
+        if a_missing or b_missing:
+            if a_missing and b_missing:
+                continue
+            return b_missing
+        if a != b:
+            return (a < b) == ascending
+    return True
+
+def _memory_limit(memory_limit_mb: Optional[int]) -> Optional[int]:
+    """Bytes a tool may use: memory_limit_mb if given, otherwise available memory"""
+    if memory_limit_mb is not None:
+        return int(memory_limit_mb * 1024 * 1024)
+    return available_memory()
+
+def _key_kind(dtype) -> str:
+    """How a key column's values hash: all integer and bool types alike, floats differently"""
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype  # Categoricals hash like their categories
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'integer'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'float'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return 'timedelta'
+    return 'object'
+
+class _HashPartitions:
+    """Arrays spilled to disk by row hash, so matching rows land in the same partition file"""
+
+    def __init__(self, directory: str, partitions: int):
+        self.directory = directory
+        self.partitions = partitions
+
+    def spill(self, name: str, hashes: np.ndarray, values: np.ndarray):
+        partition_ids = hashes % self.partitions
+        for partition in np.unique(partition_ids):
+            with open(os.path.join(self.directory, f"{name}_{partition}.bin"), 'ab') as f:
+                values[partition_ids == partition].tofile(f)
+
+    def load(self, name: str, partition: int, dtype) -> np.ndarray:
+        path = os.path.join(self.directory, f"{name}_{partition}.bin")
+        return np.fromfile(path, dtype=dtype) if os.path.exists(path) else np.empty(0, dtype)
+
+class BloomFilter:
+    """Bit array answering "possibly seen" or "definitely not seen" for 64-bit row hashes.
+
+    Sized for capacity items at the given false positive rate, which takes
+    about 10 bits per item at 1% instead of the 8+ bytes of an exact hash set.
+    The k bit positions are derived from each hash by double hashing.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * np.log(false_positive_rate) / np.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * np.log(2)))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes: np.ndarray):
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        size = np.uint64(self.size)
+        for i in range(self.hash_count):
+            yield (low + np.uint64(i) * high) % size
+
+    def add(self, hashes: np.ndarray):
+        for positions in self._positions(hashes):
+            np.bitwise_or.at(self.bits, positions >> np.uint64(3),
+                             np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+
+    def might_contain(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.ones(len(hashes), dtype=bool)
+        for positions in self._positions(hashes):
+            found &= (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1 == 1
+        return found
+
+@functools.lru_cache(maxsize=256)
+def compiled_pattern(pattern: str) -> re.Pattern:
+    """Compile a regular expression once per process"""
+    return re.compile(pattern)
+
+@functools.lru_cache(maxsize=16)
+def _read_mapping(path: str, modified: int) -> Dict[Any, Any]:
+    if path.lower().endswith('.json'):
+        with open(path) as f:
+            return json.load(f)
+    # First column old values, second column new values
+    table = pd.read_csv(path, keep_default_na=False)
+    return dict(zip(table.iloc[:, 0], table.iloc[:, 1]))
+
+def load_mapping(path: str) -> Dict[Any, Any]:
+    """Old -> new values from a JSON object or a two-column CSV, cached until the file changes"""
+    return _read_mapping(path, os.stat(path).st_mtime_ns)
+
+SAMPLE_METHODS = ('head', 'every', 'reservoir')
+SAMPLE_DEFAULTS = {'method': 'head', 'rows': 10_000, 'step': 100, 'seed': 0}
+
+def sample_batches(batches, method: str = 'head', rows: int = 10_000, step: int = 100,
+                   seed: int = 0) -> Optional[pd.DataFrame]:
+    """Sample up to rows rows from an iterator of frames, or None if it yields none.
+
+    'head' keeps the first rows, 'every' every step-th row from the first, and
+    'reservoir' a uniform random sample of the whole input in input order
+    (the rows with the smallest random keys, drawn with seed). head and every
+    stop reading once they have enough rows.
+    """
+    if method not in SAMPLE_METHODS:
+        raise ValueError(f"Sample method must be one of {', '.join(SAMPLE_METHODS)}: {method}")
+    rng = np.random.default_rng(seed)
+    pieces, keys, positions = [], [], []
+    kept = 0
+    position = 0
+    for batch in batches:
+        if method == 'head':
+            piece = batch.iloc[:rows - kept]
+        elif method == 'every':
+            piece = batch.iloc[(-position) % step::step].iloc[:rows - kept]
+        else:
+            keys.append(rng.random(len(batch)))
+            positions.append(np.arange(position, position + len(batch)))
+            piece = batch
+        position += len(batch)
+        pieces.append(piece)
+        kept += len(piece)
+
+        if method != 'reservoir':
+            if kept >= rows:
+                break
+        elif kept > rows:
+            # Keep the rows with the smallest keys seen so far
+            combined = pd.concat(pieces, ignore_index=True)
+            all_keys, all_positions = np.concatenate(keys), np.concatenate(positions)
+            chosen = np.argpartition(all_keys, rows - 1)[:rows]
+            pieces, keys, positions = [combined.iloc[chosen]], [all_keys[chosen]], [all_positions[chosen]]
+            kept = rows
+
+    if not pieces:
+        return None
+    sample = pd.concat(pieces, ignore_index=True)
+    if method == 'reservoir':
+        sample = sample.iloc[np.argsort(np.concatenate(positions), kind='stable')]
+    return sample.reset_index(drop=True)
+
+def _sqlite_type(dtype) -> str:
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+class ToolStopped(Exception):
+    """Raised by ETLTool.check_stopped once the run is cancelled or the node times out"""
+
 class ETLTool:
     def __init__(self):
         self.input_data = None
+        self.inputs = []  # Outputs of all upstream nodes in connection order; input_data is the first
         self.output_data = None
+        self.spans = []  # (name, category, start, end) timings recorded during execute
+        # JSON-serializable state carried between runs by incremental tools. The
+        # workflow manager sets it before execute and keeps it only if the whole
+        # run succeeds, so tools replace it rather than mutating it in place.
+        self.state = None
+        self.stop_event = None  # Set by the workflow manager when the run is cancelled or times out
+        self.progress = None  # Set by the workflow manager; called with the rows processed so far
+
+    def check_stopped(self):
+        """Raise ToolStopped if the run was cancelled or timed out.
+
+        Python threads cannot be interrupted, so long-running tools call this
+        between chunks and before writing anything.
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise ToolStopped()
+
+    def report_rows(self, rows: int):
+        """Report the rows processed so far, stopping first if the run was cancelled or timed out"""
+        self.check_stopped()
+        if self.progress is not None:
+            self.progress(rows)
+
+    @contextmanager
+    def span(self, name: str, category: str = 'compute'):
+        """Record a named sub-span of execute for run traces"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, category, start, time.perf_counter()))
 
     def execute(self):
         raise NotImplementedError("Each tool must implement execute method")
 
 class InputTool(ETLTool):
-    def __init__(self, file_path: str):
+    TAIL_BYTES = 64  # Bytes before the saved offset used to detect a replaced file
+
+    def __init__(self, file_path: str, incremental: bool = False, file_format: str = 'csv',
+                 table: str = None, query: str = None, batch_size: int = 50_000):
         super().__init__()
         self.file_path = file_path
+        self.incremental = incremental
+        self.file_format = file_format.lower()
+        self.table = table  # SQLite table to read, unless query is given
+        self.query = query
+        self.batch_size = batch_size  # Rows parsed from the CSV or fetched from the SQLite cursor at a time
+        # Design mode sample ({'method', 'rows', 'step', 'seed'}, see sample_batches), set by
+        # the workflow manager; a sampled read leaves incremental state untouched
+        self.sample = None
 
     def execute(self):
-        self.output_data = pd.read_csv(self.file_path)
+        if self.sample is not None:
+            with self.span('read_sample', 'io'):
+                self.output_data = self._read_sample()
+            return self.output_data
+        if self.file_format == 'sqlite':
+            if self.incremental:
+                raise ValueError("Incremental reads are only supported for csv input")
+            with self.span('read_sqlite', 'io'):
+                self.output_data = self._read_sqlite()
+            return self.output_data
+        if self.file_format != 'csv':
+            raise ValueError(f"Unsupported file format: {self.file_format}")
+
+        with self.span('read_csv', 'io'):
+            if self.incremental:
+                self.output_data = self._read_appended()
+            else:
+                self.output_data = self._read_csv(self.file_path)
         return self.output_data
 
+    def _read_csv(self, source):
+        """Parse a CSV in batches of batch_size rows so a run can report progress and be stopped mid-read"""
+        batches = []
+        rows = 0
+        with pd.read_csv(source, chunksize=self.batch_size) as reader:
+            for batch in reader:
+                batches.append(batch)
+                rows += len(batch)
+                self.report_rows(rows)
+        if not batches:  # Header only
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            return pd.read_csv(source, nrows=0)
+        return batches[0] if len(batches) == 1 else pd.concat(batches, ignore_index=True)
+
+    def _read_appended(self):
+        """Read only the rows appended since the last run.
+
+        Only complete (newline-terminated) lines are read, so a row being written
+        while the workflow runs is picked up on the next run. The file is read in
+        full again if its header, size or the bytes before the saved offset no
+        longer match, e.g. after rotation or truncation. The result is marked
+        with attrs['delta']; the workflow manager uses it to tell downstream
+        tools (input_delta) whether they receive appended rows or a full read.
+        """
+        state = self.state or {}
+        with open(self.file_path, 'rb') as f:
+            header = f.readline()
+            offset = state.get('offset', 0)
+            resume = (state.get('file_path') == self.file_path
+                      and state.get('header') == header.hex()
+                      and len(header) <= offset <= os.fstat(f.fileno()).st_size)
+            if resume:
+                tail_start = max(offset - self.TAIL_BYTES, 0)
+                f.seek(tail_start)
+                resume = f.read(offset - tail_start).hex() == state.get('tail')
+            if not resume:
+                offset = len(header)
+            f.seek(offset)
+            body = f.read()
+
+        body = body[:body.rfind(b'\n') + 1]
+        data = self._read_csv(io.BytesIO(header + body))
+        # The saved tail is contiguous with body, so the new tail needs no re-read
+        before = bytes.fromhex(state['tail']) if resume else header
+        tail = (before + body)[-self.TAIL_BYTES:]
+
+        self.state = {
+            'file_path': self.file_path,
+            'header': header.hex(),
+            'offset': offset + len(body),
+            'tail': tail.hex(),
+            'rows': (state.get('rows', 0) if resume else 0) + len(data)
+        }
+        data.attrs['delta'] = resume
+        return data
+
+    def _read_sqlite(self):
+        batches = []
+        rows = 0
+        for batch in self._sqlite_batches():
+            batches.append(batch)
+            rows += len(batch)
+            self.report_rows(rows)
+        return pd.concat(batches, ignore_index=True)
+
+    def _sqlite_batches(self):
+        """Stream the table or query result through a cursor in batches of batch_size rows"""
+        if self.query:
+            sql = self.query
+        elif self.table:
+            sql = f"SELECT * FROM {quote_identifier(self.table)}"
+        else:
+            raise ValueError("SQLite input needs a table or a query")
+
+        # Open read-only so a mistyped path fails instead of creating an empty database
+        uri = f"file:{os.path.abspath(self.file_path)}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            cursor = conn.execute(sql)
+            columns = [description[0] for description in cursor.description]
+            empty = True
+            while True:
+                self.check_stopped()
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                empty = False
+                yield pd.DataFrame.from_records(rows, columns=columns)
+            if empty:
+                yield pd.DataFrame(columns=columns)
+        finally:
+            conn.close()
+
+    def _read_sample(self):
+        """Read a design mode sample instead of the whole input"""
+        sample = {**SAMPLE_DEFAULTS, **self.sample}
+        if self.file_format == 'sqlite':
+            return sample_batches(self._sqlite_batches(), **sample)
+        if self.file_format != 'csv':
+            raise ValueError(f"Unsupported file format: {self.file_format}")
+        if sample['method'] == 'head':
+            return pd.read_csv(self.file_path, nrows=sample['rows'])
+        with pd.read_csv(self.file_path, chunksize=self.batch_size) as reader:
+            data = sample_batches(reader, **sample)
+        return data if data is not None else pd.read_csv(self.file_path, nrows=0)
+
 class SelectTool(ETLTool):
     def __init__(self, columns: List[str], drop_columns: bool = False):
         super().__init__()
@@ -80,38 +474,188 @@ class FormulaTool(ETLTool):
         self.output_data[self.new_column] = self.input_data.eval(self.formula)
         return self.output_data
 
+class SQLTool(ETLTool):
+    """Run a SQL query over the upstream outputs in an embedded DuckDB database.
+
+    Upstream outputs are registered as tables named input1, input2, ... in
+    connection order (the first is also available as input), or as table_names.
+    DuckDB scans the frames in place and runs the query multithreaded; with a
+    memory_limit, large joins and aggregations spill to disk.
+    """
+
+    # DuckDB memory sizes such as '4GB', '512 MB' or '1.5GiB'; the setting is not a bound parameter
+    MEMORY_LIMIT = re.compile(r'\d+(\.\d+)?\s*[KMGT]i?B', re.IGNORECASE)
+
+    def __init__(self, query: str, table_names: List[str] = None, threads: int = None,
+                 memory_limit: str = None):
+        super().__init__()
+        self.query = query
+        self.table_names = table_names
+        self.threads = threads
+        self.memory_limit = memory_limit  # e.g. '4GB'
+
+    def execute(self):
+        if self.memory_limit and not self.MEMORY_LIMIT.fullmatch(str(self.memory_limit).strip()):
+            raise ValueError(f"SQL memory_limit must be a size such as '4GB', not {self.memory_limit!r}")
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("The SQL tool needs DuckDB: pip install duckdb") from None
+
+        inputs = self.inputs or [self.input_data]
+        names = self.table_names or [f"input{i + 1}" for i in range(len(inputs))]
+        if len(names) != len(inputs):
+            raise ValueError(f"SQL node has {len(inputs)} inputs but {len(names)} table names")
+
+        conn = duckdb.connect()
+        try:
+            if self.threads:
+                conn.execute(f"SET threads = {int(self.threads)}")
+            if self.memory_limit:
+                conn.execute(f"SET memory_limit = '{str(self.memory_limit).strip()}'")
+                temp_directory = tempfile.gettempdir().replace("'", "''")
+                conn.execute(f"SET temp_directory = '{temp_directory}'")
+            for name, data in zip(names, inputs):
+                if data is None:
+                    raise ValueError(f"SQL input table '{name}' has no data")
+                conn.register(name, data)
+            if not self.table_names:
+                conn.register('input', inputs[0])
+            with self.span('duckdb_query'):
+                self.output_data = conn.execute(self.query).df()
+        finally:
+            conn.close()
+        return self.output_data
+
 class OutputTool(ETLTool):
-    def __init__(self, file_path: str, file_format: str = 'csv'):
+    def __init__(self, file_path: str, file_format: str = 'csv', append: bool = False,
+                 table: str = None, upsert_keys: List[str] = None):
         super().__init__()
         self.file_path = file_path
         self.file_format = file_format.lower()
+        self.append = append  # Append rows read incrementally instead of rewriting the file
+        self.table = table  # SQLite table to write
+        self.upsert_keys = upsert_keys  # Update SQLite rows with matching keys instead of replacing the table
+        self.sample = None  # Set in design mode, where sampled data is passed through, not written
+        self.input_delta = False  # Set by the workflow manager when the input holds only appended rows
 
     def execute(self):
         if self.input_data is None:
             return None
+        if self.sample is not None:
+            self.output_data = self.input_data
+            return self.output_data
 
-        if self.file_format == 'csv':
-            self.input_data.to_csv(self.file_path, index=False)
-        elif self.file_format == 'excel':
-            self.input_data.to_excel(self.file_path, index=False)
-        elif self.file_format == 'json':
-            self.input_data.to_json(self.file_path, orient='records')
-        else:
-            raise ValueError(f"Unsupported file format: {self.file_format}")
+        # Only a delta from an incremental Input is appended; a full read replaces the file
+        append = self.append and self.input_delta and os.path.exists(self.file_path)
+        if self.append and self.file_format not in ('csv', 'sqlite'):
+            raise ValueError(f"Appending is only supported for csv and sqlite output, not {self.file_format}")
+
+        self.check_stopped()
+        with self.span(f'write_{self.file_format}', 'io'):
+            if self.file_format == 'sqlite':
+                self._write_sqlite(append)
+            elif append:
+                self.input_data.to_csv(self.file_path, mode='a', header=False, index=False)
+            elif self.file_format == 'csv':
+                self.input_data.to_csv(self.file_path, index=False)
+            elif self.file_format == 'excel':
+                self.input_data.to_excel(self.file_path, index=False)
+            elif self.file_format == 'json':
+                self.input_data.to_json(self.file_path, orient='records')
+            else:
+                raise ValueError(f"Unsupported file format: {self.file_format}")
 
         self.output_data = self.input_data
         return self.output_data
 
+    def _write_sqlite(self, append: bool):
+        """Load the input into a SQLite table with one bulk insert in a single transaction.
+
+        The table is replaced unless appending or upserting. With upsert_keys,
+        rows whose keys already exist are updated in place.
+        """
+        if not self.table:
+            raise ValueError("SQLite output needs a table")
+
+        data = self.input_data
+        # sqlite3 cannot bind timestamps; store them as ISO 8601 text
+        datetime_columns = data.select_dtypes(include=['datetime', 'datetimetz']).columns
+        if len(datetime_columns):
+            data = data.copy()
+            for column in datetime_columns:
+                data[column] = data[column].map(lambda value: None if pd.isna(value) else value.isoformat())
+
+        table = quote_identifier(self.table)
+        columns = [quote_identifier(column) for column in data.columns]
+        declarations = ", ".join(f"{column} {_sqlite_type(dtype)}"
+                                 for column, dtype in zip(columns, data.dtypes))
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        if self.upsert_keys:
+            keys = [quote_identifier(key) for key in self.upsert_keys]
+            updates = [f"{column} = excluded.{column}" for column in columns if column not in keys]
+            action = f"UPDATE SET {', '.join(updates)}" if updates else "NOTHING"
+            sql += f" ON CONFLICT ({', '.join(keys)}) DO {action}"
+
+        # sqlite3 cannot bind pd.NA or the NumPy scalars of nullable extension
+        # columns (Int64, boolean, string); bind Python values and None instead
+        nullable_columns = [column for column, dtype in data.dtypes.items()
+                            if isinstance(dtype, pd.api.extensions.ExtensionDtype)]
+        if nullable_columns:
+            data = data.copy()
+            for column in nullable_columns:
+                data[column] = data[column].astype(object).where(data[column].notna(), None)
+
+        # Autocommit mode, so the transaction below is managed explicitly
+        conn = sqlite3.connect(self.file_path, isolation_level=None)
+        try:
+            # Applies to this loading connection only; the database's journal mode is left as it is
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("BEGIN")
+            try:
+                if not append and not self.upsert_keys:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({declarations})")
+                if self.upsert_keys:
+                    index = quote_identifier(f"{self.table}_upsert_keys")
+                    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({', '.join(keys)})")
+                conn.executemany(sql, data.itertuples(index=False, name=None))
+                self.check_stopped()  # Roll back rather than commit a load that ran past its run
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
 class AggregateTool(ETLTool):
-    def __init__(self, aggregations: Dict[str, List[str]], group_by: Optional[str] = None):
+    # Partial aggregates that combine across runs, per aggregation function
+    PARTIALS = {
+        'sum': ('sum',),
+        'count': ('count',),
+        'min': ('min',),
+        'max': ('max',),
+        'mean': ('sum', 'count')
+    }
+    # How partials of the same group are combined
+    MERGE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+    def __init__(self, aggregations: Dict[str, List[str]], group_by: Optional[str] = None,
+                 incremental: bool = False):
         super().__init__()
         self.aggregations = aggregations  # Dict of column name to list of aggregation functions
         self.group_by = group_by
+        self.incremental = incremental  # Merge appended rows into partial aggregates kept in state
+        self.input_delta = False  # Set by the workflow manager when the input holds only appended rows
 
     def execute(self):
         if self.input_data is None:
             return None
 
+        if self.incremental:
+            self.output_data = self._aggregate_incremental()
+            return self.output_data
+
         # Create a copy of the input data
         result = self.input_data.copy()
 
@@ -146,4 +690,840 @@ class AggregateTool(ETLTool):
         if self.group_by:
             self.output_data.reset_index(inplace=True)
             
-        return self.output_data 
\ No newline at end of file
+        return self.output_data 
+
+    def _aggregate_incremental(self):
+        """Aggregate a delta by merging it into the partial aggregates of earlier runs.
+
+        Partials (sums, counts, minimums, maximums) are kept per group in state;
+        means are derived from sums and counts. They are rebuilt from scratch
+        when the input is a full read or the configuration has changed.
+        """
+        for column, functions in self.aggregations.items():
+            for func in functions:
+                if func not in self.PARTIALS:
+                    raise ValueError(f"Aggregation '{func}' cannot be computed incrementally")
+
+        partial_columns = {}
+        for column, functions in self.aggregations.items():
+            for func in functions:
+                for part in self.PARTIALS[func]:
+                    partial_columns[f"{column}_{part}"] = (column, part)
+
+        keys = self.group_by or (lambda _: 0)
+        partials = self.input_data.groupby(keys).agg(**partial_columns)
+
+        config = {'aggregations': self.aggregations, 'group_by': self.group_by}
+        state = self.state or {}
+        if self.input_delta and state.get('config') == config:
+            previous = pd.DataFrame(**state['partials'])
+            combined = pd.concat([previous, partials])
+            merge = {name: self.MERGE[part] for name, (_, part) in partial_columns.items()}
+            partials = combined.groupby(level=0).agg(merge)
+
+        self.state = {'config': config, 'partials': partials.to_dict(orient='split')}
+
+        output = {}
+        for column, functions in self.aggregations.items():
+            for func in functions:
+                if func == 'mean':
+                    output[f"{column}_mean"] = partials[f"{column}_sum"] / partials[f"{column}_count"]
+                else:
+                    output[f"{column}_{func}"] = partials[f"{column}_{func}"]
+        result = pd.DataFrame(output)
+        if self.group_by:
+            result.index.name = self.group_by
+            return result.reset_index()
+        return result.reset_index(drop=True)
+
+class SortTool(ETLTool):
+    ORDER_COLUMN = '__sort_order__'  # Input position, the final key so the sort is stable
+    MIN_BLOCK_ROWS = 10_000  # Fewer, larger merge steps; blocks hold only sort keys
+
+    def __init__(self, columns: List[str], ascending=True, limit: Optional[int] = None,
+                 memory_limit_mb: Optional[int] = None, chunk_rows: int = 1_000_000):
+        super().__init__()
+        self.columns = columns
+        self.ascending = ascending  # One bool for all columns or one per column
+        self.limit = limit  # Keep only the first rows of the sorted result
+        self.memory_limit_mb = memory_limit_mb  # Sort externally above this; default is available memory
+        self.chunk_rows = chunk_rows  # Rows per sorted run when sorting externally
+
+    def execute(self):
+        if self.input_data is None:
+            return None
+
+        ascending = self.ascending
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(self.columns)
+        if len(ascending) != len(self.columns):
+            raise ValueError("Sort needs one ascending flag per column")
+
+        if self.limit is not None:
+            with self.span('top_n'):
+                self.output_data = self._top_n(self.input_data, ascending)
+        elif self._fits_in_memory(self.input_data):
+            with self.span('sort'):
+                self.output_data = self.input_data.sort_values(
+                    self.columns, ascending=ascending, kind='stable', na_position='last')
+        else:
+            self.output_data = self._external_sort(self.input_data, ascending)
+        return self.output_data
+
+    def _top_n(self, data, ascending):
+        """The first limit rows of the sorted input, without sorting all of it.
+
+        Rows that can reach the top by their first sort column are selected
+        with nsmallest/nlargest (a partial selection), keeping ties, and only
+        those candidates are sorted.
+        """
+        if self.limit <= 0:
+            return data.iloc[:0]
+        key = data[self.columns[0]]
+        selectable = ((pd.api.types.is_numeric_dtype(key) and not pd.api.types.is_bool_dtype(key))
+                      or pd.api.types.is_datetime64_any_dtype(key))
+        if selectable and key.count() > self.limit:
+            if ascending[0]:
+                threshold = key.nsmallest(self.limit).iloc[-1]
+                data = data[key <= threshold]
+            else:
+                threshold = key.nlargest(self.limit).iloc[-1]
+                data = data[key >= threshold]
+        return data.sort_values(self.columns, ascending=ascending, kind='stable',
+                                na_position='last').head(self.limit)
+
+    def _fits_in_memory(self, data) -> bool:
+        # Sorting needs roughly the sorted copy plus key arrays on top of the input
+        needed = int(data.memory_usage(index=True).sum()) * 2
+        if self.memory_limit_mb is not None:
+            return needed <= self.memory_limit_mb * 1024 * 1024
+        free = available_memory()
+        return free is None or needed <= free
+
+    def _external_sort(self, data, ascending):
+        """Sort the key columns in runs of chunk_rows spilled to disk, merge the runs, then take rows.
+
+        Runs hold only the sort keys and each row's input position, split into
+        blocks so the merge holds about one run's worth of keys in memory
+        (at least MIN_BLOCK_ROWS per run) however many runs there are. The input and the sorted result are still
+        frames in memory: this bounds the working memory of the sort itself.
+        """
+        keys = self.columns + [self.ORDER_COLUMN]
+        directions = list(ascending) + [True]
+        run_count = max(1, -(-len(data) // self.chunk_rows))
+        block_rows = max(self.MIN_BLOCK_ROWS, self.chunk_rows // run_count)
+
+        with tempfile.TemporaryDirectory(prefix='etl-sort-') as spill_dir:
+            runs = []
+            with self.span('sort_runs'):
+                for run_index, start in enumerate(range(0, len(data), self.chunk_rows)):
+                    self.check_stopped()
+                    stop = min(start + self.chunk_rows, len(data))
+                    run = data[self.columns].iloc[start:stop].assign(**{self.ORDER_COLUMN: np.arange(start, stop)})
+                    run = run.sort_values(keys, ascending=directions, na_position='last')
+                    blocks = deque()
+                    for block_start in range(0, len(run), block_rows):
+                        path = os.path.join(spill_dir, f"run{run_index}_{block_start}.pkl")
+                        run.iloc[block_start:block_start + block_rows].to_pickle(path)
+                        blocks.append(path)
+                    runs.append(blocks)
+                run = None
+
+            with self.span('merge_runs'):
+                pieces = list(self._merge_runs(runs, keys, directions))
+
+        with self.span('take'):
+            return data.iloc[np.concatenate(pieces)] if pieces else data.iloc[:0]
+
+    def _merge_runs(self, runs, keys, directions):
+        """k-way merge of sorted runs, yielding input positions in sorted order.
+
+        Each step takes the smallest last row among the loaded blocks of runs
+        with blocks still on disk as the cutoff: every row not loaded yet sorts
+        after it. The rows up to the cutoff are found in each loaded block by
+        binary search and only those are sorted and emitted, so each row is
+        sorted once, and only runs whose block is used up load another.
+        """
+        def load(run_index):
+            block = pd.read_pickle(runs[run_index].popleft())
+            arrays = _sort_key_arrays(block, keys)
+            # Loaded block, its key values and missing masks, and the first row not emitted yet
+            return [block, arrays, [pd.isna(array) for array in arrays], 0]
+
+        def row(state, position):
+            _, arrays, masks, _ = state
+            return tuple((mask[position], array[position]) for array, mask in zip(arrays, masks))
+
+        def emit(blocks):
+            merged = pd.concat(blocks).sort_values(keys, ascending=directions, kind='stable',
+                                                   na_position='last')
+            return merged[self.ORDER_COLUMN].to_numpy()
+
+        loaded = {run_index: load(run_index) for run_index in range(len(runs)) if runs[run_index]}
+        while True:
+            pending = [run_index for run_index in loaded if runs[run_index]]
+            if not pending:
+                break
+            cutoff = None
+            for run_index in pending:
+                last = row(loaded[run_index], -1)
+                if cutoff is None or not _sorts_before_or_equal(cutoff, last, directions):
+                    cutoff = last
+
+            emitted = []
+            for run_index, state in list(loaded.items()):
+                block, _, _, offset = state
+                low, high = offset, len(block)
+                while low < high:
+                    middle = (low + high) // 2
+                    if _sorts_before_or_equal(row(state, middle), cutoff, directions):
+                        low = middle + 1
+                    else:
+                        high = middle
+                if low > offset:
+                    emitted.append(block.iloc[offset:low])
+                state[3] = low
+                if low == len(block):
+                    if runs[run_index]:
+                        loaded[run_index] = load(run_index)
+                    else:
+                        del loaded[run_index]
+            yield emit(emitted)
+
+        if loaded:
+            yield emit([state[0].iloc[state[3]:] for state in loaded.values()])
+
+class SetOperationTool(ETLTool):
+    """Base for set operations over two or more inputs, comparing rows by 64-bit hashes.
+
+    Rows are compared on columns (all columns of the first input by default).
+    The first input is probed in chunks of chunk_rows against the hashes of
+    the other inputs. If those do not fit in memory (or memory_limit_mb), both
+    sides are hash-partitioned to disk and matched one partition at a time.
+    """
+
+    MAX_PARTITIONS = 256
+
+    def __init__(self, columns: List[str] = None, distinct: bool = True,
+                 chunk_rows: int = 1_000_000, memory_limit_mb: Optional[int] = None):
+        super().__init__()
+        self.columns = columns
+        self.distinct = distinct  # Drop duplicate rows from the result, as in SQL
+        self.chunk_rows = chunk_rows
+        self.memory_limit_mb = memory_limit_mb
+        self._casts = {}  # Key column -> dtype to hash it as, set from the inputs
+
+    def _frames(self) -> List[pd.DataFrame]:
+        """The inputs, after choosing the casts that make their keys hash alike"""
+        frames = self.inputs or [self.input_data]
+        if len(frames) < 2:
+            raise ValueError(f"{type(self).__name__} needs at least two inputs")
+        if any(frame is None for frame in frames):
+            raise ValueError(f"{type(self).__name__} input has no data")
+        self._casts = self._key_casts(frames)
+        return frames
+
+    def _key_columns(self, frame: pd.DataFrame) -> List[str]:
+        return self.columns or list(frame.columns)
+
+    def _key_casts(self, frames: List[pd.DataFrame]) -> Dict[str, str]:
+        """Key column -> dtype to hash it as, so equal keys of different dtypes match.
+
+        Hashes depend on dtype: 1 as int64 and 1.0 as float64 hash differently.
+        Integer and float keys are hashed as float64; other mismatches, such as
+        numbers against strings, are rejected. Inputs without rows are ignored.
+        """
+        casts = {}
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return casts
+        for column in self._key_columns(frames[0]):
+            dtypes = [frame[column].dtype for frame in frames]
+            kinds = {_key_kind(dtype) for dtype in dtypes}
+            if kinds == {'integer', 'float'}:
+                casts[column] = 'float64'
+            elif len(kinds) > 1:
+                raise ValueError(f"{type(self).__name__} column {column!r} has incompatible types "
+                                 f"across inputs ({', '.join(map(str, dtypes))}); "
+                                 f"convert them to a common type first")
+        return casts
+
+    def _hashes(self, frame: pd.DataFrame, columns: List[str]) -> np.ndarray:
+        data = frame[columns]
+        if self._casts:
+            data = data.astype(self._casts)
+        return row_hashes(data)
+
+    def _chunks(self, frame: pd.DataFrame):
+        for start in range(0, len(frame), self.chunk_rows):
+            self.check_stopped()
+            yield start, frame.iloc[start:start + self.chunk_rows]
+
+    def _distinct(self, frame: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        if not self.distinct or frame.empty:
+            return frame
+        return frame[~pd.Series(self._hashes(frame, columns)).duplicated().to_numpy()]
+
+    def _match_counts(self, probe: pd.DataFrame, builds: List[pd.DataFrame]) -> np.ndarray:
+        """For each probe row, the number of build inputs containing its key"""
+        columns = self._key_columns(probe)
+        # A sorted hash array costs 8 bytes per build row; sorting needs about twice that
+        needed = sum(len(build) for build in builds) * 16
+        limit = _memory_limit(self.memory_limit_mb)
+        if limit is not None and needed > limit:
+            partitions = min(self.MAX_PARTITIONS, needed // max(limit, 1) + 2)
+            return self._match_counts_partitioned(probe, builds, columns, partitions)
+
+        with self.span('build'):
+            build_hashes = [np.unique(self._hashes(build, columns)) for build in builds]
+        counts = np.zeros(len(probe), dtype=np.int32)
+        with self.span('probe'):
+            for start, chunk in self._chunks(probe):
+                hashes = self._hashes(chunk, columns)
+                for build in build_hashes:
+                    counts[start:start + len(chunk)] += _contains(build, hashes)
+        return counts
+
+    def _match_counts_partitioned(self, probe, builds, columns, partitions: int) -> np.ndarray:
+        """_match_counts with both sides hash-partitioned to disk, one partition in memory at a time"""
+        counts = np.zeros(len(probe), dtype=np.int32)
+        with tempfile.TemporaryDirectory(prefix='etl-setop-') as spill_dir:
+            spilled = _HashPartitions(spill_dir, partitions)
+            with self.span('partition', 'io'):
+                for index, build in enumerate(builds):
+                    for _, chunk in self._chunks(build):
+                        hashes = self._hashes(chunk, columns)
+                        spilled.spill(f"build{index}", hashes, hashes)
+                for start, chunk in self._chunks(probe):
+                    hashes = self._hashes(chunk, columns)
+                    spilled.spill("probe_hash", hashes, hashes)
+                    spilled.spill("probe_row", hashes, np.arange(start, start + len(chunk), dtype=np.int64))
+
+            with self.span('probe'):
+                for partition in range(partitions):
+                    hashes = spilled.load("probe_hash", partition, np.uint64)
+                    if len(hashes) == 0:
+                        continue
+                    rows = spilled.load("probe_row", partition, np.int64)
+                    for index in range(len(builds)):
+                        build = spilled.load(f"build{index}", partition, np.uint64)
+                        counts[rows] += _contains(np.unique(build), hashes)
+        return counts
+
+class UnionTool(SetOperationTool):
+    """All rows of all inputs; with distinct, each row once (SQL UNION vs UNION ALL)"""
+
+    def execute(self):
+        frames = self._frames()
+        combined = pd.concat(frames, ignore_index=True)
+        with self.span('distinct'):
+            self.output_data = self._distinct(combined, self._key_columns(combined))
+        return self.output_data
+
+class IntersectTool(SetOperationTool):
+    """Rows of the first input whose key appears in every other input (SQL INTERSECT)"""
+
+    def execute(self):
+        probe, *builds = self._frames()
+        counts = self._match_counts(probe, builds)
+        self.output_data = self._distinct(probe[counts == len(builds)], self._key_columns(probe))
+        return self.output_data
+
+class DifferenceTool(SetOperationTool):
+    """Rows of the first input whose key appears in none of the other inputs (SQL EXCEPT)"""
+
+    def execute(self):
+        probe, *builds = self._frames()
+        counts = self._match_counts(probe, builds)
+        self.output_data = self._distinct(probe[counts == 0], self._key_columns(probe))
+        return self.output_data
+
+class DeduplicateTool(ETLTool):
+    """Drop rows whose key columns repeat an earlier (or later) row, comparing 64-bit row hashes.
+
+    keep='first' or 'last' keeps one row of each duplicate group; keep='none'
+    drops every row that has a duplicate. When the hash table would not fit
+    in memory (or memory_limit_mb), row hashes are partitioned to disk and
+    deduplicated one partition at a time. With bloom_filter, a Bloom filter
+    pass first finds the rows that may have duplicates, and only their hashes
+    are compared exactly, which needs far less memory when duplicates are rare.
+    The result is exact either way and keeps the input row order.
+    """
+
+    KEEP = {'first': 'first', 'last': 'last', 'none': False}
+    MAX_PARTITIONS = 256
+
+    def __init__(self, columns: List[str] = None, keep: str = 'first', bloom_filter: bool = False,
+                 false_positive_rate: float = 0.01, chunk_rows: int = 1_000_000,
+                 memory_limit_mb: Optional[int] = None):
+        super().__init__()
+        if keep not in self.KEEP:
+            raise ValueError(f"keep must be one of {', '.join(self.KEEP)}: {keep}")
+        self.columns = columns  # Key columns; all columns by default
+        self.keep = keep
+        self.bloom_filter = bloom_filter
+        self.false_positive_rate = false_positive_rate
+        self.chunk_rows = chunk_rows
+        self.memory_limit_mb = memory_limit_mb
+
+    def execute(self):
+        if self.input_data is None:
+            return None
+        data = self.input_data
+        if self.bloom_filter:
+            kept = self._kept_rows_bloom(data)
+        else:
+            # Hashes, row ids and the hash table cost about 32 bytes per row
+            limit = _memory_limit(self.memory_limit_mb)
+            needed = len(data) * 32
+            if limit is not None and needed > limit:
+                partitions = min(self.MAX_PARTITIONS, needed // max(limit, 1) + 2)
+                kept = self._kept_rows_partitioned(data, partitions)
+            else:
+                with self.span('hash'):
+                    hashes = row_hashes(data, self.columns)
+                with self.span('deduplicate'):
+                    kept = np.flatnonzero(~self._duplicated(hashes))
+        self.output_data = data.iloc[kept]
+        return self.output_data
+
+    def _chunks(self, data: pd.DataFrame):
+        for start in range(0, len(data), self.chunk_rows):
+            self.check_stopped()
+            yield start, data.iloc[start:start + self.chunk_rows]
+
+    def _duplicated(self, hashes: np.ndarray) -> np.ndarray:
+        return pd.Series(hashes).duplicated(keep=self.KEEP[self.keep]).to_numpy()
+
+    def _kept_rows_partitioned(self, data: pd.DataFrame, partitions: int) -> np.ndarray:
+        """Positions of the rows to keep, deduplicating one hash partition at a time.
+
+        Rows are spilled in input order, so each partition's rows stay in
+        order and first/last mean the same within it as in the whole input.
+        """
+        kept = []
+        with tempfile.TemporaryDirectory(prefix='etl-dedup-') as spill_dir:
+            spilled = _HashPartitions(spill_dir, partitions)
+            with self.span('partition', 'io'):
+                for start, chunk in self._chunks(data):
+                    hashes = row_hashes(chunk, self.columns)
+                    spilled.spill("hash", hashes, hashes)
+                    spilled.spill("row", hashes, np.arange(start, start + len(chunk), dtype=np.int64))
+            with self.span('deduplicate'):
+                for partition in range(partitions):
+                    hashes = spilled.load("hash", partition, np.uint64)
+                    if len(hashes):
+                        rows = spilled.load("row", partition, np.int64)
+                        kept.append(rows[~self._duplicated(hashes)])
+        return np.sort(np.concatenate(kept)) if kept else np.empty(0, dtype=np.int64)
+
+    def _kept_rows_bloom(self, data: pd.DataFrame) -> np.ndarray:
+        """Positions of the rows to keep, comparing exactly only hashes a Bloom filter has seen twice.
+
+        A hash that occurs more than once always tests positive from its
+        second occurrence on, so rows whose hash never tested positive are
+        unique; false positives are resolved by the exact comparison.
+        """
+        bloom = BloomFilter(len(data), self.false_positive_rate)
+        candidates = []
+        with self.span('bloom_filter'):
+            for _, chunk in self._chunks(data):
+                hashes = row_hashes(chunk, self.columns)
+                seen = bloom.might_contain(hashes) | pd.Series(hashes).duplicated().to_numpy()
+                candidates.append(hashes[seen])
+                bloom.add(hashes)
+        del bloom
+        candidates = np.unique(np.concatenate(candidates)) if candidates else np.empty(0, np.uint64)
+
+        keep = np.ones(len(data), dtype=bool)
+        if len(candidates):
+            with self.span('deduplicate'):
+                rows, hashes = [], []
+                for start, chunk in self._chunks(data):
+                    chunk_hashes = row_hashes(chunk, self.columns)
+                    matched = np.flatnonzero(_contains(candidates, chunk_hashes))
+                    rows.append(matched + start)
+                    hashes.append(chunk_hashes[matched])
+                rows, hashes = np.concatenate(rows), np.concatenate(hashes)
+                keep[rows[self._duplicated(hashes)]] = False
+        return np.flatnonzero(keep)
+
+class ReplaceTool(ETLTool):
+    """Replace values in columns by a mapping of old to new values and by regular expressions.
+
+    Each column is dictionary-encoded (categorical columns already are), the
+    replacements are applied once per distinct value, and the new values are
+    gathered back by code. Columns with many repeated values, such as labels
+    and codes, are remapped in one vectorized pass instead of per row.
+    """
+
+    def __init__(self, columns: List[str] = None, mapping: Dict[Any, Any] = None,
+                 mapping_file: str = None, regex: Dict[str, str] = None):
+        super().__init__()
+        self.columns = columns  # Columns to replace in; all columns by default
+        self.mapping = mapping or {}
+        self.mapping_file = mapping_file  # JSON object or two-column CSV, merged under mapping
+        self.regex = regex or {}  # Pattern -> replacement, applied in order to string values
+
+    def execute(self):
+        if self.input_data is None:
+            return None
+
+        mapping = self.mapping
+        if self.mapping_file:
+            with self.span('load_mapping', 'io'):
+                mapping = {**load_mapping(self.mapping_file), **mapping}
+        patterns = [(compiled_pattern(pattern), replacement) for pattern, replacement in self.regex.items()]
+
+        columns = self.columns or list(self.input_data.columns)
+        missing = [column for column in columns if column not in self.input_data.columns]
+        if missing:
+            raise KeyError(f"Replace columns not in input: {', '.join(map(str, missing))}")
+
+        with self.span('replace'):
+            typed = {}  # Column dtype -> mapping with keys converted to it
+            replaced = {}
+            for column in columns:
+                values = self.input_data[column]
+                dtype = values.cat.categories.dtype if isinstance(values.dtype, pd.CategoricalDtype) else values.dtype
+                if dtype not in typed:
+                    typed[dtype] = self._typed_mapping(mapping, dtype)
+                replaced[column] = self._replace_column(values, typed[dtype], patterns)
+        self.output_data = self.input_data.assign(**replaced)
+        return self.output_data
+
+    @staticmethod
+    def _typed_mapping(mapping: Dict[Any, Any], dtype) -> Dict[Any, Any]:
+        """The mapping with text keys converted to a numeric, boolean or datetime column's type.
+
+        Keys read from JSON are always strings, so {"1": "one"} would otherwise
+        never match the integer 1. Keys that do not convert cannot match such
+        a column and are dropped; keys already of another type take precedence.
+        """
+        if not mapping:
+            return mapping
+        if pd.api.types.is_bool_dtype(dtype):
+            convert = {'true': True, 'false': False}.get
+        elif pd.api.types.is_numeric_dtype(dtype):
+            convert = lambda key: pd.to_numeric(key, errors='coerce')
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            convert = lambda key: pd.to_datetime(key, errors='coerce')
+        else:
+            return mapping
+        typed = {}
+        for key, value in mapping.items():
+            if isinstance(key, str):
+                key = convert(key.strip().lower() if pd.api.types.is_bool_dtype(dtype) else key)
+                if key is None or pd.isna(key):
+                    continue
+            typed.setdefault(key, value)
+        # Keys given with their own type win over converted text keys
+        typed.update({key: value for key, value in mapping.items() if not isinstance(key, str)})
+        return typed
+
+    @staticmethod
+    def _replace_values(values: pd.Series, mapping, patterns) -> pd.Series:
+        """Apply the mapping, then the patterns, to a series of distinct values"""
+        if mapping:
+            found = values.isin(list(mapping)).to_numpy()
+            if found.any():
+                mapped = values.to_numpy(dtype=object, copy=True)
+                mapped[found] = values[found].map(mapping).to_numpy(dtype=object)
+                values = pd.Series(mapped).infer_objects()
+        if patterns and (values.dtype == object or pd.api.types.is_string_dtype(values)):
+            strings = values.map(lambda value: isinstance(value, str))
+            if strings.any():
+                text = values[strings]
+                for pattern, replacement in patterns:
+                    text = text.str.replace(pattern, replacement, regex=True)
+                values = values.astype(object)
+                values[strings] = text
+        return values
+
+    def _replace_column(self, column: pd.Series, mapping, patterns) -> pd.Series:
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            categories = pd.Series(column.cat.categories)
+            replaced = self._replace_values(categories, mapping, patterns)
+            if replaced.equals(categories):
+                return column
+            # Replacements may merge categories, so re-encode the new values
+            new_codes, new_categories = pd.factorize(replaced)
+            codes = column.cat.codes.to_numpy()
+            codes = np.where(codes >= 0, new_codes[codes], -1)
+            return pd.Series(pd.Categorical.from_codes(codes, new_categories), index=column.index,
+                             name=column.name)
+
+        codes, uniques = pd.factorize(column)
+        distinct = pd.Series(uniques)
+        replaced = self._replace_values(distinct, mapping, patterns)
+        if replaced.equals(distinct):
+            return column
+        result = pd.Series(replaced.to_numpy()[codes], index=column.index, name=column.name)
+        missing = codes < 0
+        if missing.any():
+            result = result.mask(missing, column)
+        return result.infer_objects()
+
+class WindowTool(ETLTool):
+    """Window functions over partitions of rows, keeping one output row per input row.
+
+    The input is sorted once by partition_by and order_by, every function is
+    computed with vectorized groupby transforms on the sorted rows, and the
+    results are put back in input order. Each entry of windows is a dict with
+    'function' and, depending on it, 'column', 'output', 'offset', 'default',
+    'window', 'min_periods' and 'aggregate' (for rolling and expanding).
+    """
+
+    RANKINGS = ('row_number', 'rank', 'dense_rank')
+    CUMULATIVE = ('cumsum', 'cumprod', 'cummax', 'cummin', 'cumcount')
+    OFFSETS = ('lag', 'lead')
+    FRAMES = ('rolling', 'expanding')
+    FUNCTIONS = RANKINGS + CUMULATIVE + OFFSETS + FRAMES
+
+    def __init__(self, windows: List[Dict[str, Any]], partition_by: List[str] = None,
+                 order_by: List[str] = None, ascending=True):
+        super().__init__()
+        self.windows = windows
+        self.partition_by = partition_by or []
+        self.order_by = order_by or []
+        self.ascending = ascending  # One bool for all order_by columns or one per column
+        for window in windows:
+            if window.get('function') not in self.FUNCTIONS:
+                raise ValueError(f"Unknown window function: {window.get('function')}")
+            if window['function'] not in self.RANKINGS and window['function'] != 'cumcount' \
+                    and not window.get('column'):
+                raise ValueError(f"Window function {window['function']} needs a column")
+            if window['function'] == 'rolling' and not window.get('window'):
+                raise ValueError("Window function rolling needs a window size (rows per frame)")
+        if any(window['function'] in ('rank', 'dense_rank') for window in windows) and not self.order_by:
+            raise ValueError("rank and dense_rank need order_by columns")
+
+    def execute(self):
+        if self.input_data is None:
+            return None
+
+        ascending = self.ascending
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(self.order_by)
+        if len(ascending) != len(self.order_by):
+            raise ValueError("Window needs one ascending flag per order_by column")
+
+        with self.span('sort'):
+            keys = self.partition_by + self.order_by
+            ordered = self.input_data.reset_index(drop=True)
+            if keys:
+                ordered = ordered.sort_values(keys, ascending=[True] * len(self.partition_by) + ascending,
+                                              kind='stable', na_position='last')
+            positions = ordered.index.to_numpy()
+            ordered = ordered.reset_index(drop=True)
+
+        with self.span('window'):
+            grouped = ordered.groupby(self.partition_by, sort=False, dropna=False) if self.partition_by else None
+            results = {}
+            for window in self.windows:
+                name = window.get('output') or '_'.join(filter(None, [window.get('column'), window['function']]))
+                values = self._compute(window, ordered, grouped).to_numpy()
+                results[name] = np.empty_like(values)
+                results[name][positions] = values
+        self.output_data = self.input_data.assign(**results)
+        return self.output_data
+
+    def _partitioned(self, ordered: pd.DataFrame, grouped, values: pd.Series):
+        """values grouped like the rows, or as one partition without partition_by"""
+        if grouped is None:
+            return values
+        return values.groupby([ordered[column] for column in self.partition_by], sort=False, dropna=False)
+
+    def _peer_starts(self, ordered: pd.DataFrame) -> pd.Series:
+        """True where a row starts a partition or differs from the previous row in order_by"""
+        starts = pd.Series(False, index=ordered.index)
+        if len(ordered):
+            starts.iloc[0] = True
+        for column in self.partition_by + self.order_by:
+            values = ordered[column]
+            previous = values.shift()
+            same = (values == previous) | (values.isna() & previous.isna())
+            starts |= ~same
+        return starts
+
+    def _compute(self, window: Dict[str, Any], ordered: pd.DataFrame, grouped) -> pd.Series:
+        function = window['function']
+        column = window.get('column')
+
+        if function in self.RANKINGS or function == 'cumcount':
+            row_number = (grouped.cumcount() if grouped is not None
+                          else pd.Series(np.arange(len(ordered)), index=ordered.index)) + 1
+            if function == 'cumcount':
+                return row_number - 1
+            if function == 'row_number':
+                return row_number
+            starts = self._peer_starts(ordered)
+            if function == 'dense_rank':
+                return self._partitioned(ordered, grouped, starts.astype(np.int64)).cumsum()
+            # Rank is the row number of the first row among equal order_by values
+            return self._partitioned(ordered, grouped, row_number.where(starts, 0)).cummax()
+
+        values = self._partitioned(ordered, grouped, ordered[column])
+        if function in self.CUMULATIVE:
+            return getattr(values, function)()
+        if function in self.OFFSETS:
+            offset = window.get('offset', 1)
+            periods = offset if function == 'lag' else -offset
+            shifted = values.shift(periods)
+            if window.get('default') is not None:
+                # Only rows shifted past the partition edge get the default, not
+                # rows whose source value is itself missing
+                if grouped is not None:
+                    position = grouped.cumcount(ascending=periods >= 0)
+                else:
+                    position = pd.Series(np.arange(len(ordered)), index=ordered.index)
+                    if periods < 0:
+                        position = position.iloc[::-1].set_axis(ordered.index)
+                shifted = shifted.where(position >= abs(periods), window['default'])
+            return shifted
+
+        aggregate = window.get('aggregate', 'mean')
+        if function == 'rolling':
+            frame = values.rolling(window['window'], min_periods=window.get('min_periods'))
+        else:
+            frame = values.expanding(min_periods=window.get('min_periods', 1))
+        result = frame.agg(aggregate)
+        if grouped is not None:
+            # Grouped rolling results are indexed by partition keys, then row
+            result = result.reset_index(level=list(range(len(self.partition_by))), drop=True)
+        return result.reindex(ordered.index)
+
+@functools.lru_cache(maxsize=None)
+def load_function(path: str, jit: bool = False):
+    """Import a function given as 'module:name' or 'path/to/file.py:name', once per process.
+
+    With jit, the function is compiled with Numba on first use.
+    """
+    module_name, _, attribute = path.rpartition(':')
+    if not module_name or not attribute:
+        raise ValueError(f"Function must look like module:name or file.py:name: {path}")
+    if module_name.endswith('.py'):
+        spec = importlib.util.spec_from_file_location(
+            os.path.splitext(os.path.basename(module_name))[0], module_name)
+        if spec is None:
+            raise ImportError(f"Cannot load functions from {module_name}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_name)
+    function = module
+    for name in attribute.split('.'):
+        function = getattr(function, name)
+    if jit:
+        try:
+            import numba
+        except ImportError:
+            raise ImportError("JIT-compiled transforms need Numba: pip install numba") from None
+        function = numba.njit(cache=True)(function)
+    return function
+
+def _transform_batch(batch: pd.DataFrame, function_path: str, arguments: Dict[str, Any],
+                     batch_format: str, columns: Optional[List[str]], output: Optional[List[str]],
+                     jit: bool) -> pd.DataFrame:
+    """Apply a transform function to one batch; runs in worker processes"""
+    function = load_function(function_path, jit)
+    if columns:
+        # Array function: the named columns in as arrays, output column arrays back
+        result = function(*(batch[column].to_numpy() for column in columns), **arguments)
+        if not isinstance(result, tuple):
+            result = (result,)
+        if len(result) != len(output):
+            raise ValueError(f"Transform returned {len(result)} arrays for {len(output)} output columns")
+        return batch.assign(**dict(zip(output, result)))
+
+    if batch_format == 'arrow':
+        import pyarrow as pa
+        result = function(pa.RecordBatch.from_pandas(batch, preserve_index=False), **arguments)
+        if not isinstance(result, pd.DataFrame):
+            result = result.to_pandas()
+        return result
+    result = function(batch, **arguments)
+    if not isinstance(result, pd.DataFrame):
+        raise TypeError(f"Transform {function_path} returned {type(result).__name__}, not a DataFrame")
+    return result
+
+class TransformTool(ETLTool):
+    """Apply a user function to the input in batches, optionally across worker processes.
+
+    function names a module-level function as 'module:name' or
+    'path/to/file.py:name'. By default it receives a batch as a DataFrame (or
+    a pyarrow RecordBatch with batch_format='arrow') and returns a DataFrame.
+    With columns, it instead receives those columns as NumPy arrays and
+    returns one array per output column; such functions can be compiled with
+    Numba by setting jit. Workers import the function by name, so each batch
+    ships only its rows.
+    """
+
+    BATCH_FORMATS = ('pandas', 'arrow')
+
+    def __init__(self, function: str, arguments: Dict[str, Any] = None, batch_rows: Optional[int] = None,
+                 workers: int = 1, batch_format: str = 'pandas', columns: List[str] = None,
+                 output: List[str] = None, jit: bool = False):
+        super().__init__()
+        if batch_format not in self.BATCH_FORMATS:
+            raise ValueError(f"batch_format must be one of {', '.join(self.BATCH_FORMATS)}: {batch_format}")
+        if jit and not columns:
+            raise ValueError("jit needs columns: compiled functions take NumPy arrays")
+        if columns and not output:
+            raise ValueError("Transform with columns needs output column names")
+        self.function = function
+        self.arguments = arguments or {}  # Keyword arguments passed to the function
+        self.batch_rows = batch_rows  # Rows per batch; the whole input is one batch by default
+        self.workers = workers  # Processes running batches; 0 for one per CPU
+        self.batch_format = batch_format
+        self.columns = columns
+        self.output = output
+        self.jit = jit
+
+    def execute(self):
+        if self.input_data is None:
+            return None
+        if self.batch_format == 'arrow' and not self.columns:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Arrow transform batches need PyArrow: pip install pyarrow") from None
+        # Resolve the function here first so import errors surface before workers start
+        load_function(self.function, self.jit)
+
+        data = self.input_data
+        batch_rows = self.batch_rows or max(1, len(data))
+        batches = [data.iloc[start:start + batch_rows] for start in range(0, len(data), batch_rows)] or [data]
+        transform = functools.partial(_transform_batch, function_path=self.function, arguments=self.arguments,
+                                      batch_format=self.batch_format, columns=self.columns,
+                                      output=self.output, jit=self.jit)
+
+        workers = self.workers or os.cpu_count()
+        with self.span('transform'):
+            if workers > 1 and len(batches) > 1:
+                pool = ProcessPoolExecutor(max_workers=min(workers, len(batches)))
+                try:
+                    futures = [pool.submit(transform, batch) for batch in batches]
+                    sizes = {future: len(batch) for future, batch in zip(futures, batches)}
+                    pending = futures
+                    rows = 0
+                    while pending:
+                        self.check_stopped()
+                        done, pending = wait(pending, timeout=0.1)
+                        if done:
+                            rows += sum(sizes[future] for future in done)
+                            self.report_rows(rows)
+                    results = [future.result() for future in futures]
+                finally:
+                    # When stopped or failed, drop batches not yet started; running ones finish first
+                    pool.shutdown(wait=True, cancel_futures=True)
+            else:
+                results = []
+                rows = 0
+                for batch in batches:
+                    self.check_stopped()
+                    results.append(transform(batch))
+                    rows += len(batch)
+                    self.report_rows(rows)
+        self.output_data = pd.concat(results) if len(results) > 1 else results[0]
+        return self.output_data
@@ -0,0 +1,105 @@
+import json
+from typing import Dict, List, Any
+
+# Chrome trace event format, readable by Perfetto (ui.perfetto.dev) and chrome://tracing:
+# https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+
+def _timestamp(seconds: float, origin: float) -> float:
+    """Convert a perf_counter reading to trace microseconds since the run started"""
+    return round((seconds - origin) * 1e6, 3)
+
+def build_trace_events(nodes: Dict[str, Any], node_metrics: Dict[str, Dict[str, Any]],
+                       run: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build trace events for one run: a span per node, nested tool spans and memory counters"""
+    origin = run['start_time']
+    events = []
+    lanes = {}  # (pid, tid) -> lane number, in order of first use
+
+    for node_id, metrics in sorted(node_metrics.items(), key=lambda item: item[1]['start_time']):
+        pid, tid = metrics['process_id'], metrics['thread_id']
+        lanes.setdefault((pid, tid), len(lanes) + 1)
+        start = _timestamp(metrics['start_time'], origin)
+        end = _timestamp(metrics['end_time'], origin)
+
+        events.append({
+            'name': nodes.get(node_id, {}).get('type', node_id),
+            'cat': 'node',
+            'ph': 'X',
+            'ts': start,
+            'dur': end - start,
+            'pid': pid,
+            'tid': tid,
+            'args': {
+                'node_id': node_id,
+                'cpu_time': metrics['cpu_time'],
+                'peak_memory': metrics['peak_memory'],
+                'input_rows': metrics.get('input_rows'),
+                'output_rows': metrics.get('output_rows'),
+                'output_columns': metrics.get('output_columns'),
+                'output_bytes': metrics.get('output_bytes')
+            }
+        })
+
+        # I/O and compute spans recorded by the tool itself
+        for name, category, span_start, span_end in metrics.get('spans', []):
+            span_ts = _timestamp(span_start, origin)
+            events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': span_ts,
+                'dur': _timestamp(span_end, origin) - span_ts,
+                'pid': pid,
+                'tid': tid
+            })
+
+        # Traced memory at node boundaries, with the node's peak held while it runs
+        if metrics.get('memory_before') is not None:
+            peak = metrics['memory_before'] + (metrics['peak_memory'] or 0)
+            events.append({'name': 'memory', 'ph': 'C', 'ts': start, 'pid': pid,
+                           'args': {'traced': metrics['memory_before'], 'node_peak': peak}})
+            events.append({'name': 'memory', 'ph': 'C', 'ts': end, 'pid': pid,
+                           'args': {'traced': metrics['memory_after'], 'node_peak': metrics['memory_after']}})
+
+    # Name the process and worker thread lanes
+    for pid in sorted({pid for pid, _ in lanes}):
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid,
+                       'args': {'name': f"workflow (pid {pid})"}})
+    for (pid, tid), lane in lanes.items():
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                       'args': {'name': f"worker {lane}"}})
+    return events
+
+def write_trace(file_path: str, nodes: Dict[str, Any], node_metrics: Dict[str, Dict[str, Any]],
+                run: Dict[str, Any]):
+    trace = {
+        'traceEvents': build_trace_events(nodes, node_metrics, run),
+        'displayTimeUnit': 'ms',
+        'otherData': {
+            'start_epoch': run['start_epoch'],
+            'duration': (run['end_time'] or run['start_time']) - run['start_time']
+        }
+    }
+    with open(file_path, 'w') as f:
+        json.dump(trace, f)
+
+def write_batch_trace(file_path: str, nodes: Dict[str, Any], reports: List[Dict[str, Any]]):
+    """Write all runs of a batch into one trace, with a process lane per worker"""
+    reports = [report for report in reports if report['start_time'] is not None]  # Not lost workers
+    origin = min((report['start_time'] for report in reports), default=0)
+    events = []
+    metadata = {}
+    for report in reports:
+        for event in build_trace_events(nodes, report['node_metrics'], {'start_time': origin}):
+            if event['ph'] == 'M':
+                # Workers run many instances; keep one name per lane
+                metadata.setdefault((event['name'], event['pid'], event.get('tid')), event)
+            else:
+                event.setdefault('args', {})['run'] = report['run']
+                events.append(event)
+    trace = {
+        'traceEvents': events + list(metadata.values()),
+        'displayTimeUnit': 'ms'
+    }
+    with open(file_path, 'w') as f:
+        json.dump(trace, f)
@@ -1,109 +1,683 @@
+import functools
+import glob
 import json
+import os
 import pickle
-from typing import Dict, List, Any
-from tools import ETLTool
+import threading
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Any, Callable, Iterable, Optional
+
+# tools pulls in pandas; tool_registry imports tool modules only when a workflow runs
+if TYPE_CHECKING:
+    from tools import ETLTool
+
+class WorkflowCancelled(Exception):
+    """Raised when a workflow run is cancelled"""
+
+class NodeTimeoutError(Exception):
+    """Raised when a single node runs longer than its timeout"""
 
 class WorkflowManager:
     def __init__(self):
         self.nodes = {}  # Dictionary to store tool nodes
-        self.connections = []  # List to store connections between nodes
         self.node_data = {}  # Dictionary to store data for each node
+        self.node_metrics = {}  # Runtime metrics from the last run of each node
+        self.track_memory = False  # Measure peak memory per node with tracemalloc (slows runs down)
+        self.last_run = None  # Start/end times of the last run, for trace export
+        self.node_state = {}  # State of incremental tools, saved next to the workflow file
+        self.backend = 'pandas'  # Execution backend, see backends.py
+        self._sample = None  # Design mode sample, see the sample property
+        # node id -> function computing output that the run did not materialize
+        # (nodes fused into a Polars plan); get_node_data calls it on first use
+        self._deferred_data = {}
+
+        # Indexes kept in step with nodes and connections. Dicts with None
+        # values serve as insertion-ordered sets with constant-time removal.
+        self._connections = {}  # (from, to) -> connection dict
+        self._outgoing = {}  # node id -> {downstream node id: None}
+        self._incoming = {}  # node id -> {upstream node id: None}
+        self._nodes_by_type = {}  # lower-cased tool type -> {node id: None}
+
+    @property
+    def sample(self) -> Optional[Dict[str, Any]]:
+        """Design mode: Input nodes read this sample ({'method', 'rows', 'step', 'seed'},
+        see tools.sample_batches) instead of their whole input, and Output nodes do
+        not write. None runs on full data. A session setting, not saved.
+        """
+        return self._sample
+
+    @sample.setter
+    def sample(self, sample: Optional[Dict[str, Any]]):
+        # Output computed under other sample settings must not feed later partial runs
+        sample = dict(sample) if sample is not None else None
+        if sample != self._sample:
+            self.node_data = {}
+            self._deferred_data = {}
+            self.node_metrics = {}
+        self._sample = sample
+
+    @property
+    def connections(self) -> List[Dict[str, str]]:
+        """Connections between nodes, in the order they were added"""
+        return list(self._connections.values())
+
+    @connections.setter
+    def connections(self, connections: List[Dict[str, str]]):
+        self._connections = {}
+        self._outgoing = {}
+        self._incoming = {}
+        for conn in connections:
+            self.add_connection(conn['from'], conn['to'])
 
     def add_node(self, node_id: str, tool_type: str, position: Dict[str, float], 
                 properties: Dict[str, Any] = None):
+        if node_id in self.nodes:
+            self._unindex_node(node_id)
         self.nodes[node_id] = {
             'type': tool_type,
             'position': position,
             'properties': properties or {}
         }
+        self._index_node(node_id)
+
+    def _index_node(self, node_id: str):
+        tool_type = self.nodes[node_id]['type'].lower()
+        self._nodes_by_type.setdefault(tool_type, {})[node_id] = None
+
+    def _unindex_node(self, node_id: str):
+        tool_type = self.nodes[node_id]['type'].lower()
+        self._nodes_by_type.get(tool_type, {}).pop(node_id, None)
 
     def add_connection(self, from_node: str, to_node: str):
-        self.connections.append({
+        self._connections[(from_node, to_node)] = {
             'from': from_node,
             'to': to_node
-        })
+        }
+        self._outgoing.setdefault(from_node, {})[to_node] = None
+        self._incoming.setdefault(to_node, {})[from_node] = None
+
+    def has_connection(self, from_node: str, to_node: str) -> bool:
+        return (from_node, to_node) in self._connections
 
     def remove_node(self, node_id: str):
         """Remove a node and its associated data and connections"""
         # Remove the node
         if node_id in self.nodes:
+            self._unindex_node(node_id)
             del self.nodes[node_id]
         
         # Remove associated data
         if node_id in self.node_data:
             del self.node_data[node_id]
+        self._deferred_data.pop(node_id, None)
+        if node_id in self.node_metrics:
+            del self.node_metrics[node_id]
+        self.node_state.pop(node_id, None)
         
         # Remove all connections involving this node
-        self.connections = [conn for conn in self.connections 
-                          if conn['from'] != node_id and conn['to'] != node_id]
+        for to_node in list(self._outgoing.get(node_id, ())):
+            self.remove_connection(node_id, to_node)
+        for from_node in list(self._incoming.get(node_id, ())):
+            self.remove_connection(from_node, node_id)
+        self._outgoing.pop(node_id, None)
+        self._incoming.pop(node_id, None)
+
+    def update_node_properties(self, node_id: str, properties: Dict[str, Any]):
+        """Replace the properties of a node"""
+        self.nodes[node_id]['properties'] = properties
+
+    def find_nodes(self, selector: str) -> List[str]:
+        """Find nodes by id, or by tool type (case-insensitive)"""
+        if selector in self.nodes:
+            return [selector]
+        return self.nodes_of_type(selector)
+
+    def nodes_of_type(self, tool_type: str) -> List[str]:
+        """Ids of all nodes of a tool type (case-insensitive), in the order they were added"""
+        return list(self._nodes_by_type.get(tool_type.lower(), ()))
+
+    def node_types(self) -> List[str]:
+        """Tool types that have at least one node, in the order they were first added"""
+        return [self.nodes[next(iter(node_ids))]['type'] for node_ids in self._nodes_by_type.values() if node_ids]
 
     def remove_connection(self, from_node: str, to_node: str):
         """Remove a connection between two nodes"""
-        self.connections = [conn for conn in self.connections 
-                          if not (conn['from'] == from_node and conn['to'] == to_node)]
+        self._connections.pop((from_node, to_node), None)
+        self._outgoing.get(from_node, {}).pop(to_node, None)
+        self._incoming.get(to_node, {}).pop(from_node, None)
 
     def get_node_data(self, node_id: str):
-        """Get the data associated with a node"""
+        """Get the data associated with a node, computing deferred output on first use"""
+        if node_id not in self.node_data and node_id in self._deferred_data:
+            self.set_node_data(node_id, self._deferred_data[node_id]())
         return self.node_data.get(node_id)
 
     def set_node_data(self, node_id: str, data):
         """Set the data for a node"""
+        self._deferred_data.pop(node_id, None)
         self.node_data[node_id] = data
 
-    def save_workflow(self, file_path: str):
+    def defer_node_data(self, node_id: str, compute: Callable[[], Any]):
+        """Set the data for a node as a function computing it when first requested"""
+        self.node_data.pop(node_id, None)
+        self._deferred_data[node_id] = compute
+
+    def has_node_data(self, node_id: str) -> bool:
+        """Whether a node has output from an earlier run, computed or deferred"""
+        return node_id in self.node_data or node_id in self._deferred_data
+
+    def get_node_metrics(self, node_id: str):
+        """Get the runtime metrics recorded for a node during the last run"""
+        return self.node_metrics.get(node_id)
+
+    def export_trace(self, file_path: str):
+        """Write the last run as a Chrome trace event / Perfetto JSON file"""
+        from trace_export import write_trace
+        if self.last_run is None:
+            raise ValueError("Workflow has not been run yet")
+        write_trace(file_path, self.nodes, self.node_metrics, self.last_run)
+
+    def workflow_dict(self) -> Dict[str, Any]:
+        """The saved form of the workflow: nodes and connections"""
         workflow_data = {
             'nodes': self.nodes,
             'connections': self.connections
         }
+        if self.backend != 'pandas':
+            workflow_data['backend'] = self.backend
+        return workflow_data
+
+    def save_workflow(self, file_path: str):
         with open(file_path, 'w') as f:
-            json.dump(workflow_data, f, indent=2)
+            json.dump(self.workflow_dict(), f, indent=2)
+        self.save_state(file_path)
 
     def load_workflow(self, file_path: str):
         with open(file_path, 'r') as f:
             workflow_data = json.load(f)
+        self.load_workflow_dict(workflow_data)
+        self.load_state(file_path)
+
+    def load_state(self, file_path: str):
+        """Load incremental tool state saved next to the workflow file, if any"""
+        state_path = state_file_path(file_path)
+        if os.path.exists(state_path):
+            with open(state_path, 'r') as f:
+                self.node_state = json.load(f)
+        else:
+            self.node_state = {}
+
+    def save_state(self, file_path: str):
+        """Save incremental tool state next to the workflow file"""
+        state_path = state_file_path(file_path)
+        if self.node_state:
+            with open(state_path, 'w') as f:
+                json.dump(self.node_state, f)
+        elif os.path.exists(state_path):
+            os.remove(state_path)
+
+    def reset_state(self, node_id: Optional[str] = None):
+        """Forget incremental state, so the next run reprocesses inputs in full"""
+        if node_id is None:
+            self.node_state = {}
+        else:
+            self.node_state.pop(node_id, None)
+
+    def load_workflow_dict(self, workflow_data: Dict[str, Any]):
         self.nodes = workflow_data['nodes']
+        self.node_state = {}
+        self.backend = workflow_data.get('backend', 'pandas')
+        self._nodes_by_type = {}
+        for node_id in self.nodes:
+            self._index_node(node_id)
         self.connections = workflow_data['connections']
 
-    def execute_workflow(self):
-        # Create a dictionary to store tool instances
+    def apply_overrides(self, overrides: Dict[str, Any]):
+        """Set node properties from {'NODE.PROPERTY': value}, NODE being a node id or tool type"""
+        for target, value in overrides.items():
+            selector, dot, key = target.rpartition('.')
+            if not dot or not selector or not key:
+                raise ValueError(f"Override must look like NODE.PROPERTY: {target}")
+            node_ids = self.find_nodes(selector)
+            if not node_ids:
+                raise ValueError(f"No node matches '{selector}'")
+            for node_id in node_ids:
+                properties = dict(self.nodes[node_id]['properties'])
+                properties[key] = value
+                self.update_node_properties(node_id, properties)
+
+    def run_batch(self, parameter_sets: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                  node_timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Run independent copies of this workflow in a process pool, one per parameter set.
+
+        Each parameter set is a dict of overrides as accepted by apply_overrides.
+        Runs never share nodes or node data. Returns one report per run with its
+        status, error, wall time and per-node metrics, in parameter set order.
+        A run whose worker process dies (e.g. killed for running out of memory)
+        is reported as failed, without timings, and the other runs still report.
+        """
+        workflow_data = self.workflow_dict()
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_run_batch_item, workflow_data, parameters, node_timeout)
+                       for parameters in parameter_sets]
+            reports = []
+            for parameters, future in zip(parameter_sets, futures):
+                try:
+                    reports.append(future.result())
+                except Exception as e:
+                    # Raised by the pool, not the run: _run_batch_item reports run errors itself
+                    reports.append({
+                        'parameters': parameters,
+                        'status': 'failed',
+                        'error': f"Worker process failed: {str(e) or type(e).__name__}",
+                        'process_id': None,
+                        'start_time': None,
+                        'wall_time': None,
+                        'node_metrics': {}
+                    })
+        for index, report in enumerate(reports):
+            report['run'] = index
+        return reports
+
+    def get_upstream_nodes(self, node_id: str) -> List[str]:
+        """Get the nodes feeding into a node, in connection order"""
+        return list(self._incoming.get(node_id, ()))
+
+    def get_downstream_nodes(self, node_id: str) -> List[str]:
+        """Get the nodes a node feeds into, in connection order"""
+        return list(self._outgoing.get(node_id, ()))
+
+    def affected_nodes(self, node_ids: Iterable[str]) -> List[str]:
+        """The given nodes and everything downstream of them, in execution order"""
+        affected = set()
+        pending = list(node_ids)
+        while pending:
+            node_id = pending.pop()
+            if node_id not in affected:
+                affected.add(node_id)
+                pending.extend(self._outgoing.get(node_id, ()))
+        return [node_id for node_id in self.execution_order() if node_id in affected]
+
+    def source_files(self) -> Dict[str, List[str]]:
+        """File paths read by source nodes (tools without inputs), mapped to their node ids"""
+        from tool_registry import get_tool_spec
+
+        files = {}
+        for node_id, node in self.nodes.items():
+            spec = get_tool_spec(node['type'])
+            file_path = node['properties'].get('file_path')
+            if spec is not None and spec.inputs[1] == 0 and file_path:
+                files.setdefault(file_path, []).append(node_id)
+        return files
+
+    def _delta_source(self, node_id: str) -> Optional[str]:
+        """The incremental node whose appended rows reach node_id, if any.
+
+        Row-local and streamable nodes pass a delta on unchanged; a blocking
+        node replaces it with output of its own.
+        """
+        from tool_registry import BLOCKING, get_tool_spec
+
+        seen = set()
+        pending = list(self._incoming.get(node_id, ()))
+        while pending:
+            upstream = pending.pop()
+            if upstream in seen:
+                continue
+            seen.add(upstream)
+            spec = get_tool_spec(self.nodes[upstream]['type'])
+            if spec is None or spec.execution == BLOCKING:
+                continue
+            if self.nodes[upstream]['properties'].get('incremental'):
+                return upstream
+            pending.extend(self._incoming.get(upstream, ()))
+        return None
+
+    def _reads_delta(self, node_id: str) -> bool:
+        """Whether a node's input holds only the rows appended since the last run.
+
+        Decided from the graph and the incremental source's own output, since
+        row-local tools such as Transform do not all keep DataFrame attrs.
+        """
+        source = self._delta_source(node_id)
+        if source is None:
+            return False
+        data = self.get_node_data(source)
+        return data is not None and bool(data.attrs.get('delta', False))
+
+    def _check_deltas(self, order: List[str], notify: Callable[[str, str, Any], None]):
+        """Reject nodes that would lose rows when fed by an incremental Input.
+
+        A blocking tool such as Sort or Join needs its whole input, unless it
+        is incremental itself; given only the rows appended since the last run
+        it would silently compute over those rows alone. A tool that rewrites
+        its output, such as an Output node without append, would replace the
+        file with those rows.
+        """
+        from tool_registry import BLOCKING, get_tool_spec
+
+        for node_id in order:
+            spec = get_tool_spec(self.nodes[node_id]['type'])
+            if spec is None:
+                continue
+            properties = self.nodes[node_id]['properties']
+            if spec.execution == BLOCKING and not properties.get('incremental'):
+                problem, option = "needs its whole input", 'incremental'
+            elif spec.execution != BLOCKING and 'append' in spec.schema and not properties.get('append'):
+                problem, option = "rewrites its output", 'append'
+            else:
+                continue
+            source = self._delta_source(node_id)
+            if source is not None:
+                message = (f"{spec.name} node {problem}, but {self.nodes[source]['type']} node "
+                           f"{source} is incremental and passes on only appended rows; turn off "
+                           f"'incremental' there" + (f" or enable '{option}' here" if option in spec.schema else ""))
+                notify('failed', node_id, message)
+                raise ValueError(message)
+
+    def execution_order(self) -> List[str]:
+        """Order nodes so every node runs after all of its upstream nodes"""
+        in_degree = {node_id: len(self._incoming.get(node_id, ())) for node_id in self.nodes}
+        ready = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while ready:
+            node_id = ready.popleft()
+            order.append(node_id)
+            for next_id in self._outgoing.get(node_id, ()):
+                in_degree[next_id] -= 1
+                if in_degree[next_id] == 0:
+                    ready.append(next_id)
+
+        if len(order) != len(self.nodes):
+            raise ValueError("Workflow contains a cycle")
+        return order
+
+    def create_tool(self, node_id: str) -> 'ETLTool':
+        """Create the tool for a node, or None if its type has no tool (e.g. Browse)"""
+        from tool_registry import get_tool_spec
+
+        node_data = self.nodes[node_id]
+        spec = get_tool_spec(node_data['type'])
+        if spec is None:
+            return None
+
+        min_inputs = spec.inputs[0]
+        if len(self._incoming.get(node_id, ())) < min_inputs:
+            raise ValueError(f"{spec.name} node needs at least {min_inputs} input connection(s)")
+        return spec.create(node_data['properties'])
+
+    def execute_workflow(self, callback: Optional[Callable[[str, str, Any], None]] = None,
+                         cancel_event: Optional[threading.Event] = None,
+                         node_timeout: Optional[float] = None,
+                         nodes: Optional[Iterable[str]] = None):
+        """Execute every node in dependency order.
+
+        callback, if given, is called as callback(event, node_id, value) where
+        event is 'started', 'rows' (output row count), 'finished' (the node's
+        metrics dict, also kept in node_metrics) or 'failed' (error message). Setting cancel_event stops the
+        run: the running node stops at its next check. A node's 'timeout'
+        property overrides node_timeout (in seconds).
+
+        If nodes is given, only those nodes and the nodes downstream of them
+        run; other nodes feed them the output kept from earlier runs.
+
+        In design mode (sample set) the run uses the pandas backend, marks the
+        metrics of nodes fed by sampled inputs with 'sampled' and keeps no
+        incremental state.
+        """
+        notify = callback or (lambda event, node_id, value: None)
         tools = {}
-        
-        # First, create all tool instances
-        for node_id, node_data in self.nodes.items():
-            tool_type = node_data['type']
-            properties = node_data['properties']
-            
-            # Create appropriate tool instance based on type
-            if tool_type == 'Input':
-                tools[node_id] = InputTool(properties['file_path'])
-            elif tool_type == 'Select':
-                tools[node_id] = SelectTool(properties['columns'], 
-                                          properties.get('drop_columns', False))
-            elif tool_type == 'Filter':
-                tools[node_id] = FilterTool(properties['condition'])
-            elif tool_type == 'Join':
-                tools[node_id] = JoinTool(properties['right_data'],
-                                        properties.get('how', 'inner'),
-                                        properties.get('left_on'),
-                                        properties.get('right_on'))
-            elif tool_type == 'Merge':
-                tools[node_id] = MergeTool(properties['additional_data'])
-            elif tool_type == 'Formula':
-                tools[node_id] = FormulaTool(properties['formula'],
-                                           properties['new_column'])
-            elif tool_type == 'Output':
-                tools[node_id] = OutputTool(properties['file_path'])
-            elif tool_type == 'Aggregate':
-                tools[node_id] = AggregateTool(properties['aggregations'],
-                                             properties.get('group_by'))
-
-        # Then, execute tools in order based on connections
-        for connection in self.connections:
-            from_tool = tools[connection['from']]
-            to_tool = tools[connection['to']]
-            to_tool.input_data = from_tool.output_data
-            to_tool.execute()
-            # Store the output data
-            self.set_node_data(connection['to'], to_tool.output_data)
-
-        return tools 
\ No newline at end of file
+        if nodes is None:
+            order = self.execution_order()
+            self.node_metrics = {}
+        else:
+            order = self._with_missing_inputs(self.affected_nodes(nodes))
+            for node_id in order:
+                self.node_metrics.pop(node_id, None)
+        self._check_deltas(order, notify)
+        self.last_run = {'start_time': time.perf_counter(), 'start_epoch': time.time(), 'end_time': None}
+
+        started_tracing = self.track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            from backends import get_backend
+            backend = 'pandas' if self.sample is not None else self.backend
+            get_backend(backend).execute(self, order, tools, notify, cancel_event, node_timeout)
+
+            # Keep incremental state only once every node has succeeded, so a
+            # failed run is retried from the same offsets
+            if self.sample is None:
+                for node_id, tool in tools.items():
+                    if tool.state is not None:
+                        self.node_state[node_id] = tool.state
+        finally:
+            self.last_run['end_time'] = time.perf_counter()
+            if started_tracing:
+                tracemalloc.stop()
+
+        return tools
+
+    def _with_missing_inputs(self, order: List[str]) -> List[str]:
+        """Add upstream nodes that have no output from an earlier run to a partial run.
+
+        Outside design mode, output computed from sampled input counts as missing.
+        """
+        run = set(order)
+        pending = list(order)
+        while pending:
+            for upstream in self._incoming.get(pending.pop(), ()):
+                missing = (not self.has_node_data(upstream)
+                           or (self.sample is None and self.is_sampled(upstream)))
+                if upstream not in run and missing:
+                    run.add(upstream)
+                    pending.append(upstream)
+        if len(run) == len(order):
+            return order
+        return [node_id for node_id in self.execution_order() if node_id in run]
+
+    def _execute_nodes(self, order, tools, notify, cancel_event, node_timeout):
+        for node_id in order:
+            if cancel_event is not None and cancel_event.is_set():
+                raise WorkflowCancelled()
+
+            try:
+                tool = self.create_tool(node_id)
+            except Exception as e:
+                notify('failed', node_id, str(e))
+                raise
+            if tool is None:
+                continue
+            tools[node_id] = tool
+
+            upstream = self.get_upstream_nodes(node_id)
+            if upstream:
+                tool.inputs = [self.get_node_data(upstream_id) for upstream_id in upstream]
+                tool.input_data = tool.inputs[0]
+            tool.state = self.node_state.get(node_id)
+            if self.sample is not None and hasattr(tool, 'sample'):
+                tool.sample = self.sample
+            if hasattr(tool, 'input_delta'):
+                tool.input_delta = self._reads_delta(node_id)
+            tool.progress = functools.partial(notify, 'rows', node_id)
+
+            notify('started', node_id, None)
+            try:
+                metrics = self._run_tool(tool, self.timeout_for(node_id, node_timeout), cancel_event)
+            except WorkflowCancelled:
+                raise
+            except Exception as e:
+                notify('failed', node_id, str(e))
+                raise
+
+            # Store the output data and metrics
+            self.set_node_data(node_id, tool.output_data)
+            metrics.update(self._frame_metrics(tool))
+            if self._reads_sample(node_id, tool):
+                metrics['sampled'] = True
+            self.node_metrics[node_id] = metrics
+            if tool.output_data is not None:
+                notify('rows', node_id, len(tool.output_data))
+            notify('finished', node_id, metrics)
+
+    def timeout_for(self, node_id: str, node_timeout: Optional[float]) -> Optional[float]:
+        """The node's 'timeout' property in seconds, or node_timeout if it has none"""
+        timeout = self.nodes[node_id]['properties'].get('timeout')
+        return node_timeout if timeout is None else float(timeout)
+
+    def is_sampled(self, node_id: str) -> bool:
+        """Whether a node's output from the last run was computed from sampled input"""
+        return bool(self.node_metrics.get(node_id, {}).get('sampled'))
+
+    def _reads_sample(self, node_id: str, tool: 'ETLTool') -> bool:
+        upstream = self.get_upstream_nodes(node_id)
+        if not upstream:
+            return getattr(tool, 'sample', None) is not None
+        return any(self.is_sampled(upstream_id) for upstream_id in upstream)
+
+    def _run_tool(self, tool: 'ETLTool', timeout: Optional[float],
+                  cancel_event: Optional[threading.Event]):
+        """Run a tool in the calling thread and return its metrics.
+
+        On cancellation or timeout the tool is asked to stop through its
+        stop_event, which it checks between chunks (ETLTool.check_stopped).
+        The error is raised only once the tool has returned, so no node is
+        still running, or writing, after the run is reported as stopped. A
+        node that finishes past its timeout without checking still fails.
+        """
+        if timeout is None and cancel_event is None:
+            return self._measure_tool(tool)
+
+        stop = threading.Event()
+        finished = threading.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def watch():
+            while not finished.wait(0.1):
+                if ((cancel_event is not None and cancel_event.is_set())
+                        or (deadline is not None and time.monotonic() > deadline)):
+                    stop.set()
+                    return
+
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+        tool.stop_event = stop
+        try:
+            metrics = self._measure_tool(tool)
+        except Exception:
+            if not stop.is_set():
+                raise
+            metrics = None
+        finally:
+            finished.set()
+            watcher.join()
+            tool.stop_event = None
+
+        if metrics is None and cancel_event is not None and cancel_event.is_set():
+            raise WorkflowCancelled()
+        if deadline is not None and time.monotonic() > deadline:
+            raise NodeTimeoutError(f"Node exceeded its {timeout}s timeout")
+        return metrics
+
+    @staticmethod
+    def _measure_tool(tool: 'ETLTool') -> Dict[str, Any]:
+        """Execute a tool, timing it in the calling thread.
+
+        CPU time covers the whole process, so the threads of DuckDB, Polars and
+        numpy count towards the node, as do worker processes it waited for.
+        Nodes run one at a time; the GUI thread's share is small.
+        """
+        tracing = tracemalloc.is_tracing()
+        start_memory = None
+        if tracing:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_time()
+
+        tool.execute()
+
+        wall_end = time.perf_counter()
+        metrics = {
+            'wall_time': wall_end - wall_start,
+            'cpu_time': _cpu_time() - cpu_start,
+            'peak_memory': None,
+            'start_time': wall_start,
+            'end_time': wall_end,
+            'process_id': os.getpid(),
+            'thread_id': threading.get_ident(),
+            'spans': list(tool.spans),
+            'memory_before': start_memory,
+            'memory_after': None
+        }
+        if tracing:
+            current_memory, peak_memory = tracemalloc.get_traced_memory()
+            metrics['peak_memory'] = max(0, peak_memory - start_memory)
+            metrics['memory_after'] = current_memory
+        return metrics
+
+    @staticmethod
+    def _frame_metrics(tool: 'ETLTool') -> Dict[str, Any]:
+        """Row and column counts of a tool's input and output, plus output size in bytes"""
+        metrics = {}
+        for prefix, data in (('input', tool.input_data), ('output', tool.output_data)):
+            shape = getattr(data, 'shape', None)
+            metrics[f'{prefix}_rows'] = shape[0] if shape else None
+            metrics[f'{prefix}_columns'] = shape[1] if shape and len(shape) > 1 else None
+        # Shallow size: object columns count their pointers, not the strings
+        output = tool.output_data
+        metrics['output_bytes'] = int(output.memory_usage(index=True).sum()) if hasattr(output, 'memory_usage') else None
+        return metrics
+
+def state_file_path(file_path: str) -> str:
+    """Path of the incremental state file kept next to a workflow file"""
+    return os.path.splitext(file_path)[0] + '.state.json'
+
+def _cpu_time() -> float:
+    """CPU seconds used by all threads of this process and by its finished child processes"""
+    children = os.times()
+    return time.process_time() + children.children_user + children.children_system
+
+def batch_parameters_from_glob(pattern: str, output_template: Optional[str] = None,
+                               input_selector: str = 'Input',
+                               output_selector: str = 'Output') -> List[Dict[str, Any]]:
+    """One parameter set per file matching pattern, pointing the Input node at it.
+
+    output_template may use {stem} and {name} of the input file, e.g.
+    'out/{stem}_clean.csv', to give every run its own output file.
+    """
+    parameter_sets = []
+    for path in sorted(glob.glob(pattern)):
+        parameters = {f"{input_selector}.file_path": path}
+        if output_template:
+            name = os.path.basename(path)
+            stem = os.path.splitext(name)[0]
+            parameters[f"{output_selector}.file_path"] = output_template.format(stem=stem, name=name)
+        parameter_sets.append(parameters)
+    return parameter_sets
+
+def _run_batch_item(workflow_data: Dict[str, Any], parameters: Dict[str, Any],
+                    node_timeout: Optional[float]) -> Dict[str, Any]:
+    """Run one batch instance in a worker process with its own WorkflowManager"""
+    manager = WorkflowManager()
+    manager.track_memory = False
+    report = {
+        'parameters': parameters,
+        'status': 'succeeded',
+        'error': None,
+        'process_id': os.getpid(),
+        'start_time': time.perf_counter()
+    }
+    try:
+        manager.load_workflow_dict(workflow_data)
+        manager.apply_overrides(parameters)
+        manager.execute_workflow(node_timeout=node_timeout)
+    except Exception as e:
+        report['status'] = 'failed'
+        report['error'] = str(e)
+    report['wall_time'] = time.perf_counter() - report['start_time']
+    report['node_metrics'] = manager.node_metrics
+    return report
@@ -0,0 +1,45 @@
+import threading
+from PyQt6.QtCore import QThread, pyqtSignal
+from workflow_manager import WorkflowManager, WorkflowCancelled
+
+class WorkflowWorker(QThread):
+    """Runs WorkflowManager.execute_workflow off the GUI thread"""
+    node_started = pyqtSignal(str)
+    node_rows = pyqtSignal(str, int)
+    node_finished = pyqtSignal(str, dict)
+    node_failed = pyqtSignal(str, str)
+    run_finished = pyqtSignal()
+    run_failed = pyqtSignal(str)
+    run_cancelled = pyqtSignal()
+
+    def __init__(self, workflow_manager: WorkflowManager, node_timeout: float = None,
+                 nodes: list = None, parent=None):
+        super().__init__(parent)
+        self.workflow_manager = workflow_manager
+        self.node_timeout = node_timeout
+        self.nodes = nodes  # Run only these nodes and those downstream of them
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            self.workflow_manager.execute_workflow(self.on_event, self.cancel_event, self.node_timeout,
+                                                   self.nodes)
+        except WorkflowCancelled:
+            self.run_cancelled.emit()
+        except Exception as e:
+            self.run_failed.emit(str(e))
+        else:
+            self.run_finished.emit()
+
+    def on_event(self, event: str, node_id: str, value):
+        if event == 'started':
+            self.node_started.emit(node_id)
+        elif event == 'rows':
+            self.node_rows.emit(node_id, value)
+        elif event == 'finished':
+            self.node_finished.emit(node_id, value)
+        elif event == 'failed':
+            self.node_failed.emit(node_id, value)